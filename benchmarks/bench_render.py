@@ -0,0 +1,230 @@
+"""렌더링 경로 종단 간 지연 벤치마크.
+
+weather_app.py 를 Streamlit AppTest 로 헤드리스 실행하고, 네트워크 대신 재생 fixture 를 사용한다.
+
+    python benchmarks/bench_render.py --iterations 30 --latency 0.05
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# 백그라운드 갱신과 기록은 측정값을 흐리므로 끈 상태로 import
+os.environ.setdefault("PREFETCH", "0")
+os.environ.setdefault("HISTORY", "0")
+# 스텁 서버 경유(LiveProvider) 측정이 호출 예산에 막히지 않도록
+os.environ.setdefault("API_CALLS_PER_MINUTE", "0")
+
+import numpy as np  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from weathermusic import providers  # noqa: E402
+from weathermusic.cache import api_cache  # noqa: E402
+from weathermusic.fixtures import synthesize  # noqa: E402
+from weathermusic.timing import timer  # noqa: E402
+
+# 단계별 원시 기록은 기본으로 꺼져 있으므로 벤치마크에서만 켬
+timer.record = True
+
+# AppTest 가 매 세션마다 남기는 ScriptRunContext 경고 숨김
+logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+APP_PATH = os.path.join(ROOT, "weather_app.py")
+DEFAULT_RESULTS = os.path.join(ROOT, "benchmarks", "results", "render.jsonl")
+SWITCH_CITIES = ["서울", "부산", "제주", "Daegu", "강릉", "Jeonju", "여수", "Incheon"]
+TYPED_WORDS = ["Busan", "Gangneung", "Jeju"]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = []
+
+    def measure(self, at):
+        timer.reset()
+        calls_before = providers.current().calls
+        started = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - started
+        if at.exception:
+            raise RuntimeError(f"앱 실행 중 예외: {at.exception[0].value}")
+        self.samples.append({
+            "elapsed": elapsed,
+            "api_calls": providers.current().calls - calls_before,
+            "stages": {name: sum(values) for name, values in timer.snapshot(reset=True).items()},
+        })
+
+    def summary(self):
+        elapsed = np.array([s["elapsed"] for s in self.samples]) * 1000
+        stage_names = sorted({name for s in self.samples for name in s["stages"]})
+        stages = {}
+        for name in stage_names:
+            values = np.array([s["stages"].get(name, 0.0) for s in self.samples]) * 1000
+            stages[name] = {"mean_ms": round(float(values.mean()), 3), "p95_ms": round(float(np.percentile(values, 95)), 3)}
+        return {
+            "runs": len(self.samples),
+            "p50_ms": round(float(np.percentile(elapsed, 50)), 3),
+            "p95_ms": round(float(np.percentile(elapsed, 95)), 3),
+            "p99_ms": round(float(np.percentile(elapsed, 99)), 3),
+            "mean_ms": round(float(elapsed.mean()), 3),
+            "api_calls_per_rerun": round(float(np.mean([s["api_calls"] for s in self.samples])), 3),
+            "stages": stages,
+        }
+
+
+def new_session():
+    return AppTest.from_file(APP_PATH, default_timeout=60)
+
+
+def scenario_cold_cache(iterations):
+    # 매번 캐시를 비우고 새 세션의 첫 화면 (IP 자동 감지 -> 날씨 조회)
+    recorder = Recorder()
+    for _ in range(iterations):
+        api_cache.clear()
+        recorder.measure(new_session())
+    return recorder
+
+
+def scenario_warm_cache(iterations):
+    # 같은 도시로 다시 렌더링 (모든 응답이 캐시에 있음)
+    at = new_session()
+    at.run()
+    recorder = Recorder()
+    for _ in range(iterations):
+        recorder.measure(at)
+    return recorder
+
+
+def scenario_city_switch(iterations):
+    # 캐시가 채워진 상태에서 매번 다른 도시로 전환
+    at = new_session()
+    at.run()
+    for city in SWITCH_CITIES:
+        at.text_input(key="city_input").input(city)
+        at.run()
+    recorder = Recorder()
+    for i in range(iterations):
+        at.text_input(key="city_input").input(SWITCH_CITIES[i % len(SWITCH_CITIES)])
+        recorder.measure(at)
+    return recorder
+
+
+def scenario_typing(iterations):
+    # city_input 에 한 글자씩 입력할 때마다 발생하는 재실행
+    at = new_session()
+    at.run()
+    recorder = Recorder()
+    runs = 0
+    while runs < iterations:
+        for word in TYPED_WORDS:
+            for end in range(1, len(word) + 1):
+                at.text_input(key="city_input").input(word[:end])
+                recorder.measure(at)
+                runs += 1
+    return recorder
+
+
+SCENARIOS = {
+    "cold_cache": scenario_cold_cache,
+    "warm_cache": scenario_warm_cache,
+    "city_switch": scenario_city_switch,
+    "typing": scenario_typing,
+}
+
+
+def start_stub_server(fixtures_dir, latency):
+    from weathermusic.stub_server import create_server
+
+    server = create_server(providers.ReplayProvider(fixtures_dir, latency=latency), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, providers.LiveProvider(base_urls={"owm": f"{base}/owm", "ipinfo": f"{base}/ipinfo"})
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(results_path):
+    if not os.path.exists(results_path):
+        return None
+    with open(results_path, encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+    return json.loads(lines[-1]) if lines else None
+
+
+def print_report(result, previous):
+    print(f"\nprovider={result['provider']} latency={result['latency']}s revision={result['revision']}")
+    print(f"{'scenario':<12} {'runs':>5} {'p50':>9} {'p95':>9} {'p99':>9} {'calls':>6}  vs prev p50")
+    for name, s in result["scenarios"].items():
+        prev = ((previous or {}).get("scenarios") or {}).get(name)
+        delta = f"{(s['p50_ms'] / prev['p50_ms'] - 1) * 100:+.1f}%" if prev and prev.get("p50_ms") else "-"
+        print(f"{name:<12} {s['runs']:>5} {s['p50_ms']:>8.1f}ms {s['p95_ms']:>8.1f}ms {s['p99_ms']:>8.1f}ms "
+              f"{s['api_calls_per_rerun']:>6.2f}  {delta}")
+        top = sorted(s["stages"].items(), key=lambda kv: -kv[1]["mean_ms"])[:6]
+        print("             " + ", ".join(f"{k}={v['mean_ms']:.1f}ms" for k, v in top))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="weather_app.py 렌더링 지연 벤치마크")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--provider", choices=["replay", "stub", "synthetic"], default="replay",
+                        help="replay: 프로세스 내 재생, stub: 로컬 HTTP 스텁 서버 경유, synthetic: 합성 데이터")
+    parser.add_argument("--fixtures", help="fixture 디렉터리 (없으면 임시 디렉터리에 합성)")
+    parser.add_argument("--latency", type=float, default=0.0, help="API 응답당 인위적 지연(초)")
+    parser.add_argument("--results", default=DEFAULT_RESULTS)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    fixtures_dir = args.fixtures
+    if not fixtures_dir and args.provider != "synthetic":
+        fixtures_dir = tempfile.mkdtemp(prefix="weathermusic-fixtures-")
+        synthesize(fixtures_dir)
+
+    server = None
+    if args.provider == "stub":
+        server, provider = start_stub_server(fixtures_dir, args.latency)
+    elif args.provider == "synthetic":
+        from weathermusic.fixtures import SyntheticProvider
+        provider = SyntheticProvider()
+    else:
+        provider = providers.ReplayProvider(fixtures_dir, latency=args.latency)
+    providers.set_provider(provider)
+
+    result = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "provider": args.provider,
+        "latency": args.latency,
+        "iterations": args.iterations,
+        "scenarios": {},
+    }
+    try:
+        for name in [n.strip() for n in args.scenarios.split(",") if n.strip()]:
+            result["scenarios"][name] = SCENARIOS[name](args.iterations).summary()
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    previous = load_previous(args.results)
+    print_report(result, previous)
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.results), exist_ok=True)
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        print(f"\n결과 저장: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""동시 접속 부하 테스트: 실제 Streamlit 서버에 여러 세션을 웹소켓으로 붙여 사용자를 흉내냄.
+
+weather_app.py 를 오프라인 대체 API(stub/replay/synthetic)로 띄우고, 세션마다 첫 화면을 받은 뒤 생각 시간만큼
+쉬었다가 분포에 따라 고른 도시를 입력하는 과정을 반복한다. 동시 사용자 수 단계마다 서버를 새로 띄워
+처리량, 재실행 지연 백분위, 세션당 메모리(서버 RSS 증가분), 사용자당 외부 API 호출 수를 보고한다.
+
+    python benchmarks/load_test.py --users 1,10,50 --think 2 --latency 0.2
+    python benchmarks/load_test.py --users 20 --cities 서울:5,부산:2,제주:1 --think 0
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+from streamlit.proto.Alert_pb2 import Alert  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+
+from weathermusic import providers  # noqa: E402
+from weathermusic.api import owm_request  # noqa: E402
+from weathermusic.data import city_dict  # noqa: E402
+from weathermusic.fixtures import synthesize  # noqa: E402
+from weathermusic.geocode import CITY_COORDS  # noqa: E402
+from weathermusic.transform import resolve_city  # noqa: E402
+
+try:
+    import websockets
+except ImportError:  # 선택 의존성: 없으면 실행할 수 없음
+    websockets = None
+
+# AppTest 는 실행할 때마다 전역 Runtime 을 바꿔 끼워 한 프로세스에서 병렬로 돌릴 수 없으므로,
+# 브라우저와 같은 /_stcore/stream 프로토콜로 진짜 서버의 스크립트 스레드를 경쟁시킨다.
+APP_PATH = os.path.join(ROOT, "weather_app.py")
+DEFAULT_RESULTS = os.path.join(ROOT, "benchmarks", "results", "load.jsonl")
+# 부하 테스트 중에는 백그라운드 갱신/기록을 끄고 호출 예산에 막히지 않게 함 (이미 지정한 값은 그대로)
+SERVER_ENV = {"PREFETCH": "0", "HISTORY": "0", "API_CALLS_PER_MINUTE": "0"}
+UPSTREAM_METRICS = ("weathermusic_api_responses_total", "weathermusic_api_errors_total")
+STARTUP_TIMEOUT = 60
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def has_fixtures(fixtures_dir, eng):
+    # 화면이 요청하는 세 엔드포인트의 fixture 가 모두 있는 도시만 (없으면 오류 화면과 geo 호출로 결과가 왜곡됨)
+    coords = CITY_COORDS.get(eng)
+    return coords is not None and all(
+        os.path.exists(os.path.join(fixtures_dir, providers.fixture_key(*owm_request(endpoint, *coords))))
+        for endpoint in ("weather", "forecast", "air_pollution")
+    )
+
+
+def city_weights(spec, zipf_s=1.0, fixtures_dir=None):
+    """zipf: 지원 도시 목록 순서(대도시 먼저)로 순위 가중, uniform: 균등, '서울:5,부산:2,제주': 직접 지정
+
+    fixtures_dir 가 있으면 fixture 가 있는 도시에서만 고름.
+    """
+    available = (lambda eng: has_fixtures(fixtures_dir, eng)) if fixtures_dir else (lambda eng: True)
+    if spec in ("zipf", "uniform"):
+        names = [kor for kor, eng in city_dict.items() if available(eng)]
+        if not names:
+            raise SystemExit(f"fixture 가 있는 도시가 없습니다: {fixtures_dir}")
+        weights = [1.0 / rank ** zipf_s for rank in range(1, len(names) + 1)] if spec == "zipf" else [1.0] * len(names)
+        return names, weights
+    names, weights = [], []
+    for item in spec.split(","):
+        name, _, weight = item.strip().partition(":")
+        if not name:
+            continue
+        eng = resolve_city(name)
+        if eng is None:
+            raise SystemExit(f"지원되지 않는 도시입니다: {name}")
+        if not available(eng):
+            raise SystemExit(f"fixture 가 없는 도시입니다: {name} ({fixtures_dir})")
+        names.append(name)
+        weights.append(float(weight or 1))
+    return names, weights
+
+
+def read_rss(pid):
+    # 리눅스 /proc 기준 상주 메모리(바이트), 알 수 없으면 None
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def upstream_calls(metrics_url):
+    # 서버 프로세스의 /metrics 에서 외부 API 호출 수 (응답 + 응답 전 오류)
+    if not metrics_url:
+        return None
+    with urllib.request.urlopen(metrics_url, timeout=5) as response:
+        text = response.read().decode("utf-8")
+    return sum(float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(UPSTREAM_METRICS))
+
+
+class AppServer:
+    """부하 단계마다 새로 띄우는 streamlit run 프로세스 (캐시와 메모리가 이전 단계의 영향을 받지 않도록)"""
+
+    def __init__(self, env):
+        self.port = free_port()
+        self.metrics_port = free_port()
+        self.url = f"ws://127.0.0.1:{self.port}/_stcore/stream"
+        self.metrics_url = f"http://127.0.0.1:{self.metrics_port}/metrics"
+        self.log = tempfile.TemporaryFile()
+        server_env = dict(os.environ, METRICS_PORT=str(self.metrics_port), **env)
+        for key, value in SERVER_ENV.items():
+            server_env.setdefault(key, value)
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+             "--server.address", "127.0.0.1", "--server.port", str(self.port),
+             "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+            cwd=ROOT, env=server_env, stdout=self.log, stderr=subprocess.STDOUT,
+        )
+        self.pid = self.process.pid
+
+    def wait_ready(self):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        self.log.seek(0)
+        raise RuntimeError("Streamlit 서버가 시작되지 않았습니다.\n" + self.log.read().decode("utf-8", "replace")[-2000:])
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self.log.close()
+
+
+class Session:
+    """브라우저 탭 하나: 재실행 요청(BackMsg)을 보내고 script_finished 까지 걸린 시간을 잼"""
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.ws = None
+        self.city_widget = None
+        self.fragment_id = ""
+
+    async def connect(self):
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def rerun(self, city=None):
+        """city 가 있으면 city_input 에 입력한 것처럼 (그 위젯이 속한 fragment 만) 재실행. (초, 실패 사유 목록) 반환"""
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = ""
+        if city is not None and self.city_widget:
+            msg.rerun_script.fragment_id = self.fragment_id
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = self.city_widget
+            widget.string_value = city
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        errors = await asyncio.wait_for(self._drain(), self.timeout)
+        return time.perf_counter() - started, errors
+
+    async def _drain(self):
+        errors = []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "script_finished":
+                return errors
+            if kind != "delta" or fwd.delta.WhichOneof("type") != "new_element":
+                continue
+            element = fwd.delta.new_element
+            if element.WhichOneof("type") == "exception":
+                errors.append(f"exception: {element.exception.message}")
+            elif element.WhichOneof("type") == "alert" and element.alert.format == Alert.ERROR:
+                # "날씨 데이터를 불러올 수 없습니다." 같은 오류 화면도 실패로 셈
+                errors.append(f"error: {element.alert.body}")
+            elif element.WhichOneof("type") == "text_input" and element.text_input.id.endswith("-city_input"):
+                self.city_widget = element.text_input.id
+                self.fragment_id = fwd.delta.fragment_id
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+
+class Stats:
+    def __init__(self):
+        self.samples = {"first": [], "switch": []}
+        self.failed = 0
+        self.errors = {}
+
+    def record(self, kind, elapsed, errors):
+        # 실패한 재실행은 지연 백분위에서 빼고 사유별로 셈
+        if not errors:
+            self.samples[kind].append(elapsed)
+            return
+        self.failed += 1
+        for message in errors:
+            self.error(message[:80])
+
+    def error(self, reason):
+        self.errors[reason] = self.errors.get(reason, 0) + 1
+
+    def latency(self, kind):
+        values = np.array(self.samples[kind]) * 1000
+        if not len(values):
+            return None
+        return {
+            "runs": len(values),
+            "p50_ms": round(float(np.percentile(values, 50)), 1),
+            "p95_ms": round(float(np.percentile(values, 95)), 1),
+            "p99_ms": round(float(np.percentile(values, 99)), 1),
+            "max_ms": round(float(values.max()), 1),
+        }
+
+
+async def simulate_user(index, url, args, names, weights, stats):
+    # 시작을 ramp 초에 고르게 흩뿌리고, 생각 시간은 평균 think 초의 지수 분포 (사용자마다 고정 seed)
+    rng = random.Random(f"{args.seed}:{index}")
+    await asyncio.sleep(args.ramp * rng.random())
+    session = Session(url, args.timeout)
+    try:
+        await session.connect()
+        stats.record("first", *await session.rerun())
+        for _ in range(args.actions):
+            await asyncio.sleep(rng.expovariate(1 / args.think) if args.think > 0 else 0)
+            stats.record("switch", *await session.rerun(rng.choices(names, weights)[0]))
+    except asyncio.TimeoutError:
+        stats.error("timeout")
+    except Exception as e:
+        stats.error(type(e).__name__)
+    return session
+
+
+async def run_level(users, url, args, names, weights):
+    stats = Stats()
+    started = time.perf_counter()
+    sessions = await asyncio.gather(*[simulate_user(i, url, args, names, weights, stats) for i in range(users)])
+    return stats, time.perf_counter() - started, sessions
+
+
+def measure_level(users, args, names, weights, server_env):
+    server = None
+    if args.url:
+        url, metrics_url, pid = args.url, args.metrics_url, args.pid
+    else:
+        server = AppServer(server_env)
+        server.wait_ready()
+        url, metrics_url, pid = server.url, server.metrics_url, server.pid
+    try:
+        # 연결 하나로 import/초기화를 끝낸 뒤를 기준으로 잡음 (이 호출 수는 사용자 몫에서 뺌)
+        if server is not None:
+            asyncio.run(warm_up(url, args.timeout))
+        rss_before = read_rss(pid) if pid else None
+        calls_before = upstream_calls(metrics_url)
+
+        async def level():
+            stats, wall, sessions = await run_level(users, url, args, names, weights)
+            # 세션을 열어 둔 채로 메모리를 재고 닫음
+            rss_after = read_rss(pid) if pid else None
+            await asyncio.gather(*[s.close() for s in sessions], return_exceptions=True)
+            return stats, wall, rss_after
+
+        stats, wall, rss_after = asyncio.run(level())
+        calls_after = upstream_calls(metrics_url)
+    finally:
+        if server is not None:
+            server.stop()
+
+    runs = len(stats.samples["first"]) + len(stats.samples["switch"]) + stats.failed
+    calls = calls_after - calls_before if calls_before is not None else None
+    return {
+        "users": users,
+        "reruns": runs,
+        "failed": stats.failed,
+        "errors": stats.errors,
+        "wall_s": round(wall, 2),
+        "throughput_rps": round(runs / wall, 2) if wall else None,
+        "first": stats.latency("first"),
+        "switch": stats.latency("switch"),
+        "upstream_calls": calls,
+        "upstream_calls_per_user": round(calls / users, 2) if calls is not None else None,
+        "rss_before_mb": round(rss_before / 2**20, 1) if rss_before else None,
+        "rss_after_mb": round(rss_after / 2**20, 1) if rss_after else None,
+        "mb_per_session": round((rss_after - rss_before) / 2**20 / users, 2) if rss_before and rss_after else None,
+    }
+
+
+async def warm_up(url, timeout):
+    session = Session(url, timeout)
+    await session.connect()
+    await session.rerun()
+    await session.close()
+
+
+def start_stub_server(fixtures_dir, latency, jitter):
+    from weathermusic.stub_server import create_server
+
+    server = create_server(providers.ReplayProvider(fixtures_dir, latency=latency, jitter=jitter), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, {"WEATHER_PROVIDER": "live", "OWM_BASE_URL": f"{base}/owm", "IPINFO_BASE_URL": f"{base}/ipinfo"}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _ms(latency, key):
+    return f"{latency[key]:>8.0f}ms" if latency else f"{'-':>10}"
+
+
+def print_report(result):
+    print(f"\nprovider={result['provider']} latency={result['latency']}s think={result['think']}s "
+          f"actions={result['actions']} cities={result['cities']} revision={result['revision']}")
+    print(f"{'users':>5} {'rps':>7} {'first p50':>10} {'p95':>10} {'switch p50':>10} {'p95':>10} {'p99':>10} "
+          f"{'calls/user':>10} {'MB/session':>10} {'failed':>6}  errors")
+    for level in result["levels"]:
+        per_user = level["upstream_calls_per_user"]
+        per_session = level["mb_per_session"]
+        errors = ", ".join(f"{k}={v}" for k, v in level["errors"].items()) or "-"
+        print(f"{level['users']:>5} {level['throughput_rps'] or 0:>7.1f} {_ms(level['first'], 'p50_ms')} "
+              f"{_ms(level['first'], 'p95_ms')} {_ms(level['switch'], 'p50_ms')} {_ms(level['switch'], 'p95_ms')} "
+              f"{_ms(level['switch'], 'p99_ms')} {per_user if per_user is not None else '-':>10} "
+              f"{per_session if per_session is not None else '-':>10} {level['failed']:>6}  {errors}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="weather_app.py 동시 접속 부하 테스트")
+    parser.add_argument("--users", default="1,10,25", help="동시 사용자 수 단계 (쉼표로 구분, 단계마다 서버를 새로 띄움)")
+    parser.add_argument("--actions", type=int, default=10, help="사용자당 도시 전환 횟수 (첫 화면 제외)")
+    parser.add_argument("--think", type=float, default=1.0, help="도시 전환 사이 평균 생각 시간(초, 지수 분포, 0 이면 쉬지 않음)")
+    parser.add_argument("--ramp", type=float, default=2.0, help="사용자 접속을 흩뿌리는 시간(초)")
+    parser.add_argument("--cities", default="zipf", help="zipf | uniform | '서울:5,부산:2,제주:1'")
+    parser.add_argument("--zipf-s", type=float, default=1.0, help="zipf 분포 지수 (클수록 상위 도시에 몰림)")
+    parser.add_argument("--provider", choices=["stub", "replay", "synthetic"], default="stub",
+                        help="stub: 로컬 HTTP 스텁 서버 경유(실제 requests.get), replay: 서버 안 재생, synthetic: 합성 데이터")
+    parser.add_argument("--fixtures", help="fixture 디렉터리 (없으면 임시 디렉터리에 합성)")
+    parser.add_argument("--latency", type=float, default=0.1, help="API 응답당 인위적 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연의 ± 흔들림(초)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="재실행 하나를 기다리는 최대 시간(초)")
+    parser.add_argument("--seed", default="load")
+    parser.add_argument("--url", help="이미 떠 있는 서버의 ws://.../_stcore/stream (지정하면 서버를 띄우지 않음)")
+    parser.add_argument("--metrics-url", help="--url 서버의 /metrics 주소 (외부 API 호출 수)")
+    parser.add_argument("--pid", type=int, help="--url 서버의 프로세스 ID (메모리 측정)")
+    parser.add_argument("--results", default=DEFAULT_RESULTS)
+    parser.add_argument("--no-save", action="store_true")
+    args = parser.parse_args(argv)
+
+    if websockets is None:
+        raise SystemExit("websockets 패키지가 필요합니다. (pip install websockets)")
+    levels = [int(n) for n in args.users.split(",") if n.strip()]
+
+    fixtures_dir = args.fixtures
+    if not fixtures_dir and args.provider != "synthetic" and not args.url:
+        fixtures_dir = tempfile.mkdtemp(prefix="weathermusic-fixtures-")
+        synthesize(fixtures_dir)
+    replaying = args.provider != "synthetic" and not args.url
+    names, weights = city_weights(args.cities, args.zipf_s, fixtures_dir if replaying else None)
+
+    stub = None
+    server_env = {"WEATHER_PROVIDER": args.provider}
+    if args.provider == "stub" and not args.url:
+        stub, server_env = start_stub_server(fixtures_dir, args.latency, args.jitter)
+    elif args.provider == "replay":
+        server_env.update(FIXTURES_DIR=fixtures_dir, REPLAY_LATENCY=str(args.latency), REPLAY_JITTER=str(args.jitter))
+
+    result = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "provider": args.provider if not args.url else "external",
+        "latency": args.latency,
+        "think": args.think,
+        "actions": args.actions,
+        "cities": args.cities,
+        "levels": [],
+    }
+    try:
+        for users in levels:
+            print(f"{users} users ...", flush=True)
+            result["levels"].append(measure_level(users, args, names, weights, server_env))
+    finally:
+        if stub is not None:
+            stub.shutdown()
+
+    print_report(result)
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.results), exist_ok=True)
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+        print(f"\n결과 저장: {args.results}")
+
+
+if __name__ == "__main__":
+    main()
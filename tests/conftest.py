@@ -0,0 +1,9 @@
+import os
+import sys
+
+# 패키지를 설치하지 않고 저장소 루트에서 바로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# 테스트 중에는 .cache/ 에 기록을 남기거나 백그라운드 갱신을 시작하지 않음
+os.environ.setdefault("HISTORY", "0")
+os.environ.setdefault("PREFETCH", "0")
+os.environ.setdefault("GEOCODE_CACHE_PATH", "")
@@ -0,0 +1,37 @@
+import pytest
+
+from weathermusic.assets import icon_src
+from weathermusic.data import weather_icon_map
+from weathermusic.fixtures import CONDITIONS, SyntheticProvider
+from weathermusic.forecast import ForecastFrame
+from weathermusic.transform import current_weather_view, icon_html
+
+DATA_URI = "data:image/webp;base64,"
+
+
+@pytest.mark.parametrize("icon_path", sorted(set(weather_icon_map.values())))
+def test_icon_src_is_data_uri(icon_path):
+    assert icon_src(icon_path).startswith(DATA_URI)
+
+
+def test_fixture_conditions_have_icons():
+    # lang=kr 설명("맑음", "실 비", "온흐림")과 상관없이 main 으로 아이콘을 찾음
+    for main, desc, _ in CONDITIONS:
+        if main != "Snow":
+            assert icon_src(weather_icon_map[main]).startswith(DATA_URI), desc
+
+
+def test_fixture_payload_renders_icons():
+    provider = SyntheticProvider(now=1_760_000_000)
+    lat, lon = 37.5665, 126.978
+    weather = provider.get("owm", "data/2.5/weather", {"lat": lat, "lon": lon}).data
+    view = current_weather_view(weather)
+    assert view["icon_path"] == weather_icon_map.get(weather["weather"][0]["main"])
+
+    forecast = provider.get("owm", "data/2.5/forecast", {"lat": lat, "lon": lon}).data
+    days = ForecastFrame(forecast).daily()
+    rendered = [icon_html(day["icon_path"]) for day in days if day["icon_path"]]
+    # 5일 예보에는 눈만 오는 날이 아니면 아이콘이 있음
+    assert rendered
+    assert all(f'src="{DATA_URI}' in html for html in rendered)
+    assert icon_html(None) == ""
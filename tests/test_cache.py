@@ -0,0 +1,238 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from weathermusic import prefetch
+from weathermusic.cache import DiskStore, TTLCache
+from weathermusic.quota import QuotaExceededError, QuotaGovernor
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def make_cache(clock, **kwargs):
+    kwargs.setdefault("ttls", {"weather": 600, "forecast": 3600})
+    return TTLCache(clock=clock, **kwargs)
+
+
+def stored_keys(path):
+    with sqlite3.connect(path) as conn:
+        return sorted(conn.execute("SELECT endpoint, key FROM api_cache").fetchall())
+
+
+def test_ttl_per_endpoint(clock):
+    cache = make_cache(clock, default_ttl=60)
+    cache.set("weather", "Seoul", {"temp": 1})
+    cache.set("forecast", "Seoul", {"list": []})
+    cache.set("air_pollution", "Seoul", {"aqi": 2})
+    clock.advance(599)
+    assert cache.get("weather", "Seoul") == {"temp": 1}
+    assert cache.get("air_pollution", "Seoul") is None
+    clock.advance(1)
+    assert cache.get("weather", "Seoul") is None
+    assert cache.get("forecast", "Seoul") == {"list": []}
+    assert cache.peek("weather", "Seoul")[0] == {"temp": 1}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (2, 2, 0.5)
+    assert stats["by_endpoint"]["weather"] == {"hits": 1, "stale_hits": 0, "misses": 1, "shared_hits": 0}
+
+
+def test_lru_eviction(clock):
+    cache = make_cache(clock, max_size=2)
+    cache.set("weather", "Seoul", 1)
+    cache.set("weather", "Busan", 2)
+    # 최근에 쓴 Seoul 은 남고 Busan 이 밀려남
+    assert cache.get("weather", "Seoul") == 1
+    cache.set("weather", "Jeju", 3)
+    assert cache.peek("weather", "Busan") is None
+    assert cache.get("weather", "Seoul") == 1 and cache.get("weather", "Jeju") == 3
+    assert cache.stats()["size"] == 2
+
+
+def test_reload_after_restart(clock, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = make_cache(clock, store=DiskStore(path))
+    cache.set("weather", "Seoul", {"name": "서울", "temp": 1.5})
+    cache.set("forecast", "Seoul", {"list": [1, 2]})
+    clock.advance(60)
+
+    restarted = make_cache(clock, store=DiskStore(path))
+    assert restarted.get("weather", "Seoul") == {"name": "서울", "temp": 1.5}
+    assert restarted.get("forecast", "Seoul") == {"list": [1, 2]}
+    # 저장 시각과 만료 시각도 그대로
+    assert restarted.peek("weather", "Seoul")[1:] == (clock.now - 60, clock.now - 60 + 600)
+
+
+def test_reload_purges_rows_past_max_stale(clock, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = make_cache(clock, store=DiskStore(path), max_stale=3600)
+    cache.set("weather", "Seoul", 1)
+    cache.set("forecast", "Seoul", 2)
+    # weather 는 만료 후 허용 기간(1시간)이 지났고 forecast 는 만료됐지만 아직 허용 기간 안
+    clock.advance(600 + 3600)
+    restarted = make_cache(clock, store=DiskStore(path), max_stale=3600)
+    assert restarted.peek("weather", "Seoul") is None
+    assert restarted.peek("forecast", "Seoul")[0] == 2
+    assert stored_keys(path) == [("forecast", "Seoul")]
+
+
+def test_reload_keeps_most_recent_within_max_size(clock, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = make_cache(clock, store=DiskStore(path))
+    for city in ("Seoul", "Busan", "Jeju"):
+        cache.set("weather", city, city)
+        clock.advance(1)
+    restarted = make_cache(clock, store=DiskStore(path), max_size=2)
+    assert restarted.peek("weather", "Seoul") is None
+    assert restarted.get("weather", "Jeju") == "Jeju"
+    assert stored_keys(path) == [("weather", "Busan"), ("weather", "Jeju")]
+
+
+def test_invalidate_and_clear_update_store(clock, tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = make_cache(clock, store=DiskStore(path))
+    cache.set("weather", "Seoul", 1)
+    cache.set("weather", "Busan", 2)
+    cache.invalidate("weather", "Seoul")
+    assert cache.get("weather", "Seoul") is None
+    assert stored_keys(path) == [("weather", "Busan")]
+    cache.clear()
+    assert stored_keys(path) == []
+    assert cache.stats()["size"] == 0 and cache.stats()["misses"] == 0
+
+
+def test_failed_fetch_is_not_cached(clock):
+    cache = make_cache(clock)
+    assert cache.get_or_fetch("weather", "Seoul", lambda: None) is None
+    assert cache.get_or_fetch("weather", "Seoul", lambda: {"temp": 1}) == {"temp": 1}
+    assert cache.get_or_fetch("weather", "Seoul", lambda: pytest.fail("fetched again")) == {"temp": 1}
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class BlockingFetch:
+    """release() 될 때까지 원본 조회를 붙잡아 두고 호출 수를 셈"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+        self.started = threading.Event()
+        self._release = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.started.set()
+        assert self._release.wait(5)
+        return self.value
+
+    def release(self):
+        self._release.set()
+
+
+def test_stale_while_revalidate(clock):
+    cache = make_cache(clock, max_stale=3600)
+    cache.set("weather", "Seoul", "old")
+    clock.advance(601)
+    fetch = BlockingFetch("new")
+    # 갱신이 끝나기 전의 동시 요청들은 모두 오래된 값을 바로 받고, 원본 조회는 한 번만
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("weather", "Seoul", fetch)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert results == ["old"] * 5
+    assert fetch.started.wait(5)
+    fetch.release()
+    wait_until(lambda: cache.peek("weather", "Seoul")[0] == "new")
+    assert fetch.calls == 1
+    assert cache.peek("weather", "Seoul")[2] == clock.now + 600
+    assert cache.get_or_fetch("weather", "Seoul", lambda: pytest.fail("fetched again")) == "new"
+    stats = cache.stats()
+    assert (stats["stale_hits"], stats["hits"], stats["misses"]) == (5, 1, 0)
+
+
+def test_concurrent_misses_fetch_once(clock):
+    cache = make_cache(clock)
+    fetch = BlockingFetch({"temp": 1})
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("weather", "Seoul", fetch)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    assert fetch.started.wait(5)
+    wait_until(lambda: cache.stats()["coalesced"] == 4)
+    fetch.release()
+    for t in threads:
+        t.join(5)
+    assert results == [{"temp": 1}] * 5
+    assert fetch.calls == 1
+
+
+def test_quota_exhausted_serves_stale(clock):
+    cache = make_cache(clock, max_stale=3600)
+    cache.set("weather", "Seoul", "old")
+    # 허용 기간도 지나 원본을 다시 불러야 하지만 예산이 없음
+    clock.advance(600 + 3600 + 1)
+
+    def exhausted():
+        raise QuotaExceededError("global", 5)
+
+    assert cache.get_or_fetch("weather", "Seoul", exhausted) == "old"
+    assert cache.stats()["degraded"] == 1
+    # 보여줄 값이 없으면 그대로 올려 보냄
+    with pytest.raises(QuotaExceededError):
+        cache.get_or_fetch("weather", "Busan", exhausted)
+
+
+def test_prefetch_stops_at_reserve(monkeypatch):
+    cache = TTLCache(ttls={"weather": 600, "forecast": 600, "air_pollution": 600})
+    governor = QuotaGovernor(calls_per_minute=60, session_calls_per_minute=0, burst=5)
+    refreshed = []
+
+    def refresh_city(city, endpoint):
+        governor.acquire()
+        refreshed.append((city, endpoint))
+        cache.set(endpoint, city, {"city": city})
+
+    monkeypatch.setattr(prefetch, "refresh_city", refresh_city)
+    prefetcher = prefetch.Prefetcher(["Seoul", "Busan"], cache=cache, governor=governor, reserve=2)
+    # 6개 모두 갱신 대상이지만 예산 5 중 2는 사용자 몫이라 3개만 갱신하고 멈춤
+    assert len(prefetcher.due()) == 6
+    prefetcher.run_once()
+    assert len(refreshed) == 3
+    assert governor.headroom() == 2
+    assert prefetcher.skipped_for_budget == 1
+    assert len(prefetcher.due()) == 3
+
+
+def test_prefetch_skips_fresh_entries(monkeypatch):
+    cache = TTLCache(ttls={"weather": 600, "forecast": 30, "air_pollution": 600})
+    for endpoint in ("weather", "forecast", "air_pollution"):
+        cache.set(endpoint, "Seoul", 1)
+    prefetcher = prefetch.Prefetcher(["Seoul"], cache=cache, governor=QuotaGovernor(calls_per_minute=0),
+                                     refresh_ahead=60)
+    # 만료까지 refresh_ahead 보다 가까운 항목만
+    assert prefetcher.due() == [("Seoul", "forecast")]
@@ -0,0 +1,121 @@
+import timeit
+
+import pytest
+
+from weathermusic.cities import CITIES, City, CityIndex, city_index, deletions, edit_distance, load_cities
+
+
+@pytest.mark.parametrize("query, kor", [
+    ("서울", "서울"),
+    ("seoul", "서울"),
+    ("Pusan", "부산"),
+    ("Cheju", "제주"),
+    ("Kwangju", "광주"),
+    ("가평군", "가평"),
+    ("Suwon-si", "수원"),
+    ("Seuol", "서울"),
+    ("서을", "서울"),
+])
+def test_resolve(query, kor):
+    assert city_index.resolve(query).kor == kor
+
+
+@pytest.mark.parametrize("query", ["", "  ", "부", "ㅅㅇ", "없는도시xyz"])
+def test_resolve_ambiguous_or_unknown(query):
+    # 입력 중이거나 여러 도시에 해당하면 확정하지 않음
+    assert city_index.resolve(query) is None
+
+
+@pytest.mark.parametrize("query, first", [
+    ("부", "부산"),
+    ("gapy", "가평"),
+    ("ㅅㅇ", "서울"),
+    ("Kwangju", "광주"),
+    ("서을", "서울"),
+])
+def test_search_ranks_best_match_first(query, first):
+    results = city_index.search(query, limit=3)
+    assert results and results[0].kor == first
+    assert len(results) <= 3
+
+
+def test_exact_match_skips_typo_candidates():
+    # 정확히/앞부분이 맞으면 오타로 비슷한 도시를 덧붙이지 않음
+    assert [c.kor for c in city_index.search("서울")] == ["서울"]
+    assert [c.kor for c in city_index.search("Gyeongju")] == ["경주"]
+
+
+@pytest.mark.parametrize("query, kor", [
+    ("chungcheon", "춘천"),
+    ("ancheong", "산청"),
+    ("ganjgin", "강진"),
+    ("의정뷰", "의정부"),
+])
+def test_search_typos(query, kor):
+    assert kor in [c.kor for c in city_index.search(query, limit=5)]
+
+
+@pytest.mark.parametrize("a, b, limit, expected", [
+    ("soul", "soul", 1, 0),
+    ("suol", "soul", 1, 1),
+    ("jungjon", "junjon", 2, 1),
+    ("anjong", "injon", 2, 2),
+    ("anjong", "daejon", 2, 3),
+    ("abc", "abcdef", 2, 3),
+])
+def test_edit_distance(a, b, limit, expected):
+    assert edit_distance(a, b, limit) == expected
+
+
+def test_deletions():
+    assert deletions("abc", 1) == {"abc": 0, "bc": 1, "ac": 1, "ab": 1}
+    assert deletions("aab", 2) == {"aab": 0, "ab": 1, "aa": 1, "b": 2, "a": 2}
+
+
+def test_search_is_sub_millisecond():
+    # 입력할 때마다 부르므로 오타 비교가 필요한 검색어도 1ms 안에 끝나야 함 (여러 번 재서 가장 빠른 값)
+    for query in ["서울", "부", "ㅅㅇ", "gyongju", "Kyongju", "chungcheon", "ancheong", "changyeong", "Seuol", "서을"]:
+        seconds = min(timeit.repeat(lambda: city_index.search(query), number=50, repeat=5)) / 50
+        assert seconds < 0.001, (query, seconds)
+
+
+def test_search_unknown():
+    assert city_index.search("없는도시xyz") == []
+
+
+def test_every_city_has_coordinates():
+    assert all(-90 <= c.lat <= 90 and -180 <= c.lon <= 180 for c in CITIES)
+    assert all(city_index.get(c.kor) is c and city_index.get(c.eng) is c for c in CITIES)
+
+
+def test_small_index():
+    cities = [
+        City("여주", "Yeoju", "경기도", 37.29, 127.63, False, ()),
+        City("영주", "Yeongju", "경상북도", 36.80, 128.62, False, ()),
+    ]
+    index = CityIndex(cities)
+    assert index.resolve("Yeoju").kor == "여주"
+    assert [c.kor for c in index.search("ㅇㅈ")] == ["여주", "영주"]
+
+
+def test_load_cities_rejects_missing_coordinates(tmp_path):
+    path = tmp_path / "cities.csv"
+    path.write_text(
+        "# comment\n"
+        "kor,eng,province,lat,lon,featured,aliases\n"
+        "서울,Seoul,서울특별시,37.5665,126.978,1,Soul\n"
+        "가평,Gapyeong,경기도,,,0,\n",
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="가평"):
+        load_cities(str(path))
+
+
+def test_load_cities(tmp_path):
+    path = tmp_path / "cities.csv"
+    path.write_text(
+        "kor,eng,province,lat,lon,featured,aliases\n"
+        "서울,Seoul,서울특별시,37.5665,126.978,1,Soul|서울특별시\n",
+        encoding="utf-8",
+    )
+    assert load_cities(str(path)) == [City("서울", "Seoul", "서울특별시", 37.5665, 126.978, True, ("Soul", "서울특별시"))]
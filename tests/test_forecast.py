@@ -0,0 +1,104 @@
+import datetime
+from collections import Counter
+
+import pytest
+
+from weathermusic.data import weather_icon_map, weather_translation
+from weathermusic.forecast import ForecastFrame
+
+CONDITIONS = [("Clear", "맑음"), ("Clouds", "튼구름"), ("Clouds", "온흐림"), ("Rain", "실 비"), ("Snow", "눈")]
+STEP = 3 * 60 * 60
+
+
+def make_payload(start, count, tz_offset):
+    # 5일치 3시간 예보와 같은 모양, 값은 결정적으로 흔들리게
+    items = []
+    for i in range(count):
+        temp = 10 + (i * 7 % 11) - 3 + i * 0.13
+        items.append({
+            "dt": start + i * STEP,
+            "main": {"temp": round(temp, 2), "temp_min": round(temp - (i % 3) * 0.5, 2),
+                     "temp_max": round(temp + (i % 2) * 0.7, 2)},
+            "weather": [dict(zip(("main", "description"), CONDITIONS[(i * i + i // 4) % len(CONDITIONS)]))],
+            "pop": (i * 13 % 10) / 10,
+        })
+    return {"city": {"timezone": tz_offset}, "list": items}
+
+
+def reference_daily(payload):
+    # 벡터화 이전처럼 항목을 하나씩 도시 현지 날짜로 묶어 계산
+    tz = datetime.timezone(datetime.timedelta(seconds=payload["city"]["timezone"]))
+    days = {}
+    for item in payload["list"]:
+        days.setdefault(datetime.datetime.fromtimestamp(item["dt"], tz).date(), []).append(item)
+    result = []
+    for date, items in days.items():
+        counts = Counter(item["weather"][0]["description"] for item in items)
+        # 동률이면 먼저 나온 상태 (Counter 는 처음 나온 순서를 유지)
+        desc = max(counts, key=counts.get)
+        desc_kor = weather_translation.get(desc, desc)
+        temps = [item["main"]["temp"] for item in items]
+        result.append({
+            "date": date.strftime("%m/%d"),
+            "day_of_week": date.strftime("%A"),
+            "temp_min": round(min(min(item["main"]["temp_min"], item["main"]["temp"]) for item in items), 1),
+            "temp_max": round(max(max(item["main"]["temp_max"], item["main"]["temp"]) for item in items), 1),
+            "temp_mean": sum(temps) / len(temps),
+            "pop": int(round(max(item["pop"] for item in items) * 100)),
+            "desc": desc,
+            "desc_kor": desc_kor,
+            "icon_path": weather_icon_map.get(next(item["weather"][0]["main"] for item in items
+                                                   if item["weather"][0]["description"] == desc)),
+        })
+    return result
+
+
+# 2026-10-18 14:00 UTC: 시간대에 따라 첫날과 마지막 날이 몇 칸만 남는 날이 됨
+START = int(datetime.datetime(2026, 10, 18, 14, tzinfo=datetime.timezone.utc).timestamp())
+
+
+@pytest.mark.parametrize("tz_offset", [0, 9 * 3600, -5 * 3600, 5 * 3600 + 1800, 14 * 3600])
+@pytest.mark.parametrize("start", [START, START + STEP, START - 11 * 3600])
+def test_daily_matches_reference(tz_offset, start):
+    payload = make_payload(start, 40, tz_offset)
+    expected = reference_daily(payload)
+    actual = ForecastFrame(payload).daily()
+    assert [day["date"] for day in actual] == [day["date"] for day in expected]
+    for got, want in zip(actual, expected):
+        assert got["temp_mean"] == pytest.approx(want.pop("temp_mean"), abs=0.05 + 1e-9)
+        assert {k: v for k, v in got.items() if k != "temp_mean"} == want
+
+
+def test_partial_first_and_last_days():
+    # KST 23:00 시작: 첫날은 한 칸, 40칸(5일) 뒤 마지막 날도 일부만
+    start = int(datetime.datetime(2026, 10, 18, 14, tzinfo=datetime.timezone.utc).timestamp())
+    payload = make_payload(start, 40, 9 * 3600)
+    days = ForecastFrame(payload).daily()
+    assert days[0]["date"] == "10/18"
+    assert len(days) == 6
+    first = payload["list"][0]
+    assert days[0]["pop"] == int(round(first["pop"] * 100))
+    assert days[0]["desc"] == first["weather"][0]["description"]
+    assert days[-1]["date"] == "10/23"
+
+
+def test_day_boundary_follows_city_timezone():
+    # 같은 UTC 시각이 UTC 로는 10/18, KST 로는 10/19
+    dt = int(datetime.datetime(2026, 10, 18, 20, tzinfo=datetime.timezone.utc).timestamp())
+    payload = make_payload(dt, 1, 0)
+    assert ForecastFrame(payload).daily()[0]["date"] == "10/18"
+    payload["city"]["timezone"] = 9 * 3600
+    day = ForecastFrame(payload).daily()[0]
+    assert (day["date"], day["day_of_week"]) == ("10/19", "Monday")
+
+
+def test_empty_forecast():
+    assert ForecastFrame({"list": []}).daily() == []
+    assert ForecastFrame({}).hourly() == ([], [])
+
+
+def test_hourly_uses_local_time():
+    payload = make_payload(START, 10, 9 * 3600)
+    times, temps = ForecastFrame(payload).hourly(3)
+    assert times == ["10/18 23:00", "10/19 02:00", "10/19 05:00"]
+    assert temps == [item["main"]["temp"] for item in payload["list"][:3]]
@@ -0,0 +1,47 @@
+from weathermusic.geoip import IPLocator, client_ip
+
+
+def test_ignores_forwarded_header_without_trusted_proxy():
+    headers = {"X-Forwarded-For": "8.8.8.8", "X-Real-IP": "8.8.4.4"}
+    assert client_ip(headers, "1.1.1.1", trusted_proxies=0) == "1.1.1.1"
+    assert client_ip(headers, None, trusted_proxies=0) is None
+
+
+def test_takes_address_added_by_trusted_proxies():
+    # 방문자가 앞에 넣은 8.8.8.8 이 아니라 우리 프록시가 덧붙인 주소
+    headers = {"x-forwarded-for": "8.8.8.8, 9.9.9.9"}
+    assert client_ip(headers, "10.0.0.2", trusted_proxies=1) == "9.9.9.9"
+    # 프록시 두 단: 바깥 프록시가 본 방문자 주소, 안쪽 프록시가 본 바깥 프록시 주소 순
+    headers = {"X-Forwarded-For": "8.8.8.8, 9.9.9.9, 10.0.0.1"}
+    assert client_ip(headers, "10.0.0.2", trusted_proxies=2) == "9.9.9.9"
+
+
+def test_falls_back_to_remote_addr_when_header_is_short():
+    assert client_ip({}, "1.1.1.1", trusted_proxies=1) == "1.1.1.1"
+    assert client_ip({"X-Forwarded-For": "9.9.9.9"}, "1.1.1.1", trusted_proxies=2) == "1.1.1.1"
+
+
+def test_private_or_invalid_address_is_none():
+    assert client_ip({"X-Forwarded-For": "8.8.8.8, 192.168.0.5"}, "10.0.0.2", trusted_proxies=1) is None
+    assert client_ip({"X-Forwarded-For": "unknown"}, "10.0.0.2", trusted_proxies=1) is None
+    assert client_ip({}, "[2001:4860:4860::8888]", trusted_proxies=0) == "2001:4860:4860::8888"
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.lookups = 0
+
+    def city(self, ip):
+        self.lookups += 1
+        return "Seoul"
+
+
+def test_locator_caches_database_hits():
+    database = FakeDatabase()
+    locator = IPLocator(database, max_size=1)
+    assert locator.locate("9.9.9.9") == "Seoul"
+    assert locator.locate("9.9.9.9") == "Seoul"
+    assert database.lookups == 1
+    locator.locate("8.8.8.8")
+    locator.locate("9.9.9.9")
+    assert database.lookups == 3
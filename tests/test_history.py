@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+from weathermusic.history import HOUR, HistoryStore
+
+DAY = 24 * HOUR
+# 정시에서 시작하는 기준 시각
+START = 1_760_000_000 // DAY * DAY
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock(START)
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    store = HistoryStore(str(tmp_path / "history.sqlite3"), retention_days=7, compact_after_hours=24, clock=clock)
+    yield store
+    store.close()
+
+
+def observation(dt, temp, condition="Clear", humidity=50):
+    return {"dt": dt, "main": {"temp": temp, "feels_like": temp - 1, "humidity": humidity, "pressure": 1010},
+            "wind": {"speed": 2.0}, "weather": [{"main": condition, "description": "맑음"}]}
+
+
+def forecast(times, temps):
+    return {"list": [{"dt": t, "main": {"temp": temp}, "pop": 0.1, "weather": [{"main": "Clouds"}]}
+                     for t, temp in zip(times, temps)]}
+
+
+def rows(store, table):
+    return store._conn.execute(f"SELECT * FROM {table} ORDER BY 1, 2, 3").fetchall()
+
+
+def test_records_each_observation_once(store):
+    store.record("weather", "Seoul", observation(START, 10.0))
+    store.record("weather", "Seoul", observation(START, 99.0))
+    store.record("weather", "Busan", observation(START + 600, 12.0))
+    seoul = store.observations("Seoul", START - DAY)
+    assert seoul["time"].tolist() == [START]
+    assert seoul["temp"].tolist() == [10.0]
+    assert store.observations("Seoul", START + 1)["time"].tolist() == []
+
+
+def test_latest_forecast_uses_last_snapshot_before_target(store, clock):
+    targets = [START + 3 * HOUR, START + 6 * HOUR]
+    store.record("forecast", "Seoul", forecast(targets, [10.0, 11.0]))
+    clock.now = START + 4 * HOUR
+    # 두 번째 스냅샷은 첫 대상 시각 이후에 받았으므로 첫 대상에는 쓰지 않음
+    store.record("forecast", "Seoul", forecast(targets, [20.0, 21.0]))
+    latest = store.latest_forecast("Seoul", START)
+    assert latest["time"].tolist() == targets
+    assert latest["temp"].tolist() == [10.0, 21.0]
+
+
+def test_retention(store, clock):
+    store.record("weather", "Seoul", observation(START, 10.0))
+    store.record("forecast", "Seoul", forecast([START + HOUR], [10.0]))
+    store.maintain(START + 7 * DAY)
+    assert len(rows(store, "observations")) == 1
+    store.maintain(START + HOUR + 7 * DAY + 1)
+    assert rows(store, "observations") == [] and rows(store, "forecast_points") == []
+
+
+def test_compacts_old_observations_to_hourly_rows(store):
+    # 첫 시간대 10분마다 6개, 두 번째 시간대 1개 (정시 아님), 세 번째 시간대는 아직 압축 대상 아님
+    for i in range(6):
+        store.record_observation("Seoul", observation(START + i * 600, 10.0 + i, "Rain" if i == 5 else "Clear",
+                                                      humidity=40 + i))
+    store.record_observation("Seoul", observation(START + HOUR + 900, 20.0))
+    store.record_observation("Seoul", observation(START + 2 * HOUR + 300, 30.0))
+    store.record_observation("Busan", observation(START + 600, 5.0))
+
+    store.maintain(START + 2 * HOUR + 24 * HOUR + 1)
+    assert rows(store, "observations") == [
+        ("Busan", START, 5.0, 4.0, 50, 1010, 2.0, "Clear"),
+        # 평균값 (습도 42.5 -> 43, 습도/기압은 정수), 상태는 그 시간대 마지막 관측
+        ("Seoul", START, 12.5, 11.5, 43, 1010, 2.0, "Rain"),
+        ("Seoul", START + HOUR, 20.0, 19.0, 50, 1010, 2.0, "Clear"),
+        ("Seoul", START + 2 * HOUR + 300, 30.0, 29.0, 50, 1010, 2.0, "Clear"),
+    ]
+    compacted = rows(store, "observations")
+    # 다시 정리해도 바뀌지 않음
+    store.maintain(START + 2 * HOUR + 24 * HOUR + 1)
+    assert rows(store, "observations") == compacted
+
+
+def test_compacts_past_forecast_snapshots(store, clock):
+    targets = [START + 3 * HOUR, START + 30 * HOUR]
+    store.record("forecast", "Seoul", forecast(targets, [10.0, 11.0]))
+    clock.now = START + HOUR
+    store.record("forecast", "Seoul", forecast(targets, [12.0, 13.0]))
+    store.maintain(START + 4 * HOUR)
+    # 지나간 대상 시각은 마지막 스냅샷만, 아직 오지 않은 시각은 모든 스냅샷 유지
+    assert [(r[1], r[2], r[3]) for r in rows(store, "forecast_points")] == [
+        (START + 3 * HOUR, START + HOUR, 12.0),
+        (START + 30 * HOUR, START, 11.0),
+        (START + 30 * HOUR, START + HOUR, 13.0),
+    ]
+
+
+def test_forecast_vs_actual(store):
+    store.record("forecast", "Seoul", forecast([START + 3 * HOUR, START + 6 * HOUR, START + 9 * HOUR],
+                                               [10.0, 12.0, 14.0]), fetched_at=START)
+    # 3시 예보는 2시 50분 관측과, 6시 예보는 6시 20분 관측과 짝짓고 9시는 가까운 관측이 없음
+    store.record_observation("Seoul", observation(START + 2 * HOUR + 50 * 60, 9.0))
+    store.record_observation("Seoul", observation(START + 4 * HOUR + 30 * 60, 50.0))
+    store.record_observation("Seoul", observation(START + 6 * HOUR + 20 * 60, 13.5))
+    result = store.forecast_vs_actual("Seoul", START)
+    assert result["time"].tolist() == [START + 3 * HOUR, START + 6 * HOUR]
+    assert result["forecast"].tolist() == [10.0, 12.0]
+    assert result["actual"].tolist() == [9.0, 13.5]
+    np.testing.assert_allclose(result["error"], [1.0, -1.5])
+
+
+def test_forecast_vs_actual_after_hourly_compaction(store):
+    store.record("forecast", "Seoul", forecast([START + 3 * HOUR], [10.0]), fetched_at=START)
+    for minute in (0, 20, 40):
+        store.record_observation("Seoul", observation(START + 3 * HOUR + minute * 60, 8.0 + minute / 10))
+    store.maintain(START + 3 * HOUR + 25 * HOUR)
+    result = store.forecast_vs_actual("Seoul", START)
+    assert result["actual"].tolist() == [10.0]
+    assert result["error"].tolist() == [0.0]
+
+
+def test_forecast_vs_actual_empty(store):
+    result = store.forecast_vs_actual("Seoul", START)
+    assert all(len(v) == 0 for v in result.values())
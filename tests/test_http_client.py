@@ -0,0 +1,186 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from weathermusic.http_client import CircuitBreaker, CircuitOpenError, HttpClient, retry_count
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    # 경로별로 앞의 몇 번은 503, 그다음부터 200 (delays: 응답 전 대기, retry_after: 503 의 Retry-After)
+    failures = {}
+    hits = {}
+    delays = {}
+    retry_after = {}
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        count = self.hits[path] = self.hits.get(path, 0) + 1
+        time.sleep(self.delays.get(path, 0))
+        status = 503 if count <= self.failures.get(path, 0) else 200
+        body = b'{"ok": true}' if status == 200 else b'{"error": "unavailable"}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if status == 503 and path in self.retry_after:
+            self.send_header("Retry-After", str(self.retry_after[path]))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FlakyHandler.failures, FlakyHandler.hits, FlakyHandler.delays, FlakyHandler.retry_after = {}, {}, {}, {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    # 성공하면 연속 실패 수가 초기화됨
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_allows_one_trial():
+    breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.1)
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+    # 시험 요청이 실패하면 다시 쿨다운
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+    time.sleep(0.1)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow() and breaker.allow()
+
+
+def test_retries_until_success(server):
+    FlakyHandler.failures["/data"] = 2
+    client = HttpClient(timeout=5, retries=3, backoff_factor=0)
+    response = client.get(server + "/data", params={"q": "Seoul"})
+    assert response.status_code == 200
+    assert response.json() == {"ok": True}
+    assert retry_count(response) == 2
+    assert FlakyHandler.hits["/data"] == 3
+    assert client.breakers()[server[len("http://"):]].state == "closed"
+
+
+def test_returns_last_error_when_retries_run_out(server):
+    FlakyHandler.failures["/down"] = 10
+    client = HttpClient(timeout=5, retries=2, backoff_factor=0)
+    response = client.get(server + "/down")
+    assert response.status_code == 503
+    assert retry_count(response) == 2
+    assert FlakyHandler.hits["/down"] == 3
+
+
+def test_retries_stop_at_budget(server):
+    # 계속 실패해도 재시도와 백오프를 합쳐 예산 안에서 끝남
+    FlakyHandler.failures["/down"] = 100
+    client = HttpClient(timeout=5, retries=20, backoff_factor=0.1, budget=1.0)
+    started = time.monotonic()
+    response = client.get(server + "/down")
+    assert time.monotonic() - started < 1.0
+    assert response.status_code == 503
+    assert 1 <= retry_count(response) < 20
+
+
+def test_slow_server_times_out_within_budget(server):
+    FlakyHandler.delays["/slow"] = 2
+    client = HttpClient(timeout=(3.05, 10), retries=3, backoff_factor=0, budget=0.5)
+    started = time.monotonic()
+    with pytest.raises(requests.Timeout):
+        client.get(server + "/slow")
+    assert time.monotonic() - started < 1.0
+
+
+def test_retry_after_beyond_budget_returns_at_once(server):
+    FlakyHandler.failures["/busy"] = 1
+    FlakyHandler.retry_after["/busy"] = 30
+    client = HttpClient(timeout=5, retries=3, backoff_factor=0, budget=2)
+    started = time.monotonic()
+    response = client.get(server + "/busy")
+    assert time.monotonic() - started < 1.0
+    assert response.status_code == 503 and retry_count(response) == 0
+
+
+def test_default_budget_fits_bundle_timeout():
+    from weathermusic import fetch, http_client
+
+    assert fetch.BUNDLE_TIMEOUT == http_client.BUNDLE_TIMEOUT
+    assert http_client.http.budget < fetch.BUNDLE_TIMEOUT
+
+
+def test_breaker_opens_per_host(server):
+    FlakyHandler.failures["/down"] = 100
+    client = HttpClient(timeout=5, retries=0, backoff_factor=0)
+    host = server[len("http://"):]
+    client._breakers[host] = CircuitBreaker(threshold=2, cooldown=60)
+    for _ in range(2):
+        assert client.get(server + "/down").status_code == 503
+    with pytest.raises(CircuitOpenError):
+        client.get(server + "/ok")
+    # 열린 동안에는 서버에 요청이 가지 않음
+    assert "/ok" not in FlakyHandler.hits
+    # 네트워크 오류 처리(except RequestException)로 함께 잡힘
+    assert issubclass(CircuitOpenError, requests.RequestException)
+
+
+def test_connection_error_counts_as_failure():
+    client = HttpClient(timeout=1, retries=0, backoff_factor=0)
+    # 아무도 듣지 않는 포트
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    host = f"127.0.0.1:{port}"
+    client._breakers[host] = CircuitBreaker(threshold=1, cooldown=60)
+    with pytest.raises(requests.ConnectionError):
+        client.get(f"http://{host}/")
+    with pytest.raises(CircuitOpenError):
+        client.get(f"http://{host}/")
+
+
+@pytest.mark.parametrize("error", [ValueError("decode"), KeyboardInterrupt()])
+def test_any_exception_releases_half_open_trial(server, monkeypatch, error):
+    client = HttpClient(timeout=5, retries=0, backoff_factor=0)
+    host = server[len("http://"):]
+    breaker = client._breakers[host] = CircuitBreaker(threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.1)
+
+    def broken(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(client.session, "get", broken)
+    with pytest.raises(type(error)):
+        client.get(server + "/data")
+    # 시험 요청이 실패로 기록되어 쿨다운 뒤 다시 시험할 수 있음
+    assert breaker.state == "open"
+    time.sleep(0.1)
+    monkeypatch.undo()
+    assert client.get(server + "/data").status_code == 200
+    assert breaker.state == "closed"
@@ -0,0 +1,128 @@
+import threading
+import time
+
+import pytest
+
+from weathermusic.quota import QuotaExceededError, QuotaGovernor, SingleFlight, TokenBucket, session
+
+
+def test_quota_error_is_not_a_request_error():
+    # 네트워크 오류 처리(except RequestException)에 삼켜지면 안 됨
+    requests = pytest.importorskip("requests")
+    assert not issubclass(QuotaExceededError, requests.RequestException)
+
+
+def test_token_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=1, capacity=2)
+    now = bucket.updated
+    assert bucket.take(now) and bucket.take(now)
+    assert not bucket.take(now)
+    assert bucket.wait_time(now) == pytest.approx(1.0)
+    assert bucket.take(now + 1)
+    assert bucket.available(now + 100) == 2
+
+
+def test_global_budget():
+    governor = QuotaGovernor(calls_per_minute=60, session_calls_per_minute=0, burst=3)
+    for _ in range(3):
+        governor.acquire()
+    with pytest.raises(QuotaExceededError) as exc:
+        governor.acquire()
+    assert exc.value.scope == "global"
+    assert 0 < exc.value.retry_after <= 1
+    assert governor.granted == 3 and governor.denied["global"] == 1
+    assert governor.headroom() == 0
+
+
+def test_session_budget_is_per_session():
+    governor = QuotaGovernor(calls_per_minute=600, session_calls_per_minute=2, burst=100)
+    governor.acquire("a")
+    governor.acquire("a")
+    with pytest.raises(QuotaExceededError) as exc:
+        governor.acquire("a")
+    assert exc.value.scope == "session"
+    # 다른 세션과 세션 없는 호출은 영향 없음
+    governor.acquire("b")
+    governor.acquire()
+    with session("a"):
+        assert governor.headroom() == 0
+    assert governor.headroom("b") == 1
+    assert governor.headroom("new") == 2
+
+
+def test_charge_counts_against_window():
+    governor = QuotaGovernor(calls_per_minute=3, session_calls_per_minute=0, burst=10)
+    governor.charge(3)
+    assert governor.usage()["used_last_minute"] == 3
+    with pytest.raises(QuotaExceededError):
+        governor.acquire()
+
+
+def test_disabled_governor():
+    governor = QuotaGovernor(calls_per_minute=0)
+    for _ in range(100):
+        governor.acquire("a")
+    assert governor.headroom() == float("inf")
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", fetch)))
+    leader.start()
+    assert started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", fetch))) for _ in range(4)]
+    for t in followers:
+        t.start()
+    while flight.coalesced < 4:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(5)
+    assert calls == [1]
+    assert results == ["value"] * 5
+    assert flight.in_flight() == 0
+    # 끝난 뒤에는 다시 실행
+    assert flight.do("k", lambda: "again") == "again"
+
+
+def test_single_flight_shares_errors():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def run():
+        try:
+            flight.do("k", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run)]
+    threads[0].start()
+    assert started.wait(5)
+    threads.append(threading.Thread(target=run))
+    threads[1].start()
+    while flight.coalesced < 1:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(errors) == 2 and errors[0] is errors[1]
+    assert flight.in_flight() == 0
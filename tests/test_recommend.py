@@ -0,0 +1,76 @@
+import random
+import time
+
+from weathermusic.cities import CITIES
+from weathermusic.recommend import (
+    CONDITIONS, MIN_ATTRACTIONS, SEASONS, TIMES, Attraction, Context, Recommender, Track, recommender,
+)
+
+ENGS = [c.eng for c in CITIES]
+
+
+def synthetic_catalog(count, seed=1):
+    rng = random.Random(seed)
+
+    def tags(pool):
+        return frozenset(rng.sample(pool, rng.randint(0, 2)))
+
+    tracks = [
+        Track(f"track {i}", "artist", None, tags(CONDITIONS), tags(SEASONS), tags(TIMES),
+              frozenset([rng.choice(ENGS)]) if i % 5 == 0 else frozenset(), rng.uniform(0.5, 2))
+        for i in range(count)
+    ]
+    attractions = [
+        Attraction(f"place {i}", f"place {i}", rng.choice(ENGS), None, tags(CONDITIONS), tags(SEASONS), tags(TIMES),
+                   rng.uniform(0.5, 2))
+        for i in range(count)
+    ]
+    return tracks, attractions
+
+
+def test_large_catalog_builds_quickly():
+    # 후보 목록은 처음 조회할 때 만들므로 카탈로그 크기가 시작 시간에 거의 영향이 없어야 함
+    tracks, attractions = synthetic_catalog(3000)
+    started = time.perf_counter()
+    large = Recommender(tracks, attractions)
+    assert time.perf_counter() - started < 1.0
+
+    started = time.perf_counter()
+    for condition in CONDITIONS + (None,):
+        context = Context(condition, "가을", "evening", "Seoul")
+        assert len(large.recommend_tracks(context, seed=1)) == 6
+        assert len(large.recommend_attractions(context, seed=1)) == MIN_ATTRACTIONS
+    assert time.perf_counter() - started < 1.0
+
+
+def test_lookup_is_memoized():
+    tracks, attractions = synthetic_catalog(200)
+    small = Recommender(tracks, attractions)
+    context = Context("rain", "겨울", "night", "Busan")
+    assert small.track_candidates(context) is small.track_candidates(context)
+    # 도시 노래가 없는 도시는 전국 후보 목록을 공유
+    assert small.track_candidates(context._replace(city="Nowhere")) is small.track_candidates(context._replace(city=None))
+
+
+def test_relaxes_time_before_season_before_weather():
+    def track(title, conditions=(), seasons=(), times=()):
+        return Track(title, "artist", None, frozenset(conditions), frozenset(seasons), frozenset(times), frozenset(), 1.0)
+
+    tracks = [
+        track("exact", ["rain"], ["가을"], ["night"]),
+        track("other time", ["rain"], ["가을"], ["morning"]),
+        track("other season", ["rain"], ["봄"], ["night"]),
+        track("other weather", ["clear"], ["가을"], ["night"]),
+    ]
+    candidates = Recommender(tracks, []).track_candidates(Context("rain", "가을", "night", None))
+    assert [t.title for t in candidates.items] == ["exact", "other time", "other season", "other weather"]
+    weights = [b - a for a, b in zip((0.0,) + candidates.cumulative, candidates.cumulative)]
+    assert weights == sorted(weights, reverse=True)
+
+
+def test_attractions_fill_from_same_province():
+    context = Context("clear", "봄", "day", "Gapyeong")
+    places = recommender.recommend_attractions(context, seed="s")
+    assert len(places) == MIN_ATTRACTIONS
+    assert recommender.recommend_attractions(context, seed="s") == places
+    assert recommender.attraction_candidates(context._replace(city="Nowhere")) is None
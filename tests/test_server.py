@@ -0,0 +1,116 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from weathermusic import providers, quota, server, service
+from weathermusic.cache import api_cache
+from weathermusic.fixtures import SyntheticProvider
+
+
+@pytest.fixture(autouse=True)
+def synthetic(monkeypatch):
+    # 네트워크 없이 결정적인 응답, 호출 예산 제한 없음
+    previous = providers.set_provider(SyntheticProvider())
+    monkeypatch.setattr(quota, "governor", quota.QuotaGovernor(calls_per_minute=0))
+    api_cache.clear()
+    yield
+    providers.set_provider(previous)
+    api_cache.clear()
+
+
+def test_weather():
+    status, body, headers = server.handle("/weather", {"city": "서울"}, "127.0.0.1")
+    assert status == 200
+    assert body["city"]["eng"] == "Seoul"
+    assert headers["Cache-Control"] == f"public, max-age={server.SERVICE_MAX_AGE}"
+
+
+def test_recommendations():
+    status, body, _ = server.handle("/recommendations", {"city": "busan", "tracks": "3", "attractions": "0", "seed": "a"})
+    assert status == 200
+    assert len(body["tracks"]) == 3 and body["attractions"] == []
+    assert server.handle("/recommendations", {"city": "busan", "tracks": "3", "attractions": "0", "seed": "a"})[1] == body
+
+
+def test_missing_city():
+    status, body, headers = server.handle("/weather", {})
+    assert status == 400
+    assert "city" in body["error"]
+    assert "Cache-Control" not in headers
+
+
+@pytest.mark.parametrize("value", ["abc", "-1", "21", "1.5"])
+def test_bad_count(value):
+    status, body, _ = server.handle("/recommendations", {"city": "서울", "tracks": value})
+    assert status == 400
+    assert body == {"error": "tracks 는 0~20 사이의 정수여야 합니다. (tracks must be an integer between 0 and 20)"}
+
+
+def test_unknown_route():
+    status, body, _ = server.handle("/nope", {"city": "서울"})
+    assert status == 404
+    assert body["routes"] == sorted(server.ROUTES)
+
+
+def test_unknown_city_suggestions():
+    status, body, headers = server.handle("/weather", {"city": "부"})
+    assert status == 404
+    assert body["suggestions"][0] == {"kor": "부산", "eng": "Busan", "province": "부산광역시"}
+    assert "Cache-Control" not in headers
+
+
+def test_quota_exceeded(monkeypatch):
+    def exhausted(city):
+        raise quota.QuotaExceededError("global", 12.3)
+
+    monkeypatch.setattr(service, "current_weather", exhausted)
+    status, _, headers = server.handle("/weather", {"city": "서울"})
+    assert status == 429
+    assert headers["Retry-After"] == "13"
+
+
+def test_upstream_error(monkeypatch):
+    def unavailable(city):
+        raise service.UpstreamError(city.eng, "weather")
+
+    monkeypatch.setattr(service, "current_weather", unavailable)
+    assert server.handle("/weather", {"city": "서울"})[0] == 502
+
+
+def test_internal_value_error_is_500(monkeypatch):
+    # 내부 ValueError 는 클라이언트 오류가 아니며 메시지를 내보내지 않음
+    def broken(city):
+        raise ValueError("could not convert string to float: 'secret'")
+
+    monkeypatch.setattr(service, "current_weather", broken)
+    status, body, _ = server.handle("/weather", {"city": "서울"})
+    assert status == 500
+    assert body == {"error": "서버 내부 오류입니다. (Internal server error)"}
+
+
+def test_health():
+    status, body, _ = server.handle("/health", {})
+    assert status == 200 and body["status"] == "ok"
+
+
+def test_threaded_server():
+    httpd = server.create_server(port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    try:
+        # 퍼센트 인코딩한 한글 도시 이름
+        with urllib.request.urlopen(base + "/forecast/daily?city=%EC%A0%9C%EC%A3%BC") as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"] == "application/json; charset=utf-8"
+            assert response.headers["Cache-Control"].startswith("public")
+            assert json.load(response)["city"]["eng"] == "Jeju"
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            urllib.request.urlopen(base + "/weather")
+        assert exc.value.code == 400
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,168 @@
+import threading
+import time
+
+import pytest
+
+from weathermusic.shared_cache import MemoryStore, SQLiteStore, open_store
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStore()
+    return SQLiteStore(str(tmp_path / "shared.sqlite"))
+
+
+def test_set_get_fresh(store):
+    now = time.time()
+    value = {"name": "서울", "list": [1, 2.5, None]}
+    store.set("weather", "Seoul", value, now, now + 60)
+    store.set("weather", "Busan", "old", now - 120, now - 60)
+    assert store.get("weather", "Seoul") == (value, now, now + 60)
+    assert store.fresh("weather", "Seoul") == (value, now, now + 60)
+    # 만료된 항목은 get 으로는 보이지만 fresh 는 아님
+    assert store.get("weather", "Busan")[0] == "old"
+    assert store.fresh("weather", "Busan") is None
+    assert store.get("weather", "Jeju") is None
+    assert store.get("forecast", "Seoul") is None
+
+
+def test_purge_at_hides_entry(store):
+    now = time.time()
+    store.set("weather", "Seoul", 1, now, now + 60, purge_at=now - 1)
+    assert store.get("weather", "Seoul") is None
+
+
+def test_delete_and_clear(store):
+    now = time.time()
+    for namespace in ("weather", "forecast"):
+        for key in ("Seoul", "Busan"):
+            store.set(namespace, key, key, now, now + 60)
+    store.delete("weather", "Seoul")
+    assert store.get("weather", "Seoul") is None
+    store.clear("weather")
+    assert store.get("weather", "Busan") is None
+    assert store.get("forecast", "Busan") is not None
+    store.clear()
+    assert store.get("forecast", "Busan") is None
+
+
+def test_acquire_is_exclusive_until_released(store):
+    assert store.acquire("weather:Seoul", "a", ttl=30)
+    assert not store.acquire("weather:Seoul", "b", ttl=30)
+    assert store.acquire("weather:Busan", "b", ttl=30)
+    # 다른 소유자는 풀 수 없음
+    store.release("weather:Seoul", "b")
+    assert not store.acquire("weather:Seoul", "b", ttl=30)
+    store.release("weather:Seoul", "a")
+    assert store.acquire("weather:Seoul", "b", ttl=30)
+
+
+def test_lease_expires(store):
+    # 잠근 워커가 죽어 풀지 못해도 임대 시간이 지나면 다른 워커가 가져감
+    assert store.acquire("weather:Seoul", "dead", ttl=0.05)
+    assert not store.acquire("weather:Seoul", "b", ttl=30)
+    time.sleep(0.1)
+    assert store.acquire("weather:Seoul", "b", ttl=30)
+    # 늦게 돌아온 이전 소유자의 release 는 새 잠금을 풀지 않음
+    store.release("weather:Seoul", "dead")
+    assert not store.acquire("weather:Seoul", "c", ttl=30)
+
+
+def test_lock_times_out_while_held(store):
+    assert store.acquire("weather:Seoul", "other", ttl=30)
+    started = time.monotonic()
+    with store.lock("weather:Seoul", ttl=30, wait=0.2) as acquired:
+        assert not acquired
+    assert time.monotonic() - started >= 0.2
+    # 획득하지 못한 lock 은 남의 잠금을 풀지 않음
+    assert not store.acquire("weather:Seoul", "b", ttl=30)
+
+
+def test_lock_waits_for_release(store):
+    assert store.acquire("weather:Seoul", "other", ttl=30)
+    timer = threading.Timer(0.1, store.release, ("weather:Seoul", "other"))
+    timer.start()
+    try:
+        with store.lock("weather:Seoul", ttl=30, wait=5) as acquired:
+            assert acquired
+            assert not store.acquire("weather:Seoul", "b", ttl=30)
+    finally:
+        timer.join()
+    # 블록을 나가면 풀림
+    assert store.acquire("weather:Seoul", "b", ttl=30)
+
+
+def test_lock_serializes_workers(store):
+    # 같은 이름으로 동시에 들어온 작업은 한 번에 하나만 실행
+    active = []
+    overlaps = []
+
+    def work():
+        with store.lock("weather:Seoul", ttl=30, wait=5) as acquired:
+            assert acquired
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.02)
+            active.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert overlaps == [1, 1, 1, 1]
+
+
+def test_sqlite_stores_share_file(tmp_path):
+    # 같은 파일을 연 두 저장소 = 두 프로세스
+    path = str(tmp_path / "shared.sqlite")
+    a, b = SQLiteStore(path), SQLiteStore(path)
+    now = time.time()
+    a.set("weather", "Seoul", {"temp": 1.5}, now, now + 60)
+    assert b.get("weather", "Seoul") == ({"temp": 1.5}, now, now + 60)
+    assert a.acquire("weather:Seoul", "a", ttl=30)
+    assert not b.acquire("weather:Seoul", "b", ttl=30)
+    a.release("weather:Seoul", "a")
+    assert b.acquire("weather:Seoul", "b", ttl=30)
+
+
+def test_open_store(tmp_path):
+    assert open_store("") is None
+    assert isinstance(open_store("memory"), MemoryStore)
+    assert isinstance(open_store(f"sqlite://{tmp_path}/shared.sqlite"), SQLiteStore)
+    with pytest.raises(ValueError):
+        open_store("mysql://localhost")
+
+
+def test_shared_hits_count_as_hits():
+    # 다른 워커(A)가 받아 둔 값을 B 가 공유 저장소에서 찾으면 B 의 적중률에도 들어감
+    from weathermusic.cache import TTLCache
+
+    shared = MemoryStore()
+    a, b = TTLCache(shared=shared), TTLCache(shared=shared)
+    a.set("weather", "Seoul", {"temp": 1})
+    assert b.get("weather", "Seoul") == {"temp": 1}
+    assert b.get_or_fetch("forecast", "Seoul", lambda: {"list": []}) == {"list": []}
+    a_forecast = a.get_or_fetch("forecast", "Seoul", lambda: pytest.fail("fetched twice"))
+    assert a_forecast == {"list": []}
+    # 두 번째 조회는 이 프로세스 캐시에서
+    assert b.get("weather", "Seoul") == {"temp": 1}
+
+    stats = b.stats()
+    assert (stats["hits"], stats["shared_hits"], stats["misses"]) == (2, 1, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+    assert stats["by_endpoint"]["weather"] == {"hits": 2, "stale_hits": 0, "misses": 0, "shared_hits": 1}
+    assert a.stats()["by_endpoint"]["forecast"]["shared_hits"] == 1
+
+
+def test_shared_fragment_hits_count_as_hits():
+    from weathermusic.fragments import FragmentCache
+
+    shared = MemoryStore()
+    a, b = FragmentCache(shared=shared), FragmentCache(shared=shared)
+    assert a.get_or_build(("card", "Seoul", 1), lambda: "<div>") == "<div>"
+    assert b.get_or_build(("card", "Seoul", 1), lambda: pytest.fail("built twice")) == "<div>"
+    stats = b.stats()
+    assert (stats["hits"], stats["shared_hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0, 1.0)
+    assert a.stats()["misses"] == 1
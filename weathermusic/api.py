@@ -0,0 +1,102 @@
+import os
+
+from dotenv import load_dotenv
+
+from .cache import api_cache
+from .geocode import geocoder
+from .geoip import locator
+from .history import history_store
+from . import providers
+from .metrics import timed
+from .cities import city_index
+
+# .env 파일 로드
+load_dotenv()
+
+# 환경 변수에서 API 키 가져오기
+API_KEY = os.getenv("API_KEY")
+
+
+def kor_to_eng_city(city):
+    # 한글명 또는 영문명 -> (한글명, 영문명), 목록에 없는 이름은 그대로
+    found = city_index.get(city)
+    return (found.kor, found.eng) if found else (city, city)
+
+@timed("get_location_by_ip")
+def get_location_by_ip(ip=None):
+    # 방문자 IP 의 도시 (ip 가 없으면 서버 위치)
+    try:
+        return locator.locate(ip)
+    except:
+        return ""
+
+
+# 중복 API 호출 함수 통합 (도시+엔드포인트 단위로 캐시)
+@timed("get_api_response")
+def get_api_response(city, endpoint):
+    _, eng_city = kor_to_eng_city(city)
+    return api_cache.get_or_fetch(endpoint, eng_city, lambda: fetch_api_response(city, endpoint))
+
+def get_coordinates(city):
+    kor_city, eng_city = kor_to_eng_city(city)
+    return geocoder.lookup(eng_city, kor_city, api_key=API_KEY)
+
+def owm_request(endpoint, lat, lon):
+    # 좌표 기반 OpenWeatherMap 요청 (service, path, params)
+    params = {"lat": lat, "lon": lon, "appid": API_KEY}
+    if endpoint != "air_pollution":
+        params.update({"units": "metric", "lang": "kr"})
+    return "owm", f"data/2.5/{endpoint}", params
+
+def fetch_api_response(city, endpoint):
+    coords = get_coordinates(city)
+    if not coords:
+        return None
+    lat, lon = coords
+    response = providers.current().get(*owm_request(endpoint, lat, lon))
+    if response.status_code == 200:
+        payload = response.data
+        # 원본 응답을 받을 때마다 시계열 저장소에 기록 (캐시 적중 시에는 기록하지 않음)
+        if history_store is not None:
+            _, eng_city = kor_to_eng_city(city)
+            try:
+                history_store.record(endpoint, eng_city, payload)
+            except Exception:
+                pass
+        return payload
+    return None
+
+def get_weather(city):
+    return get_api_response(city, "weather")
+
+def get_forecast(city):
+    return get_api_response(city, "forecast")
+
+@timed("get_air_quality")
+def get_air_quality(city):
+    _, eng_city = kor_to_eng_city(city)
+    return api_cache.get_or_fetch("air_pollution", eng_city, lambda: fetch_air_quality(city))
+
+def fetch_air_quality(city):
+    coords = get_coordinates(city)
+    if not coords:
+        return None
+    lat, lon = coords
+    response = providers.current().get(*owm_request("air_pollution", lat, lon))
+    if response.status_code == 200:
+        data = response.data or {}
+        if "list" in data and len(data["list"]) > 0:
+            return data["list"][0]["components"]["pm2_5"]
+    return None
+
+# 엔드포인트별 원본 조회 함수 (캐시 키는 영문 도시명)
+ENDPOINT_FETCHERS = {
+    "weather": lambda city: fetch_api_response(city, "weather"),
+    "forecast": lambda city: fetch_api_response(city, "forecast"),
+    "air_pollution": fetch_air_quality,
+}
+
+def refresh_city(city, endpoint):
+    _, eng_city = kor_to_eng_city(city)
+    fetch = ENDPOINT_FETCHERS[endpoint]
+    return api_cache.refresh(endpoint, eng_city, lambda: fetch(city))
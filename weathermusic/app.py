@@ -0,0 +1,195 @@
+import os
+import time
+import uuid
+
+import streamlit as st
+
+from . import metrics, quota, render
+from .api import get_location_by_ip
+from .cache import api_cache
+from .data import city_dict, supported_cities_text
+from .fetch import fetch_city_bundle, get_weather_many
+from .forecast import ForecastFrame
+from .fragments import fragment_cache
+from .geoip import client_ip
+from .history import history_store
+from .http_client import http
+from .prefetch import start_prefetcher
+from .recommend import context_label, recommender, weather_context
+from .timing import stage, timer
+from .transform import city_label, compare_rows, current_weather_view, resolve_city, search_cities
+
+city_dict_reverse = {eng: kor for kor, eng in city_dict.items()}
+
+debug = False  # 디버깅 모드 활성화 여부 (WEATHER_PROFILER=1 또는 ?debug=1 로도 켤 수 있음)
+
+
+def profiler_enabled():
+    return debug or os.getenv("WEATHER_PROFILER") == "1" or st.query_params.get("debug") == "1"
+
+
+def select_city(city_input):
+    if city_input:
+        city = resolve_city(city_input)
+        if not city and search_cities(city_input, 1):
+            st.info("후보 도시 중에서 선택해 주세요. (Please pick one of the suggested cities.)")
+        elif not city:
+            st.warning(f"지원되지 않는 도시입니다. 아래 리스트에서 선택해 주세요. (Unsupported city. Please select from the list below.)\n" + supported_cities_text)
+        elif city_input.strip() not in (city, city_dict_reverse.get(city)):
+            # 옛 로마자 표기나 오타를 고쳐 해석한 경우 어떤 도시로 보였는지 알려줌
+            st.caption(f"'{city_input.strip()}' → {city_label(city)}")
+        return city
+    detected = detect_city()
+    if not detected:
+        return None
+    st.info(f"자동 감지된 도시: {detected} (Auto-detected city)")
+    city = resolve_city(detected)
+    if not city:
+        st.warning(f"자동 감지된 도시가 지원 리스트에 없습니다. 도시명을 입력해 주세요. (Auto-detected city is not supported. Please enter a city name.)")
+    return city
+
+
+def visitor_ip():
+    # 리버스 프록시 뒤(TRUSTED_PROXIES)에서는 프록시가 덧붙인 X-Forwarded-For, 직접 접속이면 소켓 주소
+    try:
+        return client_ip(st.context.headers, st.context.ip_address)
+    except Exception:
+        return None
+
+
+def detect_city():
+    # 세션당 한 번만 조회 (재실행마다 다시 묻지 않음)
+    if "detected_city" not in st.session_state:
+        st.session_state["detected_city"] = get_location_by_ip(visitor_ip())
+    return st.session_state["detected_city"]
+
+
+def render_city(city):
+    # 현재 날씨/예보/대기질을 동시에 요청
+    with stage("fetch"):
+        bundle = fetch_city_bundle(city)
+    data = bundle.weather
+    if not data or "weather" not in data:
+        error = bundle.errors.get("weather")
+        st.error(f"날씨 데이터를 불러올 수 없습니다: {error}" if error else "날씨 데이터를 불러올 수 없습니다.")
+        return bundle
+    with stage("transform"):
+        # 같은 응답(도시, 수신 시각, 언어)으로 이미 만든 HTML/차트가 있으면 재사용
+        versions = bundle.fetched_at
+        weather_html = fragment_cache.get_or_build(
+            ("weather", city, versions.get("weather"), render.LOCALE),
+            lambda: render.current_weather_html(current_weather_view(data)),
+        )
+        forecast_html, fig = fragment_cache.get_or_build(
+            ("forecast", city, versions.get("forecast"), render.LOCALE),
+            lambda: build_forecast_fragments(bundle.forecast),
+        )
+
+    # 현재 날씨와 주간 예보를 한 화면에 배치
+    with stage("render.weather"):
+        col_now, col_forecast = st.columns([2, 3])
+        with col_now:
+            render.render_current_weather(weather_html)
+        with col_forecast:
+            render.render_daily_forecast(forecast_html)
+
+    # 도시의 현재 날씨, 계절, 현지 시간대에 맞춰 음악과 관광지를 추천
+    context = weather_context(city, data)
+    with stage("render.music"):
+        render_recommended_music(context)
+
+    st.markdown("---")
+
+    # 추천 관광지와 숙박 플랫폼 추천을 나란히 표시
+    with stage("render.links"):
+        col_tour, col_accommodation = st.columns(2)
+        with col_tour:
+            render.render_attractions(recommender.recommend_attractions(context, seed=recommend_seed(context)))
+        with col_accommodation:
+            render.render_accommodation(city)
+
+    with stage("render.chart"):
+        render.render_temperature_chart(fig)
+
+    if history_store is not None:
+        with stage("render.history"):
+            render.render_history(lambda days: load_history(city, days), data.get("timezone", 0))
+    return bundle
+
+
+def recommend_seed(context):
+    # 같은 세션, 같은 추천 기준이면 재실행해도 같은 결과 (유튜브 iframe 을 다시 불러오지 않음)
+    return f"{st.session_state.get('quota_session')}:{':'.join(map(str, context))}"
+
+
+def render_recommended_music(context):
+    render.render_music(recommender.recommend_tracks(context, seed=recommend_seed(context)), context_label(context))
+
+
+def build_forecast_fragments(forecast):
+    # 예보 목록은 한 번만 파싱해 주간 예보 HTML 과 24시간 차트에 함께 사용
+    if not forecast or "list" not in forecast:
+        return None, None
+    frame = ForecastFrame(forecast)
+    with stage("chart.figure"):
+        fig = render.build_temperature_figure(*frame.hourly())
+    return render.daily_forecast_html(frame.daily()), fig
+
+
+def load_history(city, days):
+    since = time.time() - days * 24 * 60 * 60
+    return (history_store.observations(city, since), history_store.latest_forecast(city, since),
+            history_store.forecast_vs_actual(city, since))
+
+
+def main():
+    st.set_page_config(page_title="웨더뮤직", layout="wide", page_icon="🎵")
+
+    # 지원 도시 데이터를 백그라운드에서 미리 갱신, 지표 내보내기 시작 (프로세스당 한 번)
+    start_prefetcher()
+    metrics.start_exporter()
+
+    # 이 세션에서 나가는 API 호출은 세션별 예산으로도 계산
+    st.session_state.setdefault("quota_session", uuid.uuid4().hex)
+    with stage("render.header"):
+        render.render_page_style()
+        render.render_header()
+
+    city_panel()
+    st.markdown("---")
+    compare_panel()
+
+
+@st.fragment
+def city_panel():
+    # 도시 입력이 바뀌면 이 부분만 다시 실행 (헤더와 비교 표는 다시 그리지 않음)
+    with timer.capture() as stages, quota.session(st.session_state.get("quota_session")):
+        with stage("select_city"):
+            city_input = render.render_search(search_cities, resolve_city)
+            city = select_city(city_input)
+        bundle = None
+        if city:
+            bundle = render_city(city)
+        else:
+            st.info("도시를 입력하거나 지원 도시를 선택해 주세요. (Please enter a city or select from the supported list.)")
+            with stage("render.music"):
+                render_recommended_music(weather_context(None))
+
+    if profiler_enabled():
+        render.render_profiler_panel(
+            stages, api_cache.stats(), {host: b.state for host, b in http.breakers().items()}, bundle,
+            quota.governor.usage(), fragment_cache.stats(),
+        )
+
+
+@st.fragment
+def compare_panel():
+    with quota.session(st.session_state.get("quota_session")), stage("render.compare"):
+        render.render_compare(compare_table)
+
+
+def compare_table(kor_cities):
+    # (표 행, 호출 예산이 모자라 이번에 채우지 못한 도시 수)
+    limited = set()
+    many = get_weather_many([city_dict[k] for k in kor_cities], limited=limited)
+    return compare_rows(kor_cities, many, limited), len(limited)
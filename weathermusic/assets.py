@@ -0,0 +1,206 @@
+"""정적 자산 파이프라인.
+
+원본 이미지(로컬 아이콘, 배경/국기/유튜브 썸네일 원격 이미지)를 줄인 WebP 로 변환하고 내용 해시를 붙인 이름으로
+static/assets/ 에 저장한 뒤 manifest.json 에 기록한다. Streamlit 정적 파일 서빙(.streamlit/config.toml)으로
+app/static/assets/ 아래에서 제공되며, 빌드하지 않았거나 정적 서빙이 꺼져 있으면 원격 주소를 그대로 쓴다.
+
+    python -m weathermusic.assets
+"""
+import argparse
+import base64
+import functools
+import hashlib
+import io
+import json
+import os
+
+import requests
+
+from .data import weather_icon_map
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(ROOT, "static")
+ASSET_DIR = os.path.join(STATIC_DIR, "assets")
+MANIFEST_PATH = os.path.join(ASSET_DIR, "manifest.json")
+# 브라우저에서 본 정적 파일 경로 (Streamlit 은 static/ 을 app/static/ 으로 제공)
+STATIC_URL = os.getenv("STATIC_URL_PREFIX", "app/static")
+
+BACKGROUND_URL = "https://images.unsplash.com/photo-1507525428034-b723cf961d3e"
+FLAG_URL = "https://upload.wikimedia.org/wikipedia/commons/0/09/Flag_of_South_Korea.svg"
+# 배경 너비별 변형, 아이콘은 화면 32px 의 2배로 만들어 HTML 에 직접 넣음
+BACKGROUND_WIDTHS = (960, 1600)
+ICON_SIZE = 64
+THUMBNAIL_WIDTH = 320
+WEBP_QUALITY = 72
+
+
+def youtube_thumbnail_url(video_id):
+    return f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg"
+
+
+def remote_background_url(width=BACKGROUND_WIDTHS[-1]):
+    # 빌드 전에도 원본 전체 해상도 대신 이미지 CDN 에 줄인 WebP 를 요청
+    return f"{BACKGROUND_URL}?w={width}&q={WEBP_QUALITY}&fm=webp&fit=max"
+
+
+def _hashed_name(name, data, ext):
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return f"{name}.{digest}.{ext}"
+
+
+def _write(out_dir, filename, data):
+    path = os.path.join(out_dir, filename)
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(data)
+    return filename
+
+
+def _to_webp(image, width=None, height=None):
+    from PIL import Image
+
+    if width and image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+    if height and image.height > height:
+        image = image.resize((round(image.width * height / image.height), height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=6)
+    return buffer.getvalue(), image.width, image.height
+
+
+def _open_image(data):
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    return image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+
+def _download(url, timeout=15):
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def build(out_dir=ASSET_DIR, fetch_remote=True, log=print):
+    """모든 자산을 변환해 out_dir 에 저장하고 manifest 를 반환"""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {}
+
+    for icon_path in sorted(set(weather_icon_map.values())):
+        with open(os.path.join(ROOT, icon_path), "rb") as f:
+            data, width, height = _to_webp(_open_image(f.read()), ICON_SIZE, ICON_SIZE)
+        manifest[icon_path] = {"data_uri": "data:image/webp;base64," + base64.b64encode(data).decode(), "bytes": len(data)}
+
+    remote = [("background", BACKGROUND_URL, BACKGROUND_WIDTHS)]
+    # 추천 카탈로그(tracks.csv)에 유튜브 ID 가 있는 곡의 썸네일
+    from .recommend import load_tracks
+    video_ids = sorted({t.video_id for t in load_tracks() if t.video_id})
+    remote += [(f"youtube/{video_id}", youtube_thumbnail_url(video_id), (THUMBNAIL_WIDTH,)) for video_id in video_ids]
+    for name, url, widths in remote if fetch_remote else []:
+        try:
+            source = _open_image(_download(url))
+        except (requests.RequestException, OSError) as e:
+            log(f"건너뜀 {name}: {e}")
+            continue
+        variants = []
+        for width in widths:
+            data, actual_width, actual_height = _to_webp(source, width)
+            filename = _write(out_dir, _hashed_name(name.replace("/", "-"), data, "webp"), data)
+            variants.append({"file": filename, "width": actual_width, "height": actual_height, "bytes": len(data)})
+        manifest[name] = {"variants": variants}
+
+    if fetch_remote:
+        # SVG 는 그대로 두고 이름에만 해시를 붙임 (작고 확대해도 깨지지 않음)
+        try:
+            data = _download(FLAG_URL)
+            manifest["flag"] = {"file": _write(out_dir, _hashed_name("flag", data, "svg"), data), "bytes": len(data)}
+        except requests.RequestException as e:
+            log(f"건너뜀 flag: {e}")
+
+    tmp_path = os.path.join(out_dir, "manifest.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, os.path.join(out_dir, "manifest.json"))
+    return manifest
+
+
+@functools.lru_cache(maxsize=1)
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def static_serving_enabled():
+    try:
+        import streamlit as st
+        return bool(st.get_option("server.enableStaticServing"))
+    except Exception:
+        return False
+
+
+def _static_url(filename):
+    return f"{STATIC_URL}/assets/{filename}"
+
+
+def asset_url(name, width=None):
+    """빌드된 자산 주소 (가장 작은 충분한 변형), 없거나 정적 서빙이 꺼져 있으면 None"""
+    entry = load_manifest().get(name)
+    if not entry or not static_serving_enabled():
+        return None
+    if "file" in entry:
+        return _static_url(entry["file"])
+    variants = sorted(entry["variants"], key=lambda v: v["width"])
+    for variant in variants:
+        if width is None or variant["width"] >= width:
+            return _static_url(variant["file"])
+    return _static_url(variants[-1]["file"])
+
+
+def background_css():
+    # 작은 화면에는 작은 변형을 쓰도록 media query 로 나눔
+    small = asset_url("background", BACKGROUND_WIDTHS[0]) or remote_background_url(BACKGROUND_WIDTHS[0])
+    large = asset_url("background", BACKGROUND_WIDTHS[-1]) or remote_background_url(BACKGROUND_WIDTHS[-1])
+    return (
+        f"body {{ background-image: url('{large}'); }}\n"
+        f"    @media (max-width: {BACKGROUND_WIDTHS[0]}px) {{ body {{ background-image: url('{small}'); }} }}"
+    )
+
+
+def flag_url():
+    return asset_url("flag") or FLAG_URL
+
+
+def thumbnail_url(video_id):
+    return asset_url(f"youtube/{video_id}", THUMBNAIL_WIDTH) or youtube_thumbnail_url(video_id)
+
+
+@functools.lru_cache(maxsize=None)
+@functools.lru_cache(maxsize=None)
+def icon_src(icon_path):
+    """날씨 아이콘을 data URI 로 (Streamlit 은 상대 경로 이미지를 제공하지 않음). 빌드 전이면 메모리에서 한 번만 변환"""
+    entry = load_manifest().get(icon_path)
+    if entry:
+        return entry["data_uri"]
+    try:
+        with open(os.path.join(ROOT, icon_path), "rb") as f:
+            data, _, _ = _to_webp(_open_image(f.read()), ICON_SIZE, ICON_SIZE)
+    except (OSError, ImportError):
+        return None
+    return "data:image/webp;base64," + base64.b64encode(data).decode()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="정적 자산 변환 (Build static assets)")
+    parser.add_argument("--out", default=ASSET_DIR)
+    parser.add_argument("--no-remote", action="store_true", help="원격 이미지(배경, 국기, 썸네일)는 받지 않음")
+    args = parser.parse_args(argv)
+    manifest = build(args.out, fetch_remote=not args.no_remote)
+    total = sum(entry.get("bytes", 0) + sum(v["bytes"] for v in entry.get("variants", [])) for entry in manifest.values())
+    print(f"{len(manifest)} assets, {total / 1024:.1f} KiB -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .quota import QuotaExceededError, SingleFlight
+from .shared_cache import shared_store
+
+# 엔드포인트별 캐시 유지 시간(초): 현재 날씨 10분, 예보 1시간, 대기질 30분
+DEFAULT_TTLS = {
+    "weather": 10 * 60,
+    "forecast": 60 * 60,
+    "air_pollution": 30 * 60,
+}
+DEFAULT_TTL = 10 * 60
+DEFAULT_MAX_SIZE = 512
+# 만료 후에도 이 시간(초) 동안은 오래된 값을 먼저 보여주고 백그라운드에서 갱신
+DEFAULT_MAX_STALE = 6 * 60 * 60
+# 공유 저장소에서 API 응답을 담는 네임스페이스 (키: "엔드포인트:도시")
+SHARED_NAMESPACE = "api"
+
+
+class DiskStore:
+    """앱 재시작 후에도 캐시가 유지되도록 SQLite 파일에 저장"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS api_cache ("
+            " endpoint TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL, expires_at REAL NOT NULL,"
+            " PRIMARY KEY (endpoint, key))"
+        )
+        self._conn.commit()
+
+    def load(self, cutoff):
+        with self._lock:
+            self._conn.execute("DELETE FROM api_cache WHERE expires_at <= ?", (cutoff,))
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT endpoint, key, value, stored_at, expires_at FROM api_cache ORDER BY stored_at"
+            ).fetchall()
+        return [(endpoint, key, json.loads(value), stored_at, expires_at) for endpoint, key, value, stored_at, expires_at in rows]
+
+    def put(self, endpoint, key, value, stored_at, expires_at):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO api_cache VALUES (?, ?, ?, ?, ?)",
+                (endpoint, key, json.dumps(value, ensure_ascii=False), stored_at, expires_at),
+            )
+            self._conn.commit()
+
+    def delete(self, endpoint, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM api_cache WHERE endpoint = ? AND key = ?", (endpoint, key))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM api_cache")
+            self._conn.commit()
+
+
+class TTLCache:
+    """엔드포인트별 TTL과 LRU 제거를 지원하는 프로세스 전역 캐시
+
+    shared(공유 저장소)가 있으면 이 프로세스에 없는 값을 다른 워커가 받아 둔 것에서 찾고, 원본 갱신은
+    도시+엔드포인트 단위 프로세스 간 잠금으로 한 워커만 수행한다.
+    """
+
+    def __init__(self, ttls=None, default_ttl=DEFAULT_TTL, max_size=DEFAULT_MAX_SIZE, store=None, max_stale=DEFAULT_MAX_STALE,
+                 shared=None, clock=time.time):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self.max_stale = max_stale
+        self.store = store
+        self.shared = shared
+        # 현재 시각 (시험에서 바꿔 끼움)
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._refreshing = set()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-revalidate")
+        # 같은 항목을 동시에 갱신하려는 세션들은 한 번의 원본 호출을 공유
+        self._flights = SingleFlight()
+        self.hits = {}
+        self.misses = {}
+        self.stale_hits = {}
+        self.degraded = {}
+        self.shared_hits = {}
+        if store is not None:
+            for endpoint, key, value, stored_at, expires_at in store.load(clock() - max_stale):
+                self._entries[(endpoint, key)] = (value, stored_at, expires_at)
+            self._evict()
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint, key):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get((endpoint, key))
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end((endpoint, key))
+                self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+                return entry[0]
+        shared = self._from_shared(endpoint, key, now)
+        if shared is not None:
+            return shared[0]
+        with self._lock:
+            self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+        return None
+
+    def _from_shared(self, endpoint, key, now, count_hit=True):
+        # 다른 워커가 받아 둔 유효한 값을 이 프로세스 캐시로 가져옴 (공유 저장소에 다시 쓰지 않음)
+        # count_hit: 조회 경로에서는 적중으로 세고, 미스 뒤 갱신 잠금을 기다린 경우에는 세지 않음
+        if self.shared is None:
+            return None
+        entry = self.shared.fresh(SHARED_NAMESPACE, f"{endpoint}:{key}", now)
+        if entry is None:
+            return None
+        with self._lock:
+            self._entries[(endpoint, key)] = entry
+            self._entries.move_to_end((endpoint, key))
+            if count_hit:
+                # 공유 저장소 적중도 적중 (shared_hits 는 그중 다른 워커에서 온 것)
+                self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+                self.shared_hits[endpoint] = self.shared_hits.get(endpoint, 0) + 1
+            self._evict()
+        return entry
+
+    def peek(self, endpoint, key):
+        # 통계와 LRU 순서에 영향 없이 (value, stored_at, expires_at) 조회
+        with self._lock:
+            return self._entries.get((endpoint, key))
+
+    def set(self, endpoint, key, value):
+        stored_at = self.clock()
+        expires_at = stored_at + self.ttl_for(endpoint)
+        with self._lock:
+            self._entries[(endpoint, key)] = (value, stored_at, expires_at)
+            self._entries.move_to_end((endpoint, key))
+            self._evict()
+        if self.store is not None:
+            self.store.put(endpoint, key, value, stored_at, expires_at)
+        if self.shared is not None:
+            self.shared.set(SHARED_NAMESPACE, f"{endpoint}:{key}", value, stored_at, expires_at, expires_at + self.max_stale)
+
+    def get_or_fetch(self, endpoint, key, fetch, count_miss=True):
+        # count_miss=False: 바로 앞의 get() 이 이미 미스를 센 경우 (두 번 세지 않도록)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get((endpoint, key))
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end((endpoint, key))
+                self.hits[endpoint] = self.hits.get(endpoint, 0) + 1
+                return entry[0]
+        shared = self._from_shared(endpoint, key, now)
+        if shared is not None:
+            return shared[0]
+        with self._lock:
+            if entry is not None and entry[2] + self.max_stale > now:
+                # stale-while-revalidate: 오래된 값을 바로 돌려주고 갱신은 백그라운드에서
+                self._entries.move_to_end((endpoint, key))
+                self.stale_hits[endpoint] = self.stale_hits.get(endpoint, 0) + 1
+                self.revalidate(endpoint, key, fetch)
+                return entry[0]
+            if count_miss:
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+        try:
+            return self.refresh(endpoint, key, fetch)
+        except QuotaExceededError:
+            # 호출 예산이 바닥나면 허용 기간이 지난 값이라도 있으면 그대로 보여줌
+            if entry is None:
+                raise
+            with self._lock:
+                self.degraded[endpoint] = self.degraded.get(endpoint, 0) + 1
+            return entry[0]
+
+    def refresh(self, endpoint, key, fetch):
+        return self._flights.do((endpoint, key), lambda: self._refresh(endpoint, key, fetch))
+
+    def _refresh(self, endpoint, key, fetch):
+        if self.shared is None:
+            return self._fetch(endpoint, key, fetch)
+        # 여러 워커 중 잠금을 얻은 하나만 원본을 조회, 기다린 워커는 그 결과를 공유 저장소에서 받음
+        with self.shared.lock(f"{SHARED_NAMESPACE}:{endpoint}:{key}"):
+            shared = self._from_shared(endpoint, key, self.clock(), count_hit=False)
+            if shared is not None:
+                return shared[0]
+            return self._fetch(endpoint, key, fetch)
+
+    def _fetch(self, endpoint, key, fetch):
+        value = fetch()
+        # 실패한 응답(None)은 캐시하지 않아 다음 요청에서 다시 시도
+        if value is not None:
+            self.set(endpoint, key, value)
+        return value
+
+    def revalidate(self, endpoint, key, fetch):
+        with self._lock:
+            if (endpoint, key) in self._refreshing:
+                return
+            self._refreshing.add((endpoint, key))
+
+        def run():
+            try:
+                self.refresh(endpoint, key, fetch)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard((endpoint, key))
+
+        self._refresher.submit(run)
+
+    def invalidate(self, endpoint, key):
+        with self._lock:
+            self._entries.pop((endpoint, key), None)
+        if self.store is not None:
+            self.store.delete(endpoint, key)
+        if self.shared is not None:
+            self.shared.delete(SHARED_NAMESPACE, f"{endpoint}:{key}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits.clear()
+            self.misses.clear()
+            self.stale_hits.clear()
+            self.degraded.clear()
+            self.shared_hits.clear()
+        if self.store is not None:
+            self.store.clear()
+        if self.shared is not None:
+            self.shared.clear(SHARED_NAMESPACE)
+
+    def stats(self):
+        with self._lock:
+            hits = sum(self.hits.values())
+            stale_hits = sum(self.stale_hits.values())
+            misses = sum(self.misses.values())
+            total = hits + stale_hits + misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": hits,
+                "stale_hits": stale_hits,
+                "misses": misses,
+                "hit_ratio": (hits + stale_hits) / total if total else 0.0,
+                "coalesced": self._flights.coalesced,
+                "degraded": sum(self.degraded.values()),
+                "shared_hits": sum(self.shared_hits.values()),
+                "by_endpoint": {
+                    endpoint: {
+                        "hits": self.hits.get(endpoint, 0),
+                        "stale_hits": self.stale_hits.get(endpoint, 0),
+                        "misses": self.misses.get(endpoint, 0),
+                        "shared_hits": self.shared_hits.get(endpoint, 0),
+                    }
+                    for endpoint in sorted(set(self.hits) | set(self.stale_hits) | set(self.misses))
+                },
+            }
+
+    def _evict(self):
+        while len(self._entries) > self.max_size:
+            (endpoint, key), _ = self._entries.popitem(last=False)
+            if self.store is not None:
+                self.store.delete(endpoint, key)
+
+
+def create_default_cache():
+    # WEATHER_CACHE_PATH 가 지정되면 디스크 저장소를, SHARED_CACHE_URL 이 지정되면 공유 저장소를 함께 사용
+    path = os.getenv("WEATHER_CACHE_PATH")
+    max_size = int(os.getenv("WEATHER_CACHE_SIZE", DEFAULT_MAX_SIZE))
+    store = DiskStore(path) if path else None
+    return TTLCache(max_size=max_size, store=store, shared=shared_store)
+
+
+# Streamlit 재실행 간에도 모듈은 한 번만 import 되므로 모든 세션이 공유
+api_cache = create_default_cache()
@@ -0,0 +1,269 @@
+import csv
+import os
+import re
+import unicodedata
+from collections import namedtuple
+
+CITIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cities.csv")
+
+City = namedtuple("City", ["kor", "eng", "province", "lat", "lon", "featured", "aliases"])
+
+# 한글 음절 분해용 자모 표 (유니코드 음절 = 0xAC00 + (초성 * 21 + 중성) * 28 + 종성)
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 행정구역 접미사 (서울특별시, 가평군, Suwon-si ...)
+KOR_SUFFIXES = ("특별자치시", "특별자치도", "특별시", "광역시", "시", "군")
+ENG_SUFFIXES = re.compile(r"[\s-]+(si|gun|city|metropolitan city|special city)$")
+
+# 옛 표기(매큔-라이샤워 등)와 흔한 영문 표기 차이를 하나로 모으는 규칙 (순서 중요)
+ROMANIZATION_RULES = [
+    ("ch", "j"), ("sh", "s"), ("eo", "o"), ("eu", "u"), ("oo", "u"),
+    ("k", "g"), ("p", "b"), ("t", "d"), ("r", "l"),
+]
+
+# 검색 결과 순위: 정확히 일치 > 앞부분 일치 > 부분 일치 > 오타 허용
+EXACT, PREFIX, SUBSTRING, FUZZY = range(4)
+# 오타 허용 검색에서 미리 색인해 두는 최대 편집 거리
+MAX_TYPOS = 2
+
+
+def load_cities(path=CITIES_PATH):
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(line for line in f if not line.startswith("#")))
+    # 좌표가 빠진 행은 처음 조회할 때마다 geo API 를 불러야 하므로 목록을 읽을 때 바로 실패시킴
+    missing = [row["kor"] for row in rows if not row["lat"] or not row["lon"]]
+    if missing:
+        raise ValueError(f"{path}: 좌표가 없는 도시가 있습니다: {', '.join(missing)}")
+    return [
+        City(
+            row["kor"], row["eng"], row["province"], float(row["lat"]), float(row["lon"]),
+            row["featured"] == "1",
+            tuple(alias for alias in row["aliases"].split("|") if alias),
+        )
+        for row in rows
+    ]
+
+
+def is_hangul(ch):
+    return "가" <= ch <= "힣"
+
+
+def decompose(text):
+    # "서울" -> "ㅅㅓㅇㅜㄹ" (오타 비교용)
+    out = []
+    for ch in text:
+        if is_hangul(ch):
+            code = ord(ch) - 0xAC00
+            out.append(CHOSEONG[code // 588] + JUNGSEONG[code // 28 % 21] + JONGSEONG[code % 28].strip())
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def choseong(text):
+    # "서울" -> "ㅅㅇ"
+    return "".join(CHOSEONG[(ord(ch) - 0xAC00) // 588] for ch in text if is_hangul(ch))
+
+
+def normalize_kor(text):
+    text = re.sub(r"[\s()·.,-]", "", text)
+    for suffix in KOR_SUFFIXES:
+        if text.endswith(suffix) and len(text) - len(suffix) >= 2:
+            return text[:-len(suffix)]
+    return text
+
+
+def normalize_eng(text):
+    # 악센트 제거(ŏ -> o), 소문자, 영문자만
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower().strip()
+    text = ENG_SUFFIXES.sub("", text)
+    return re.sub(r"[^a-z]", "", text)
+
+
+def skeleton(text):
+    """로마자 표기 변형을 같은 문자열로: Pusan/Busan -> busan, Cheju/Jeju -> jeju, Kyongju/Gyeongju -> gyongju"""
+    text = normalize_eng(text)
+    for old, new in ROMANIZATION_RULES:
+        text = text.replace(old, new)
+    return re.sub(r"(.)\1+", r"\1", text)
+
+
+def edit_distance(a, b, limit):
+    # 인접 글자 뒤바뀜도 1로 세는 편집 거리, limit 를 넘으면 limit + 1 반환
+    # (대각선에서 limit 칸 이내만 계산: 그 밖은 이미 limit 를 넘음)
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    before, previous = None, [min(j, over) for j in range(len(b) + 1)]
+    for i, ca in enumerate(a, 1):
+        current = [over] * (len(b) + 1)
+        current[0] = min(i, over)
+        best = current[0]
+        for j in range(max(1, i - limit), min(len(b), i + limit) + 1):
+            cb = b[j - 1]
+            # min() 호출 대신 비교 (검색 한 번에 수십 번 불리는 가장 안쪽 반복)
+            value = previous[j - 1] + (ca != cb)
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb and before[j - 2] + 1 < value:
+                value = before[j - 2] + 1
+            current[j] = value
+            if value < best:
+                best = value
+        if best > limit:
+            return over
+        before, previous = previous, current
+    return min(previous[-1], over)
+
+
+def deletions(key, depth):
+    # key 에서 글자를 depth 개까지 지운 문자열 -> 지운 글자 수
+    found = {key: 0}
+    frontier = [key]
+    for removed in range(1, depth + 1):
+        following = []
+        for word in frontier:
+            for i in range(len(word)):
+                variant = word[:i] + word[i + 1:]
+                if variant not in found:
+                    found[variant] = removed
+                    following.append(variant)
+        frontier = following
+    return found
+
+
+def _add(table, key, position):
+    bucket = table.setdefault(key, [])
+    if position not in bucket:
+        bucket.append(position)
+
+
+class CityIndex:
+    """도시 목록을 미리 색인해 두고 한글/영문/초성/옛 로마자/오타 검색을 처리
+
+    각 도시의 검색 키(한글명, 영문명, 로마자 골격, 초성, 별칭)마다 모든 부분 문자열을 사전에 넣어 두므로
+    앞부분/부분 일치는 사전 조회 한 번이다. 오타 허용은 그런 일치가 없을 때만, 글자를 MAX_TYPOS 개까지 지운 변형을
+    미리 색인해 두고 검색어의 변형과 겹치는 키만 편집 거리로 비교한다 (거리 k 이내인 두 문자열은 양쪽에서 k 개 이하를
+    지워 같은 문자열이 됨).
+    """
+
+    def __init__(self, cities):
+        # 기본 표시 도시가 같은 순위에서 먼저 나오도록 정렬
+        self.cities = sorted(cities, key=lambda c: not c.featured)
+        self.by_kor = {c.kor: c for c in self.cities}
+        self.by_eng = {c.eng: c for c in self.cities}
+        self._exact = {}
+        self._prefix = {}
+        self._substring = {}
+        self._deletions = {}
+        self._fuzzy_keys = []
+        for position, city in enumerate(self.cities):
+            for key in self._keys(city):
+                _add(self._exact, key, position)
+                for start in range(len(key)):
+                    for end in range(start + 1, len(key) + 1):
+                        _add(self._prefix if start == 0 else self._substring, key[start:end], position)
+            for key in self._typo_keys(city):
+                self._fuzzy_keys.append((key, position))
+                for variant, removed in deletions(key, MAX_TYPOS).items():
+                    self._deletions.setdefault(variant, []).append((len(self._fuzzy_keys) - 1, removed))
+
+    @staticmethod
+    def _keys(city):
+        names = (city.kor, city.eng) + city.aliases
+        keys = set()
+        for name in names:
+            if any(is_hangul(ch) for ch in name):
+                keys.add(normalize_kor(name))
+                keys.add(choseong(normalize_kor(name)))
+            else:
+                keys.add(normalize_eng(name))
+                keys.add(skeleton(name))
+        keys.discard("")
+        return keys
+
+    @staticmethod
+    def _typo_keys(city):
+        keys = {decompose(normalize_kor(city.kor)), skeleton(city.eng)}
+        keys.update(decompose(normalize_kor(a)) if any(is_hangul(ch) for ch in a) else skeleton(a) for a in city.aliases)
+        keys.discard("")
+        return keys
+
+    @staticmethod
+    def _query_keys(query):
+        if any(is_hangul(ch) or "ㄱ" <= ch <= "ㅣ" for ch in query):
+            return [k for k in (normalize_kor(query), re.sub(r"[\s()·.,-]", "", query)) if k]
+        return [k for k in (normalize_eng(query), skeleton(query)) if k]
+
+    def get(self, name):
+        # 한글명/영문명이 그대로 일치할 때만
+        return self.by_kor.get(name) or self.by_eng.get(name)
+
+    def resolve(self, name):
+        """입력을 하나의 도시로 확정 (정확히 일치 또는 오타 1개 이내의 유일한 후보), 없으면 None"""
+        name = (name or "").strip()
+        if not name:
+            return None
+        city = self.get(name)
+        if city:
+            return city
+        for key in self._query_keys(name):
+            positions = self._exact.get(key)
+            if positions and len(positions) == 1:
+                return self.cities[positions[0]]
+            if positions or key in self._prefix:
+                # 여러 도시에 해당하거나 아직 입력 중인 이름
+                return None
+        fuzzy = self._fuzzy(name, limit=1)
+        if len(fuzzy) == 1:
+            return self.cities[fuzzy[0][1]]
+        return None
+
+    def search(self, query, limit=10):
+        """검색어에 맞는 도시를 순위대로 반환"""
+        query = (query or "").strip()
+        if not query:
+            return []
+        ranked = {}
+        for key in self._query_keys(query):
+            for rank, table in ((EXACT, self._exact), (PREFIX, self._prefix), (SUBSTRING, self._substring)):
+                for position in table.get(key, ()):
+                    if rank < ranked.get(position, (FUZZY + 1,))[0]:
+                        ranked[position] = (rank, 0)
+        # 정확히/앞부분이 맞는(초성 포함) 도시가 있으면 오타 비교는 건너뜀
+        if len(ranked) < limit and all(rank > PREFIX for rank, _ in ranked.values()):
+            for distance, position in self._fuzzy(query):
+                ranked.setdefault(position, (FUZZY, distance))
+        order = sorted(ranked, key=lambda p: (ranked[p], p))
+        return [self.cities[p] for p in order[:limit]]
+
+    def _fuzzy(self, query, limit=None):
+        # 글자를 지운 변형이 검색어의 변형과 겹치는 키만 편집 거리로 비교
+        if any(is_hangul(ch) for ch in query):
+            key = decompose(normalize_kor(query))
+        else:
+            key = skeleton(query)
+        if len(key) < 3:
+            return []
+        if limit is None:
+            limit = 1 if len(key) <= 5 else 2
+        candidates = set()
+        for variant in deletions(key, limit):
+            for i, removed in self._deletions.get(variant, ()):
+                if removed <= limit:
+                    candidates.add(i)
+        best = {}
+        for i in candidates:
+            target, position = self._fuzzy_keys[i]
+            distance = edit_distance(key, target, limit)
+            if distance <= limit and distance < best.get(position, limit + 1):
+                best[position] = distance
+        return sorted((distance, position) for position, distance in best.items())
+
+
+CITIES = load_cities()
+city_index = CityIndex(CITIES)
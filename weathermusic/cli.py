@@ -0,0 +1,140 @@
+"""웨더뮤직 JSON API 서버와 일괄 내보내기
+
+    python -m weathermusic serve --port 8080
+    python -m weathermusic dump --out weather.csv --concurrency 8
+"""
+import argparse
+import csv
+import datetime
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import metrics, service
+from .cities import CITIES, city_index
+from .fetch import BATCH_CONCURRENCY, _submit
+from .prefetch import start_prefetcher
+from .quota import QuotaExceededError
+
+# 호출 예산이 바닥났을 때 한 도시를 기다려 줄 최대 시간(초)
+MAX_QUOTA_WAIT = 180
+
+CSV_FIELDS = [
+    "kor", "eng", "province", "observed_at", "temp", "weather_kor", "weather_eng", "humidity", "wind_speed",
+    "sunrise", "sunset", "pm25", "context", "tracks", "attractions", "error",
+]
+
+
+def select_cities(spec):
+    # "all" (전국), "featured" (주요 도시), 또는 쉼표로 구분한 도시 이름
+    if spec == "all":
+        return list(CITIES)
+    if spec == "featured":
+        return [c for c in CITIES if c.featured]
+    cities = []
+    for name in spec.split(","):
+        city = city_index.resolve(name.strip())
+        if city is None:
+            raise SystemExit(f"지원되지 않는 도시입니다: {name} (Unsupported city)")
+        cities.append(city)
+    return cities
+
+
+def _report(city, forecast, seed, max_wait):
+    # 호출 예산 초과는 알려준 시간만큼 기다렸다가 다시 시도, 그 밖의 실패는 행에 오류로 남김
+    deadline = time.monotonic() + max_wait
+    while True:
+        try:
+            return service.city_report(city, forecast, seed)
+        except QuotaExceededError as e:
+            if time.monotonic() + e.retry_after > deadline:
+                return {"city": service.city_info(city), "error": str(e)}
+            time.sleep(e.retry_after + 0.05)
+        except Exception as e:
+            return {"city": service.city_info(city), "error": str(e)}
+
+
+def collect(cities, concurrency=BATCH_CONCURRENCY, forecast=False, seed=None, max_wait=MAX_QUOTA_WAIT):
+    """도시별 보고서를 동시 요청 수를 제한해 모음 (입력 순서 유지)"""
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="weather-dump") as pool:
+        futures = [_submit(pool, _report, city, forecast, seed, max_wait) for city in cities]
+        return [future.result() for future in futures]
+
+
+def csv_row(report):
+    weather = report.get("weather") or {}
+    rec = report.get("recommendations") or {}
+    return dict(
+        report["city"],
+        observed_at=report.get("observed_at"),
+        pm25=report.get("pm25"),
+        context=(rec.get("context") or {}).get("label"),
+        tracks=" | ".join(f"{t['title']} - {t['artist']}" for t in rec.get("tracks", [])),
+        attractions=" | ".join(p["kor"] for p in rec.get("attractions", [])),
+        error=report.get("error"),
+        **{k: weather.get(k) for k in ("temp", "weather_kor", "weather_eng", "humidity", "wind_speed", "sunrise", "sunset")},
+    )
+
+
+def write_reports(reports, out, fmt):
+    if fmt == "csv":
+        writer = csv.DictWriter(out, CSV_FIELDS)
+        writer.writeheader()
+        writer.writerows(csv_row(report) for report in reports)
+    else:
+        json.dump({
+            "generated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "count": len(reports),
+            "cities": reports,
+        }, out, ensure_ascii=False, indent=1)
+        out.write("\n")
+
+
+def dump(args):
+    cities = select_cities(args.cities)
+    fmt = args.format or ("csv" if args.out.endswith(".csv") else "json")
+    started = time.perf_counter()
+    reports = collect(cities, args.concurrency, args.forecast, args.seed, args.max_wait)
+    elapsed = time.perf_counter() - started
+    if args.out == "-":
+        write_reports(reports, sys.stdout, fmt)
+    else:
+        with open(args.out, "w", encoding="utf-8", newline="") as f:
+            write_reports(reports, f, fmt)
+    errors = sum(1 for report in reports if report.get("error"))
+    calls = sum(metrics.API_RESPONSES.values().values())
+    print(f"{len(reports)} cities ({errors} errors), {calls} API responses, {elapsed:.1f}s -> {args.out}", file=sys.stderr)
+
+
+def serve(args):
+    from .server import serve as run, web
+
+    # 주요 도시는 백그라운드에서 미리 갱신, 지표 내보내기 (UI 와 같은 설정)
+    start_prefetcher()
+    metrics.start_exporter()
+    print(f"http://{args.host}:{args.port} ({'aiohttp' if web else 'threading'})", file=sys.stderr)
+    run(args.host, args.port)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m weathermusic", description="웨더뮤직 JSON API / 일괄 내보내기 (Weather Music service & batch export)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="JSON API 서버 (/weather, /forecast/daily, /recommendations ?city=)")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.set_defaults(run=serve)
+
+    dump_parser = commands.add_parser("dump", help="여러 도시의 현재 날씨와 추천을 JSON/CSV 로 저장")
+    dump_parser.add_argument("--cities", default="all", help="all, featured 또는 쉼표로 구분한 도시 이름")
+    dump_parser.add_argument("--out", default="-", help="저장할 파일 (- 는 표준 출력)")
+    dump_parser.add_argument("--format", choices=["json", "csv"], help="기본: 파일 확장자, 없으면 json")
+    dump_parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="동시에 조회할 도시 수")
+    dump_parser.add_argument("--forecast", action="store_true", help="주간 예보 포함 (JSON, 도시당 호출 1회 추가)")
+    dump_parser.add_argument("--seed", help="추천 결과를 고정할 seed")
+    dump_parser.add_argument("--max-wait", type=float, default=MAX_QUOTA_WAIT, help="호출 예산 초과 시 도시당 최대 대기(초)")
+    dump_parser.set_defaults(run=dump)
+
+    args = parser.parse_args(argv)
+    args.run(args)
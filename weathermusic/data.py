@@ -0,0 +1,69 @@
+# 앱 전체에서 쓰는 정적 데이터 (모듈 import 시 한 번만 생성)
+
+from .cities import CITIES
+
+# 한글 -> 영문 도시명 (전국 시·군, cities.csv 에서 생성)
+city_dict = {c.kor: c.eng for c in CITIES}
+# 도시 비교 기본값과 백그라운드 갱신에 쓰는 주요 도시
+featured_cities = {c.kor: c.eng for c in CITIES if c.featured}
+
+# 숙박 플랫폼별 검색 URL
+city_accommodation_links = {
+    "Seoul": {
+        "Airbnb": "https://www.airbnb.com/s/Seoul--South-Korea/homes",
+        "Booking.com": "https://www.booking.com/city/kr/seoul.html",
+        "Expedia": "https://www.expedia.com/Seoul-Hotels.d178308.Travel-Guide-Hotels",
+        "Agoda": "https://www.agoda.com/city/seoul-kr.html",
+        "Hotels.com": "https://www.hotels.com/ho12345678/seoul-hotels",
+        "Trip.com": "https://www.trip.com/hotels/seoul-hotels"
+    },
+    "Busan": {
+        "Airbnb": "https://www.airbnb.com/s/Busan--South-Korea/homes",
+        "Booking.com": "https://www.booking.com/city/kr/busan.html",
+        "Expedia": "https://www.expedia.com/Busan-Hotels.d6049721.Travel-Guide-Hotels",
+        "Agoda": "https://www.agoda.com/city/busan-kr.html",
+        "Hotels.com": "https://www.hotels.com/ho12345678/busan-hotels",
+        "Trip.com": "https://www.trip.com/hotels/busan-hotels"
+    },
+    "Jeju": {
+        "Airbnb": "https://www.airbnb.com/s/Jeju--South-Korea/homes",
+        "Booking.com": "https://www.booking.com/city/kr/jeju.html",
+        "Expedia": "https://www.expedia.com/Jeju-Island-Hotels.d6049718.Travel-Guide-Hotels",
+        "Agoda": "https://www.agoda.com/city/jeju-island-kr.html",
+        "Hotels.com": "https://www.hotels.com/ho12345678/jeju-hotels",
+        "Trip.com": "https://www.trip.com/hotels/jeju-hotels"
+    }
+}
+
+# 날씨 설명 번역 사전 추가
+weather_translation = {
+    "clear sky": "맑은 하늘",
+    "few clouds": "구름 조금",
+    "scattered clouds": "흩어진 구름",
+    "broken clouds": "구름 많음",
+    "shower rain": "소나기",
+    "rain": "비",
+    "thunderstorm": "천둥번개",
+    "snow": "눈",
+    "mist": "안개"
+}
+
+# 현재날씨/예보 아이콘 매핑
+# OpenWeatherMap weather[0].main -> 아이콘 (lang=kr 설명은 "맑음", "실 비", "온흐림" 처럼 다양해서 main 으로 찾음)
+weather_icon_map = {
+    "Clear": "icons/sunny.png",
+    "Clouds": "icons/cloudy.png",
+    "Rain": "icons/rainy.png",
+    "Drizzle": "icons/rainy.png",
+    "Thunderstorm": "icons/rainy.png",
+    "Squall": "icons/rainy.png",
+    "Mist": "icons/cloudy.png",
+    "Fog": "icons/cloudy.png",
+    "Haze": "icons/cloudy.png",
+}
+
+# 지원 도시 안내 문구
+supported_cities_text = (
+    ", ".join([f"{k}({v})" for k, v in featured_cities.items()])
+    + f" 외 전국 {len(city_dict)}개 시·군 (and all {len(city_dict)} Korean cities/counties)"
+)
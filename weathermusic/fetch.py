@@ -0,0 +1,147 @@
+import contextvars
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from .cache import api_cache
+from .api import API_KEY, fetch_api_response, get_weather, get_forecast, get_air_quality, kor_to_eng_city
+from . import providers
+from .http_client import BUNDLE_TIMEOUT
+from .quota import QuotaExceededError, governor
+
+# 한 도시의 전체 응답을 기다리는 최대 시간(초)은 http_client.BUNDLE_TIMEOUT
+# (개별 HTTP 호출의 재시도 예산 HTTP_CALL_BUDGET 이 이 값에서 정해짐)
+
+# 여러 도시 조회 시 동시에 보낼 개별 요청 수
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 8))
+# group 엔드포인트는 한 번에 최대 20개 도시 ID까지 조회 가능
+GROUP_SIZE = 20
+
+# 모든 세션이 공유하는 작업 스레드 풀
+_executor = ThreadPoolExecutor(max_workers=int(os.getenv("FETCH_WORKERS", 16)), thread_name_prefix="weather-fetch")
+
+
+def _submit(executor, fn, *args):
+    # 호출한 세션 정보(quota.current_session)를 작업 스레드에서도 유지
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+@dataclass
+class CityWeather:
+    city: str
+    weather: dict = None
+    forecast: dict = None
+    pm25: float = None
+    errors: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    # 응답별 원본 수신 시각 (렌더 캐시 버전), 캐시에 없던 값은 None
+    fetched_at: dict = field(default_factory=dict)
+
+
+def fetch_city_bundle(city, timeout=BUNDLE_TIMEOUT):
+    """현재 날씨, 예보, 대기질을 동시에 요청해 하나의 묶음으로 반환"""
+    started = time.perf_counter()
+    futures = {
+        _submit(_executor, get_weather, city): "weather",
+        _submit(_executor, get_forecast, city): "forecast",
+        _submit(_executor, get_air_quality, city): "pm25",
+    }
+    done, not_done = wait(futures, timeout=timeout)
+    bundle = CityWeather(city=city)
+    for future in done:
+        name = futures[future]
+        try:
+            setattr(bundle, name, future.result())
+        except Exception as e:
+            bundle.errors[name] = e
+    # 느린 요청은 기다리지 않고 빈 값으로 처리 (완료되면 캐시에는 반영됨)
+    for future in not_done:
+        bundle.errors[futures[future]] = TimeoutError(f"{timeout}초 안에 응답이 없습니다.")
+    eng_city = kor_to_eng_city(city)[1]
+    for name, endpoint in (("weather", "weather"), ("forecast", "forecast"), ("pm25", "air_pollution")):
+        entry = api_cache.peek(endpoint, eng_city)
+        # 받은 값과 같은 캐시 항목일 때만 (그 사이 갱신됐다면 버전을 모르는 것으로 처리)
+        value = getattr(bundle, name)
+        bundle.fetched_at[name] = entry[1] if entry is not None and value is not None and entry[0] is value else None
+    bundle.elapsed = time.perf_counter() - started
+    return bundle
+
+
+def _known_city_ids(cities):
+    # 이전 weather 응답(만료된 것 포함)에 들어 있던 OpenWeatherMap 도시 ID
+    ids = {}
+    for city in cities:
+        entry = api_cache.peek("weather", city)
+        if entry and entry[0].get("id"):
+            ids[entry[0]["id"]] = city
+    return ids
+
+
+def _fetch_group(ids):
+    response = providers.current().get("owm", "data/2.5/group", {
+        "id": ",".join(str(city_id) for city_id in ids),
+        "appid": API_KEY, "units": "metric", "lang": "kr",
+    })
+    if response.status_code != 200:
+        return []
+    return (response.data or {}).get("list", [])
+
+
+def get_weather_many(cities, concurrency=BATCH_CONCURRENCY, limited=None):
+    """여러 도시의 현재 날씨를 {도시: 응답} 으로 반환 (캐시 -> group 일괄 조회 -> 개별 동시 조회)
+
+    호출 예산이 모자라면 앞쪽 도시부터 조회하고, 이번에 조회하지 못한 도시는 None 으로 두고 limited 에 담음.
+    """
+    eng_cities = list(dict.fromkeys(kor_to_eng_city(city)[1] for city in cities))
+    results = {}
+    pending = []
+    for city in eng_cities:
+        value = api_cache.get("weather", city)
+        if value is not None:
+            results[city] = value
+        else:
+            pending.append(city)
+
+    # 도시 ID를 아는 도시는 20개씩 묶어서 한 번에 조회
+    ids = _known_city_ids(pending)
+    id_list = list(ids)
+    for start in range(0, len(id_list), GROUP_SIZE):
+        try:
+            items = _fetch_group(id_list[start:start + GROUP_SIZE])
+        except Exception:
+            continue
+        for item in items:
+            city = ids.get(item.get("id"))
+            if city:
+                api_cache.set("weather", city, item)
+                results[city] = item
+
+    # 나머지는 동시 요청 수를 제한해 개별 조회
+    remaining = [city for city in pending if city not in results]
+    # 오래된 값이라도 있는 도시는 호출 없이 바로 나오므로, 예산은 처음 조회하는 도시에 표시 순서대로 씀
+    uncached = [city for city in remaining if api_cache.peek("weather", city) is None]
+    budget = governor.headroom()
+    if budget < len(uncached):
+        skipped = set(uncached[int(budget):])
+        remaining = [city for city in remaining if city not in skipped]
+        if limited is not None:
+            limited.update(skipped)
+    if remaining:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="weather-batch") as pool:
+            futures = [_submit(pool, _safe_get_weather, city, limited) for city in remaining]
+            for city, future in zip(remaining, futures):
+                results[city] = future.result()
+    return {city: results.get(city) for city in eng_cities}
+
+
+def _safe_get_weather(city, limited=None):
+    # 미스는 get_weather_many 의 첫 조회에서 이미 셌으므로 다시 세지 않음
+    try:
+        return api_cache.get_or_fetch("weather", city, lambda: fetch_api_response(city, "weather"), count_miss=False)
+    except QuotaExceededError:
+        if limited is not None:
+            limited.add(city)
+        return None
+    except Exception:
+        return None
@@ -0,0 +1,145 @@
+import argparse
+import math
+import random
+import time
+
+from .api import get_coordinates, owm_request
+from .data import city_dict
+from .geocode import CITY_COORDS
+from .providers import DEFAULT_FIXTURES_DIR, ApiResponse, Provider, save_fixture
+
+KST_OFFSET = 9 * 60 * 60
+# (main, lang=kr description) — 실제 API 응답과 같은 형식
+CONDITIONS = [
+    ("Clear", "맑음", "01"), ("Clouds", "약간의 구름이 낀 하늘", "02"), ("Clouds", "튼구름", "04"),
+    ("Clouds", "온흐림", "04"), ("Rain", "실 비", "10"), ("Rain", "보통 비", "10"), ("Snow", "눈", "13"),
+]
+_COORDS_TO_CITY = {coords: name for name, coords in CITY_COORDS.items()}
+
+
+class SyntheticProvider(Provider):
+    """좌표와 시각으로부터 결정적인 가짜 OpenWeatherMap/ipinfo 응답을 생성 (fixture 없이 오프라인 실행용)"""
+
+    name = "synthetic"
+
+    def __init__(self, now=None, detected_city="Seoul"):
+        super().__init__()
+        self.now = now
+        self.detected_city = detected_city
+
+    def _get(self, service, path, params):
+        now = int(self.now or time.time())
+        if service == "ipinfo":
+            return ApiResponse(200, {"city": self.detected_city, "country": "KR"})
+        if path == "geo/1.0/direct":
+            name = str(params.get("q", "")).split(",")[0]
+            lat, lon = CITY_COORDS.get(name) or _pseudo_coords(name)
+            return ApiResponse(200, [{"name": name, "lat": lat, "lon": lon, "country": "KR"}])
+        if path == "data/2.5/group":
+            ids = [int(i) for i in str(params.get("id", "")).split(",") if i]
+            by_id = {_city_id(name): coords for name, coords in CITY_COORDS.items()}
+            return ApiResponse(200, {"cnt": len(ids), "list": [
+                current_weather(*by_id[i], now) for i in ids if i in by_id
+            ]})
+        lat, lon = float(params["lat"]), float(params["lon"])
+        if path == "data/2.5/weather":
+            return ApiResponse(200, current_weather(lat, lon, now))
+        if path == "data/2.5/forecast":
+            return ApiResponse(200, forecast(lat, lon, now))
+        if path == "data/2.5/air_pollution":
+            rng = _rng(lat, lon, now // 3600)
+            return ApiResponse(200, {"coord": {"lat": lat, "lon": lon}, "list": [
+                {"dt": now, "main": {"aqi": rng.randint(1, 4)}, "components": {"pm2_5": round(rng.uniform(4, 60), 2)}}
+            ]})
+        return ApiResponse(404, {"message": "unknown path"})
+
+
+def _city_id(name):
+    # OpenWeatherMap 도시 ID 대신 쓰는 고정 ID
+    return 1_800_000 + sum(ord(c) * (i + 1) for i, c in enumerate(name)) % 100_000
+
+
+def _pseudo_coords(name):
+    # 좌표표에 없는 시·군은 이름으로 정한 국내 임의 좌표
+    rng = random.Random(name)
+    return round(rng.uniform(34.6, 38.2), 4), round(rng.uniform(126.5, 129.3), 4)
+
+
+def _rng(lat, lon, bucket):
+    return random.Random(f"{lat:.4f},{lon:.4f},{bucket}")
+
+
+def _temperature(lat, timestamp):
+    local = timestamp + KST_OFFSET
+    day_of_year = (local // 86400) % 365
+    hour = (local % 86400) / 3600
+    seasonal = 13 - 12 * math.cos(2 * math.pi * (day_of_year - 15) / 365) - (lat - 35) * 1.2
+    diurnal = 4 * math.sin(2 * math.pi * (hour - 9) / 24)
+    return seasonal + diurnal
+
+
+def _slot(lat, lon, timestamp):
+    rng = _rng(lat, lon, timestamp // 10800)
+    temp = round(_temperature(lat, timestamp) + rng.uniform(-1.5, 1.5), 2)
+    main, desc, icon = CONDITIONS[rng.randrange(len(CONDITIONS) - (0 if temp < 2 else 1))]
+    return {
+        "temp": temp,
+        "feels_like": round(temp - rng.uniform(0, 2), 2),
+        "temp_min": round(temp - rng.uniform(0, 1.5), 2),
+        "temp_max": round(temp + rng.uniform(0, 1.5), 2),
+        "pressure": rng.randint(1000, 1030),
+        "humidity": rng.randint(30, 95),
+    }, {"main": main, "description": desc, "icon": icon + "d"}, round(rng.uniform(0.5, 8), 2), rng
+
+
+def current_weather(lat, lon, now):
+    name = _COORDS_TO_CITY.get((lat, lon), f"{lat:.2f},{lon:.2f}")
+    main, weather, wind, _ = _slot(lat, lon, now)
+    midnight = (now + KST_OFFSET) // 86400 * 86400 - KST_OFFSET
+    return {
+        "coord": {"lat": lat, "lon": lon}, "weather": [weather], "main": main,
+        "wind": {"speed": wind}, "dt": now, "timezone": KST_OFFSET, "id": _city_id(name), "name": name,
+        "sys": {"country": "KR", "sunrise": midnight + 6 * 3600 + 1800, "sunset": midnight + 18 * 3600},
+    }
+
+
+def forecast(lat, lon, now):
+    name = _COORDS_TO_CITY.get((lat, lon), f"{lat:.2f},{lon:.2f}")
+    start = (now // 10800 + 1) * 10800
+    items = []
+    for i in range(40):
+        dt = start + i * 10800
+        main, weather, wind, rng = _slot(lat, lon, dt)
+        items.append({"dt": dt, "main": main, "weather": [weather], "wind": {"speed": wind},
+                      "pop": round(rng.random() if weather["main"] in ("Rain", "Snow") else rng.random() * 0.3, 2)})
+    return {"cod": "200", "cnt": 40, "list": items,
+            "city": {"id": _city_id(name), "name": name, "coord": {"lat": lat, "lon": lon}, "timezone": KST_OFFSET}}
+
+
+def synthesize(fixtures_dir=DEFAULT_FIXTURES_DIR, cities=None, now=None):
+    """앱이 실제로 보낼 요청과 같은 키로 fixture 를 생성 (기본: 지원 도시 전체)"""
+    source = SyntheticProvider(now=now)
+    count = 0
+    for city in cities or list(CITY_COORDS):
+        coords = get_coordinates(city)
+        if not coords:
+            continue
+        for endpoint in ("weather", "forecast", "air_pollution"):
+            service, path, params = owm_request(endpoint, *coords)
+            save_fixture(fixtures_dir, service, path, params, source.get(service, path, params))
+            count += 1
+    save_fixture(fixtures_dir, "ipinfo", "json", {}, source.get("ipinfo", "json", {}))
+    return count + 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 재생용 fixture 생성 (Generate synthetic replay fixtures)")
+    parser.add_argument("--out", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--cities", default="", help="쉼표로 구분한 도시 (기본: 지원 도시 전체)")
+    args = parser.parse_args(argv)
+    cities = [city_dict.get(c.strip(), c.strip()) for c in args.cities.split(",") if c.strip()]
+    print(f"{synthesize(args.out, cities or None)} fixtures -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import numpy as np
+
+from .data import weather_icon_map, weather_translation
+
+DAY_SECONDS = 24 * 60 * 60
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class ForecastFrame:
+    """3시간 간격 예보 목록(forecast['list'])을 한 번만 파싱해 열 단위 배열로 보관"""
+
+    def __init__(self, forecast):
+        items = forecast.get("list", [])
+        # 서버 시간대가 아니라 API가 알려준 도시 시간대(UTC 기준 초) 사용
+        self.tz_offset = int((forecast.get("city") or {}).get("timezone", 0))
+        # 한 번의 순회로 숫자 열과 상태 열을 함께 추출
+        rows = []
+        descriptions = []
+        # 상태 설명 -> weather[0].main (아이콘은 main 으로 찾음)
+        self.condition_of = {}
+        for item in items:
+            main = item["main"]
+            rows.append((item["dt"], main["temp"], main.get("temp_min", main["temp"]),
+                         main.get("temp_max", main["temp"]), item.get("pop", 0.0)))
+            weather = item["weather"][0]
+            descriptions.append(weather["description"])
+            self.condition_of.setdefault(weather["description"], weather.get("main"))
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), 5)
+        self.dt = table[:, 0].astype(np.int64)
+        self.temp = table[:, 1]
+        # 일부 응답은 temp_min/temp_max 가 temp 와 같거나 비어 있으므로 temp 도 함께 반영
+        self.temp_min = np.minimum(table[:, 2], self.temp)
+        self.temp_max = np.maximum(table[:, 3], self.temp)
+        self.pop = table[:, 4]
+        self.description = np.array(descriptions, dtype=str)
+        self.local_dt = self.dt + self.tz_offset
+
+    def __len__(self):
+        return len(self.dt)
+
+    def daily(self):
+        """날짜별 최저/최고/평균 기온, 최대 강수확률, 가장 잦은 날씨 상태를 한 번에 계산"""
+        if not len(self):
+            return []
+        day_index = self.local_dt // DAY_SECONDS
+        days, inverse, counts = np.unique(day_index, return_inverse=True, return_counts=True)
+        # day_index 는 시간순이라 정렬되어 있으므로 reduceat 로 구간별 집계
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        temp_min = np.minimum.reduceat(self.temp_min, starts)
+        temp_max = np.maximum.reduceat(self.temp_max, starts)
+        temp_mean = np.bincount(inverse, weights=self.temp) / counts
+        pop = np.maximum.reduceat(self.pop, starts)
+
+        # (날짜, 상태) 쌍의 빈도를 세어 날짜별 최빈 상태 선택 (동률이면 먼저 나온 상태)
+        codes, desc_index = np.unique(self.description, return_inverse=True)
+        pair_keys = inverse * len(codes) + desc_index
+        pair_counts = np.bincount(pair_keys, minlength=len(days) * len(codes)).reshape(len(days), len(codes))
+        first_seen = np.full((len(days), len(codes)), len(self), dtype=np.int64)
+        np.minimum.at(first_seen, (inverse, desc_index), np.arange(len(self)))
+        score = pair_counts * (len(self) + 1) - first_seen
+        dominant = codes[np.argmax(score, axis=1)]
+
+        result = []
+        for i, day in enumerate(days):
+            desc = str(dominant[i])
+            desc_kor = weather_translation.get(desc, desc)
+            month, date = _month_day(int(day))
+            result.append({
+                "date": f"{month:02d}/{date:02d}",
+                # 1970-01-01 은 목요일
+                "day_of_week": WEEKDAYS[(int(day) + 3) % 7],
+                "temp_min": round(float(temp_min[i]), 1),
+                "temp_max": round(float(temp_max[i]), 1),
+                "temp_mean": round(float(temp_mean[i]), 1),
+                "pop": int(round(float(pop[i]) * 100)),
+                "desc": desc,
+                "desc_kor": desc_kor,
+                "icon_path": weather_icon_map.get(self.condition_of.get(desc)),
+            })
+        return result
+
+    def hourly(self, count=8):
+        local = self.local_dt[:count].astype("datetime64[s]")
+        times = [np.datetime_as_string(t, unit="m")[5:].replace("-", "/").replace("T", " ") for t in local]
+        return times, self.temp[:count].tolist()
+
+
+def _month_day(epoch_day):
+    date = np.datetime64(epoch_day, "D").astype(object)
+    return date.month, date.day
+
+
+def daily_summary(forecast):
+    return ForecastFrame(forecast).daily()
@@ -0,0 +1,81 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from .shared_cache import shared_store
+
+# 프로세스 전체에서 유지할 렌더링 결과 수 (도시 x 버전 x 종류)
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", 256))
+# 공유 저장소에 렌더링 결과를 남겨 둘 시간(초), 키에 데이터 버전이 들어 있어 내용이 바뀌지는 않음
+SHARED_RENDER_TTL = int(os.getenv("SHARED_RENDER_TTL", 6 * 60 * 60))
+
+
+class FragmentCache:
+    """(종류, 도시, 데이터 버전, 언어) 별로 만들어 둔 HTML 블록과 Plotly Figure 를 재사용하는 LRU 캐시
+
+    버전은 원본 응답을 받은 시각이라 새 데이터가 들어오면 키가 바뀌어 자연히 다시 만든다.
+    shared(공유 저장소)가 있으면 다른 워커가 만든 결과도 가져다 쓴다 (Figure 는 검증 없이 복원).
+    """
+
+    def __init__(self, max_size=RENDER_CACHE_SIZE, shared=None):
+        self.max_size = max_size
+        self.shared = shared
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    def get_or_build(self, key, build):
+        # 버전을 모르면(응답 실패 등) 캐시하지 않고 매번 생성
+        if any(part is None for part in key):
+            return build()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        shared_key = "|".join(map(str, key))
+        entry = self.shared.fresh("fragment", shared_key) if self.shared is not None else None
+        if entry is not None:
+            value = entry[0]
+            # 다른 워커가 만든 결과도 적중 (shared_hits 는 그중 공유 저장소에서 온 것)
+            with self._lock:
+                self.hits += 1
+                self.shared_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            value = build()
+            if self.shared is not None:
+                now = time.time()
+                self.shared.set("fragment", shared_key, value, now, now + SHARED_RENDER_TTL, now + SHARED_RENDER_TTL)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.shared_hits = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_hits": self.shared_hits,
+                "hit_ratio": self.hits / total if total else 0.0,
+            }
+
+
+fragment_cache = FragmentCache(shared=shared_store)
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+
+import requests
+
+from . import providers
+from .cities import CITIES
+from .quota import SingleFlight
+from .shared_cache import shared_store
+
+# 지원 도시 좌표 (cities.csv 에 미리 적어 둔 값, 영문 도시명 기준). 목록 밖의 이름만 geo API 로 조회
+CITY_COORDS = {c.eng: (c.lat, c.lon) for c in CITIES}
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "geocode.json")
+# geo API 가 찾지 못한 이름은 이 시간(초) 동안 다시 묻지 않음
+MISS_TTL = float(os.getenv("GEOCODE_MISS_TTL", 300))
+
+
+class Geocoder:
+    """도시명 -> (lat, lon) 조회. 미리 계산된 표에 없으면 geo API 결과를 파일(과 공유 저장소)에 영구 저장"""
+
+    def __init__(self, table=None, cache_path=DEFAULT_CACHE_PATH, shared=None):
+        self.table = dict(CITY_COORDS if table is None else table)
+        self.cache_path = cache_path
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._cache = self._load()
+        self._misses = {}
+        self._flights = SingleFlight()
+
+    def _known(self, names):
+        for name in names:
+            if name in self.table:
+                return self.table[name]
+            if name in self._cache:
+                return self._cache[name]
+        return None
+
+    def lookup(self, *names, api_key=None):
+        coords = self._known(names)
+        if coords is not None:
+            return coords
+        # 한 도시의 날씨/예보/대기질 조회가 동시에 들어와도 geo API 는 한 번만 호출
+        return self._flights.do(names, lambda: self._resolve(names, api_key))
+
+    def _resolve(self, names, api_key):
+        coords = self._known(names)
+        if coords is not None:
+            return coords
+        # 다른 워커가 이미 찾아 둔 좌표
+        for name in names:
+            entry = self.shared.fresh("geo", name) if self.shared is not None else None
+            if entry is not None:
+                self._remember(name, tuple(entry[0]), share=False)
+                return self._cache[name]
+        # 표와 캐시에 모두 없을 때만 geo API 호출
+        now = time.monotonic()
+        for name in names:
+            if self._misses.get(name, 0) > now:
+                continue
+            coords = self._fetch(name, api_key)
+            if coords:
+                self._remember(name, coords)
+                return coords
+        return None
+
+    def _fetch(self, name, api_key):
+        try:
+            res = providers.current().get("owm", "geo/1.0/direct", {"q": f"{name},KR", "limit": 1, "appid": api_key})
+        except requests.RequestException:
+            return None
+        if res.status_code == 200 and res.data:
+            return (res.data[0]["lat"], res.data[0]["lon"])
+        # 없는 이름(404 또는 빈 결과)만 잠시 기억, 일시적인 오류는 다음에 다시 시도
+        if res.status_code in (200, 404):
+            now = time.monotonic()
+            with self._lock:
+                self._misses = {k: until for k, until in self._misses.items() if until > now}
+                self._misses[name] = now + MISS_TTL
+        return None
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                return {name: tuple(coords) for name, coords in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def _remember(self, name, coords, share=True):
+        if share and self.shared is not None:
+            # 좌표는 바뀌지 않으므로 만료 없이 저장
+            self.shared.set("geo", name, coords, time.time(), float("inf"))
+        with self._lock:
+            self._cache[name] = coords
+            if not self.cache_path:
+                return
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+
+
+geocoder = Geocoder(cache_path=os.getenv("GEOCODE_CACHE_PATH", DEFAULT_CACHE_PATH), shared=shared_store)
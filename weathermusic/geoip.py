@@ -0,0 +1,118 @@
+import ipaddress
+import os
+import threading
+from collections import OrderedDict
+
+import requests
+
+from . import providers
+from .metrics import GEOIP_LOOKUPS
+
+try:
+    import maxminddb
+except ImportError:  # 선택 의존성: 없으면 원격 조회만 사용
+    maxminddb = None
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "GeoLite2-City.mmdb")
+CACHE_SIZE = int(os.getenv("GEOIP_CACHE_SIZE", 4096))
+IPINFO_TOKEN = os.getenv("IPINFO_TOKEN")
+# 앱 앞에 있는 리버스 프록시 수: 0 이면 X-Forwarded-For 를 무시하고 접속 주소만 사용
+# (헤더 앞쪽은 방문자가 마음대로 넣을 수 있으므로 믿을 수 있는 것은 우리 프록시가 덧붙인 오른쪽 끝뿐)
+TRUSTED_PROXIES = int(os.getenv("TRUSTED_PROXIES", 0))
+
+
+def _public_ip(value):
+    try:
+        address = ipaddress.ip_address(value.strip().strip("[]"))
+    except ValueError:
+        return None
+    return str(address) if address.is_global else None
+
+
+def client_ip(headers, remote_addr=None, trusted_proxies=None):
+    """방문자 IP: 믿을 수 있는 프록시가 N 개면 X-Forwarded-For 의 오른쪽에서 N 번째, 아니면 접속 주소 (공인 IP 만)"""
+    if trusted_proxies is None:
+        trusted_proxies = TRUSTED_PROXIES
+    headers = {k.lower(): v for k, v in (headers or {}).items()}
+    forwarded = [value.strip() for value in (headers.get("x-forwarded-for") or "").split(",") if value.strip()]
+    if trusted_proxies > 0 and len(forwarded) >= trusted_proxies:
+        candidate = forwarded[-trusted_proxies]
+    else:
+        # 프록시가 없거나 헤더가 프록시 수보다 짧으면(프록시를 거치지 않은 요청) 접속 주소
+        candidate = remote_addr
+    return _public_ip(candidate) if candidate else None
+
+
+class GeoIPDatabase:
+    """MaxMind 형식(.mmdb) 도시 데이터베이스를 메모리 매핑으로 열어 IP -> 영문 도시명"""
+
+    def __init__(self, path):
+        self.path = path
+        self._reader = maxminddb.open_database(path, maxminddb.MODE_MMAP)
+
+    def city(self, ip):
+        try:
+            record = self._reader.get(ip)
+        except ValueError:
+            return None
+        names = ((record or {}).get("city") or {}).get("names") or {}
+        return names.get("en")
+
+    def close(self):
+        self._reader.close()
+
+
+def open_database(path=None):
+    path = path or os.getenv("GEOIP_DB_PATH", DEFAULT_DB_PATH)
+    if maxminddb is None or not os.path.exists(path):
+        return None
+    try:
+        return GeoIPDatabase(path)
+    except (OSError, ValueError):
+        return None
+
+
+class IPLocator:
+    """IP -> 도시명: IP별 LRU 캐시 -> 로컬 GeoIP 데이터베이스 -> 원격 ipinfo 순서로 조회"""
+
+    def __init__(self, database=None, max_size=CACHE_SIZE):
+        self.database = database
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def locate(self, ip=None):
+        # ip 가 없으면(로컬 접속 등) 서버 자신의 위치
+        key = ip or ""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                GEOIP_LOOKUPS.inc(source="cache")
+                return self._cache[key]
+        city = self.database.city(ip) if ip and self.database else None
+        if city:
+            GEOIP_LOOKUPS.inc(source="database")
+        else:
+            city = self._remote(ip)
+            GEOIP_LOOKUPS.inc(source="remote" if city else "miss")
+        if city is not None:
+            with self._lock:
+                self._cache[key] = city
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        return city or ""
+
+    def _remote(self, ip):
+        # 실패(네트워크 오류 등)는 None 으로 돌려 캐시하지 않음, 위치를 모르는 IP 는 "" 로 캐시
+        params = {"token": IPINFO_TOKEN} if IPINFO_TOKEN else {}
+        try:
+            res = providers.current().get("ipinfo", f"{ip}/json" if ip else "json", params)
+        except requests.RequestException:
+            return None
+        if res.status_code != 200:
+            return None
+        return (res.data or {}).get("city", "")
+
+
+locator = IPLocator(open_database())
@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "history.sqlite3")
+# 보관 기간(일)과 정리 작업 주기(초)
+RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", 30))
+MAINTENANCE_INTERVAL = 60 * 60
+# 이 시간(시간)이 지난 관측값은 도시별 1시간에 한 행(평균)으로 압축
+COMPACT_AFTER_HOURS = int(os.getenv("HISTORY_COMPACT_AFTER_HOURS", 48))
+HOUR = 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    city TEXT NOT NULL,
+    observed_at INTEGER NOT NULL,
+    temp REAL NOT NULL,
+    feels_like REAL,
+    humidity INTEGER,
+    pressure INTEGER,
+    wind_speed REAL,
+    condition TEXT,
+    PRIMARY KEY (city, observed_at)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS forecast_points (
+    city TEXT NOT NULL,
+    target_at INTEGER NOT NULL,
+    issued_at INTEGER NOT NULL,
+    temp REAL NOT NULL,
+    pop REAL,
+    condition TEXT,
+    PRIMARY KEY (city, target_at, issued_at)
+) WITHOUT ROWID;
+"""
+
+
+class HistoryStore:
+    """가져온 관측값과 예보 스냅샷을 도시별 시계열로 쌓아두는 추가 전용 SQLite 저장소"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, retention_days=RETENTION_DAYS, compact_after_hours=COMPACT_AFTER_HOURS,
+                 clock=time.time):
+        self.path = path
+        self.retention_days = retention_days
+        self.compact_after_hours = compact_after_hours
+        # 현재 시각 (시험에서 바꿔 끼움)
+        self.clock = clock
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.executescript(SCHEMA)
+        self._last_maintenance = 0.0
+
+    def record(self, endpoint, city, payload, fetched_at=None):
+        if endpoint == "weather":
+            self.record_observation(city, payload)
+        elif endpoint == "forecast":
+            self.record_forecast(city, payload, fetched_at)
+
+    def record_observation(self, city, data):
+        main = data["main"]
+        row = (
+            city, int(data["dt"]), main["temp"], main.get("feels_like"), main.get("humidity"),
+            main.get("pressure"), (data.get("wind") or {}).get("speed"), data["weather"][0]["main"],
+        )
+        with self._lock:
+            # 같은 관측 시각은 한 번만 저장
+            self._conn.execute("INSERT OR IGNORE INTO observations VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+            self._conn.commit()
+        self.maybe_maintain()
+
+    def record_forecast(self, city, forecast, fetched_at=None):
+        issued_at = int(fetched_at or self.clock())
+        rows = [
+            (city, int(item["dt"]), issued_at, item["main"]["temp"], item.get("pop"), item["weather"][0]["main"])
+            for item in forecast.get("list", [])
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO forecast_points VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+        self.maybe_maintain()
+
+    def observations(self, city, since):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT observed_at, temp, humidity, wind_speed FROM observations"
+                " WHERE city = ? AND observed_at >= ? ORDER BY observed_at",
+                (city, int(since)),
+            ).fetchall()
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), 4)
+        return {
+            "time": table[:, 0].astype(np.int64),
+            "temp": table[:, 1],
+            "humidity": table[:, 2],
+            "wind_speed": table[:, 3],
+        }
+
+    def latest_forecast(self, city, since):
+        # 대상 시각별로 가장 마지막에 받은 예보값
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT target_at, temp FROM forecast_points AS f"
+                " WHERE city = ? AND target_at >= ? AND issued_at = ("
+                "   SELECT MAX(issued_at) FROM forecast_points"
+                "   WHERE city = f.city AND target_at = f.target_at AND issued_at <= f.target_at"
+                " ) ORDER BY target_at",
+                (city, int(since)),
+            ).fetchall()
+        table = np.array(rows, dtype=np.float64).reshape(len(rows), 2)
+        return {"time": table[:, 0].astype(np.int64), "temp": table[:, 1]}
+
+    def forecast_vs_actual(self, city, since, tolerance=90 * 60):
+        """예보 시각마다 가장 가까운 실제 관측값을 짝지어 (시각, 예보, 실제, 오차) 반환"""
+        forecast = self.latest_forecast(city, since)
+        actual = self.observations(city, since - tolerance)
+        if not len(forecast["time"]) or not len(actual["time"]):
+            empty = np.array([], dtype=np.float64)
+            return {"time": np.array([], dtype=np.int64), "forecast": empty, "actual": empty, "error": empty}
+        idx = np.clip(np.searchsorted(actual["time"], forecast["time"]), 1, len(actual["time"]) - 1)
+        left, right = actual["time"][idx - 1], actual["time"][idx]
+        idx = np.where(np.abs(forecast["time"] - left) <= np.abs(right - forecast["time"]), idx - 1, idx)
+        if len(actual["time"]) == 1:
+            idx = np.zeros_like(idx)
+        matched = np.abs(actual["time"][idx] - forecast["time"]) <= tolerance
+        predicted = forecast["temp"][matched]
+        observed = actual["temp"][idx][matched]
+        return {
+            "time": forecast["time"][matched],
+            "forecast": predicted,
+            "actual": observed,
+            "error": predicted - observed,
+        }
+
+    def maybe_maintain(self):
+        now = self.clock()
+        if now - self._last_maintenance < MAINTENANCE_INTERVAL:
+            return
+        self._last_maintenance = now
+        self.maintain(now)
+
+    def maintain(self, now=None):
+        """보관 기간이 지난 행 삭제, 오래된 관측값은 1시간 단위로, 지나간 시각의 예보는 마지막 스냅샷만 남기고 압축"""
+        now = int(now or self.clock())
+        cutoff = now - self.retention_days * 24 * 60 * 60
+        # 끝난 시간대만 압축 (압축한 행은 정시 하나뿐이라 다시 압축되지 않음)
+        compact_before = (now - self.compact_after_hours * HOUR) // HOUR * HOUR
+        with self._lock:
+            self._conn.execute("DELETE FROM observations WHERE observed_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM forecast_points WHERE target_at < ?", (cutoff,))
+            # 집계 함수 중 min/max 가 MAX(observed_at) 하나뿐이라 condition 은 그 시간대 마지막 관측의 상태 (SQLite 규칙)
+            hours = self._conn.execute(
+                "SELECT city, observed_at / ? * ? AS hour, AVG(temp), AVG(feels_like), ROUND(AVG(humidity)),"
+                " ROUND(AVG(pressure)), AVG(wind_speed), MAX(observed_at), condition FROM observations"
+                " WHERE observed_at < ? GROUP BY city, hour HAVING COUNT(*) > 1 OR SUM(observed_at) != hour",
+                (HOUR, HOUR, compact_before),
+            ).fetchall()
+            self._conn.executemany(
+                "DELETE FROM observations WHERE city = ? AND observed_at >= ? AND observed_at < ?",
+                [(city, hour, hour + HOUR) for city, hour, *_ in hours],
+            )
+            self._conn.executemany(
+                "INSERT INTO observations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(city, hour, temp, feels_like, _int(humidity), _int(pressure), wind_speed, condition)
+                 for city, hour, temp, feels_like, humidity, pressure, wind_speed, _, condition in hours],
+            )
+            self._conn.execute(
+                "DELETE FROM forecast_points AS f WHERE target_at < ? AND issued_at < ("
+                "  SELECT MAX(issued_at) FROM forecast_points"
+                "  WHERE city = f.city AND target_at = f.target_at AND issued_at <= f.target_at"
+                ")",
+                (now,),
+            )
+            self._conn.commit()
+            self._conn.execute("PRAGMA incremental_vacuum")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _int(value):
+    return None if value is None else int(value)
+
+
+def create_default_store():
+    # HISTORY=0 이면 기록하지 않음
+    if os.getenv("HISTORY", "1") == "0":
+        return None
+    return HistoryStore(os.getenv("HISTORY_DB_PATH", DEFAULT_DB_PATH))
+
+
+history_store = create_default_store()
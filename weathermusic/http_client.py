@@ -0,0 +1,169 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics import API_RETRIES
+
+# (연결, 읽기) 타임아웃(초)
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 3.05))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 10))
+REQUEST_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# 429/5xx 응답과 연결/읽기 오류는 지수 백오프(0.5s, 1s, 2s ...)로 재시도
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", 3))
+BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", 0.5))
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 화면이 한 도시 묶음을 기다리는 최대 시간(초). get 한 번은 재시도와 백오프까지 합쳐 이보다 먼저 끝나야
+# 호출한 쪽이 포기한 뒤에도 공유 작업 스레드(fetch._executor)가 붙잡혀 있지 않음
+BUNDLE_TIMEOUT = float(os.getenv("BUNDLE_TIMEOUT", 12))
+CALL_BUDGET = float(os.getenv("HTTP_CALL_BUDGET", BUNDLE_TIMEOUT * 0.8))
+
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 20))
+
+# 호스트별 연속 실패가 이 횟수에 도달하면 일정 시간 동안 요청을 즉시 실패시킴
+BREAKER_THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", 5))
+BREAKER_COOLDOWN = float(os.getenv("HTTP_BREAKER_COOLDOWN", 30))
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+def retry_count(response):
+    # 이 응답을 받기까지 재시도한 횟수
+    return getattr(response, "retries", 0)
+
+
+def _retry_after(response):
+    # Retry-After 헤더(초 단위만), 없으면 0
+    value = response.headers.get("Retry-After", "").strip()
+    return float(value) if value.isdigit() else 0.0
+
+
+class CircuitBreaker:
+    """연속 실패 시 열리고, 쿨다운 후 한 번의 시험 요청으로 닫힘 여부를 결정"""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class HttpClient:
+    """모든 외부 호출이 공유하는 커넥션 풀 세션"""
+
+    def __init__(self, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES, backoff_factor=BACKOFF_FACTOR, pool_size=POOL_SIZE,
+                 budget=CALL_BUDGET):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        # 재시도·백오프·Retry-After 대기를 모두 합친 get 한 번의 최대 시간(초)
+        self.budget = budget
+        self.session = requests.Session()
+        # 재시도는 urllib3 가 아니라 _send 에서 (남은 시간에 맞춰 타임아웃과 대기를 줄이기 위해)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host):
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    def breakers(self):
+        with self._lock:
+            return dict(self._breakers)
+
+    def get(self, url, params=None, timeout=None):
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{host} 요청이 일시 차단되었습니다. (circuit open)")
+        # 어떤 예외로 끝나든 실패로 기록해 반열림 상태의 시험 요청 자리를 풀어 줌
+        # (그러지 않으면 그 호스트는 영영 차단됨)
+        succeeded = False
+        try:
+            response = self._send(url, params, timeout or self.timeout)
+            retries = retry_count(response)
+            if retries:
+                API_RETRIES.inc(retries, host=host)
+            succeeded = response.status_code not in RETRY_STATUSES
+        finally:
+            if succeeded:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+        return response
+
+    def _send(self, url, params, timeout):
+        # 마감 시각 안에서만 재시도: 각 시도의 타임아웃은 남은 시간으로 자르고, 다음 시도 전 대기가 마감을 넘기면 그만둠
+        deadline = time.monotonic() + self.budget
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        attempt = 0
+        while True:
+            remaining = max(deadline - time.monotonic(), 0.001)
+            try:
+                response = self.session.get(url, params=params, timeout=(min(connect, remaining), min(read, remaining)))
+            except (requests.ConnectionError, requests.Timeout):
+                delay = self._backoff(attempt + 1)
+                if attempt >= self.retries or time.monotonic() + delay >= deadline:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                delay = max(self._backoff(attempt + 1), _retry_after(response))
+                if attempt >= self.retries or time.monotonic() + delay >= deadline:
+                    break
+                response.close()
+            attempt += 1
+            time.sleep(delay)
+        response.retries = attempt
+        return response
+
+    def _backoff(self, attempt):
+        return self.backoff_factor * 2 ** (attempt - 1)
+
+
+http = HttpClient()
@@ -0,0 +1,321 @@
+import functools
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 지연 시간(초)과 응답 크기(바이트) 히스토그램 구간
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=None):
+    items = list(key) + list(extra or [])
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in items) + "}"
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def values(self):
+        with self._lock:
+            return dict(self._values)
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Gauge:
+    """수집 시점에 콜백으로 값을 읽는 게이지 (다른 모듈이 이미 세고 있는 누적값은 kind="counter")"""
+
+    def __init__(self, name, help_text, collect, kind="gauge"):
+        self.name = name
+        self.help = help_text
+        self.collect = collect
+        self.kind = kind
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        try:
+            samples = self.collect()
+        except Exception:
+            samples = []
+        for labels, value in samples:
+            lines.append(f"{self.name}{_format_labels(_label_key(labels))} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            else:
+                series["counts"][-1] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def time(self, **labels):
+        return _HistogramTimer(self, labels)
+
+    def series(self):
+        with self._lock:
+            return {key: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]} for key, s in self._series.items()}
+
+    def quantile(self, q, **labels):
+        # 구간 경계 기준 근사값
+        series = self.series().get(_label_key(labels))
+        if not series or not series["count"]:
+            return None
+        target = q * series["count"]
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+            running += count
+            if running >= target:
+                return bound
+        return float("inf")
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self.series().items()):
+            running = 0
+            for bound, count in zip(self.buckets, series["counts"]):
+                running += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {running}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class _HistogramTimer:
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text):
+        return self.register(Counter(name, help_text))
+
+    def histogram(self, name, help_text, buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, buckets))
+
+    def gauge(self, name, help_text, collect, kind="gauge"):
+        return self.register(Gauge(name, help_text, collect, kind))
+
+    def render(self):
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        lines = []
+        with self._lock:
+            metrics = list(self.metrics)
+        for metric in metrics:
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+API_LATENCY = registry.histogram("weathermusic_api_request_seconds", "Upstream API request latency by service and path.")
+API_RESPONSES = registry.counter("weathermusic_api_responses_total", "Upstream API responses by service, path and status code.")
+API_ERRORS = registry.counter("weathermusic_api_errors_total", "Upstream API calls that raised before a response.")
+API_RETRIES = registry.counter("weathermusic_api_retries_total", "HTTP retries performed by the shared session, by host.")
+API_PAYLOAD_BYTES = registry.histogram("weathermusic_api_payload_bytes", "Upstream response payload size.", SIZE_BUCKETS)
+LOOKUP_LATENCY = registry.histogram("weathermusic_lookup_seconds", "Latency of lookup functions including cache.")
+STAGE_LATENCY = registry.histogram("weathermusic_stage_seconds", "Render path stage latency.")
+GEOIP_LOOKUPS = registry.counter("weathermusic_geoip_lookups_total", "Visitor IP geolocation lookups by source (cache, database, remote, miss).")
+SHARED_CACHE = registry.counter("weathermusic_shared_store_total", "Cross-process store lookups by namespace and result, plus refresh lock waits/timeouts and store errors.")
+SERVICE_LATENCY = registry.histogram("weathermusic_service_request_seconds", "JSON API request latency by route and status code.")
+
+
+def _cache_requests():
+    from .cache import api_cache
+
+    samples = []
+    for endpoint, counts in api_cache.stats()["by_endpoint"].items():
+        for result in ("hits", "stale_hits", "misses"):
+            samples.append(({"endpoint": endpoint, "result": result}, counts[result]))
+    return samples
+
+
+def _cache_gauges():
+    from .cache import api_cache
+
+    stats = api_cache.stats()
+    return [({"stat": "size"}, stats["size"]), ({"stat": "max_size"}, stats["max_size"]),
+            ({"stat": "hit_ratio"}, round(stats["hit_ratio"], 6))]
+
+
+def _render_cache():
+    from .fragments import fragment_cache
+
+    stats = fragment_cache.stats()
+    return [({"stat": name}, round(stats[name], 6)) for name in ("size", "hits", "misses", "hit_ratio")]
+
+
+def _breaker_states():
+    from .http_client import http
+
+    states = {"closed": 0, "half-open": 1, "open": 2}
+    return [({"host": host}, states[breaker.state]) for host, breaker in http.breakers().items()]
+
+
+def _cache_coalescing():
+    from .cache import api_cache
+
+    stats = api_cache.stats()
+    return [({"result": "coalesced"}, stats["coalesced"]), ({"result": "degraded"}, stats["degraded"]),
+            ({"result": "shared_store"}, stats["shared_hits"])]
+
+
+def _quota_usage():
+    from .quota import governor
+
+    usage = governor.usage()
+    return [({"stat": name}, value) for name, value in usage.items() if value is not None]
+
+
+registry.gauge("weathermusic_cache_requests_total", "API cache lookups by endpoint and result.", _cache_requests, kind="counter")
+registry.gauge("weathermusic_cache", "API cache size, capacity and hit ratio.", _cache_gauges)
+registry.gauge("weathermusic_cache_shared_total", "Cache lookups answered by another in-flight fetch, by stale data under quota, or by another worker via the shared store.", _cache_coalescing, kind="counter")
+registry.gauge("weathermusic_quota", "Upstream call budget usage (per minute, process wide).", _quota_usage)
+registry.gauge("weathermusic_render_cache", "Rendered HTML/figure cache size and hit counts.", _render_cache)
+registry.gauge("weathermusic_circuit_state", "Circuit breaker state per host (0=closed, 1=half-open, 2=open).", _breaker_states)
+
+
+def api_summary():
+    """API 경로별 호출 수와 지연 시간 분위수 (프로파일러 패널용)"""
+    responses = {}
+    for key, count in API_RESPONSES.values().items():
+        labels = dict(key)
+        path_key = (labels["service"], labels["path"])
+        responses.setdefault(path_key, {})[labels["status"]] = count
+    rows = []
+    for key, series in sorted(API_LATENCY.series().items()):
+        labels = dict(key)
+        rows.append({
+            "service": labels["service"],
+            "path": labels["path"],
+            "calls": series["count"],
+            "mean_ms": round(series["sum"] / series["count"] * 1000, 1) if series["count"] else None,
+            "p50_ms≤": API_LATENCY.quantile(0.5, **labels) * 1000,
+            "p95_ms≤": API_LATENCY.quantile(0.95, **labels) * 1000,
+            "status": ", ".join(f"{k}×{v}" for k, v in sorted(responses.get((labels["service"], labels["path"]), {}).items())),
+        })
+    return rows
+
+
+def timed(function_name):
+    # 조회 함수 전체(캐시 포함) 지연 시간 기록
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with LOOKUP_LATENCY.time(function=function_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def write_metrics_file(path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_exporter():
+    """METRICS_PORT 가 있으면 /metrics HTTP 엔드포인트, METRICS_FILE 이 있으면 주기적으로 파일 기록 (프로세스당 한 번)"""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+    port = os.getenv("METRICS_PORT")
+    if port:
+        try:
+            server = ThreadingHTTPServer((os.getenv("METRICS_HOST", "127.0.0.1"), int(port)), _MetricsHandler)
+        except OSError:
+            server = None
+        if server is not None:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    path = os.getenv("METRICS_FILE")
+    if path:
+        interval = float(os.getenv("METRICS_FILE_INTERVAL", 15))
+
+        def loop():
+            while True:
+                try:
+                    write_metrics_file(path)
+                except OSError:
+                    pass
+                time.sleep(interval)
+
+        threading.Thread(target=loop, name="metrics-file", daemon=True).start()
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+
+from .cache import api_cache
+from .api import API_KEY, ENDPOINT_FETCHERS, refresh_city
+from .data import city_dict, featured_cities
+from .quota import governor as default_governor
+
+# 분당 호출 예산 중 사용자 요청 몫으로 남겨둘 호출 수 (백그라운드 갱신은 그 위로 남는 만큼만 사용)
+RESERVE = int(os.getenv("PREFETCH_RESERVE", 10))
+# 갱신 주기(초)와 만료 몇 초 전부터 미리 갱신할지
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", 30))
+REFRESH_AHEAD = float(os.getenv("PREFETCH_REFRESH_AHEAD", 60))
+
+
+def hot_cities():
+    # PREFETCH_CITIES="Seoul,Busan,Jeju" 처럼 지정하면 해당 도시만 갱신, 없으면 주요 도시
+    names = os.getenv("PREFETCH_CITIES", "")
+    if names.strip():
+        return [city_dict.get(name.strip(), name.strip()) for name in names.split(",") if name.strip()]
+    return list(featured_cities.values())
+
+
+class Prefetcher:
+    """지원 도시의 날씨/예보/대기질을 주기적으로 갱신해 공유 캐시를 따뜻하게 유지"""
+
+    def __init__(self, cities, cache=api_cache, governor=default_governor, reserve=RESERVE,
+                 interval=PREFETCH_INTERVAL, refresh_ahead=REFRESH_AHEAD):
+        self.cities = cities
+        self.cache = cache
+        self.governor = governor
+        self.reserve = reserve
+        self.interval = interval
+        self.refresh_ahead = refresh_ahead
+        self.refreshed = 0
+        self.skipped_for_budget = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def due(self):
+        # 만료가 가까운(또는 아직 없는) 항목부터, 만료 시각이 빠른 순서로
+        now = time.time()
+        items = []
+        for city in self.cities:
+            for endpoint in ENDPOINT_FETCHERS:
+                entry = self.cache.peek(endpoint, city)
+                expires_at = entry[2] if entry else 0
+                if expires_at - now <= self.refresh_ahead:
+                    items.append((expires_at, city, endpoint))
+        items.sort()
+        return [(city, endpoint) for _, city, endpoint in items]
+
+    def headroom(self):
+        return self.governor.headroom() - self.reserve
+
+    def run_once(self):
+        for city, endpoint in self.due():
+            if self._stop.is_set():
+                break
+            if self.headroom() <= 0:
+                self.skipped_for_budget += 1
+                break
+            try:
+                refresh_city(city, endpoint)
+                self.refreshed += 1
+            except Exception:
+                continue
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="weather-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def start_prefetcher():
+    # 프로세스당 한 번만 시작 (PREFETCH=0 또는 API 키가 없으면 시작하지 않음)
+    global _prefetcher
+    if os.getenv("PREFETCH", "1") == "0" or not API_KEY:
+        return None
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = Prefetcher(hot_cities()).start()
+    return _prefetcher
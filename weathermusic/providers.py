@@ -0,0 +1,198 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+
+from .http_client import http, retry_count
+from .metrics import API_ERRORS, API_LATENCY, API_PAYLOAD_BYTES, API_RESPONSES
+from .quota import governor as default_governor
+from .timing import stage
+
+# 외부 서비스별 기본 주소 (로컬 스텁 서버를 쓸 때는 환경 변수로 교체)
+BASE_URLS = {
+    "owm": os.getenv("OWM_BASE_URL", "http://api.openweathermap.org"),
+    "ipinfo": os.getenv("IPINFO_BASE_URL", "https://ipinfo.io"),
+}
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures")
+# 기록 파일 이름에 포함하지 않는 파라미터 (API 키 등)
+SECRET_PARAMS = {"appid", "token"}
+# 분당 호출 예산을 적용하는 서비스 (ipinfo 는 별도 한도)
+GOVERNED_SERVICES = {"owm"}
+
+ApiResponse = namedtuple("ApiResponse", ["status_code", "data"])
+
+
+def fixture_key(service, path, params):
+    # 쿼리 문자열로 받은 값(스텁 서버)과 파이썬 값이 같은 키가 되도록 문자열로 통일
+    public = {k: str(v) for k, v in sorted((params or {}).items()) if k not in SECRET_PARAMS and v is not None}
+    digest = hashlib.sha1(json.dumps([service, path, public], ensure_ascii=False, default=str).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(service, path.strip("/").replace("/", "_") or "root", digest + ".json")
+
+
+class Provider:
+    """외부 API 호출 인터페이스: get(service, path, params) -> ApiResponse"""
+
+    name = "base"
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def get(self, service, path, params=None):
+        with self._lock:
+            self.calls += 1
+        started = time.perf_counter()
+        try:
+            response = self._get(service, path, params or {})
+        except Exception as e:
+            API_ERRORS.inc(service=service, path=path, error=type(e).__name__)
+            raise
+        finally:
+            API_LATENCY.observe(time.perf_counter() - started, service=service, path=path)
+        API_RESPONSES.inc(service=service, path=path, status=response.status_code)
+        return response
+
+    def _get(self, service, path, params):
+        raise NotImplementedError
+
+
+class LiveProvider(Provider):
+    """공유 HTTP 세션으로 실제 서비스(또는 BASE_URLS 로 지정한 스텁 서버)를 호출"""
+
+    name = "live"
+
+    def __init__(self, client=http, base_urls=None, governor=default_governor):
+        super().__init__()
+        self.client = client
+        self.base_urls = dict(BASE_URLS if base_urls is None else base_urls)
+        self.governor = governor
+
+    def _get(self, service, path, params):
+        governed = self.governor is not None and service in GOVERNED_SERVICES
+        if governed:
+            self.governor.acquire()
+        with stage("api.request"):
+            response = self.client.get(f"{self.base_urls[service].rstrip('/')}/{path.lstrip('/')}", params=params)
+        if governed:
+            self.governor.charge(retry_count(response))
+        API_PAYLOAD_BYTES.observe(len(response.content or b""), service=service, path=path)
+        with stage("api.parse"):
+            try:
+                data = response.json()
+            except ValueError:
+                data = None
+        return ApiResponse(response.status_code, data)
+
+
+class RecordingProvider(Provider):
+    """다른 Provider 의 응답을 그대로 돌려주면서 fixture 파일로 저장"""
+
+    name = "record"
+
+    def __init__(self, inner, fixtures_dir=DEFAULT_FIXTURES_DIR):
+        super().__init__()
+        self.inner = inner
+        self.fixtures_dir = fixtures_dir
+
+    def _get(self, service, path, params):
+        response = self.inner.get(service, path, params)
+        save_fixture(self.fixtures_dir, service, path, params, response)
+        return response
+
+
+class ReplayProvider(Provider):
+    """저장된 fixture 를 네트워크 없이 재생 (지연 시간과 오류 주입 가능)"""
+
+    name = "replay"
+
+    def __init__(self, fixtures_dir=DEFAULT_FIXTURES_DIR, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=None):
+        super().__init__()
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._fixtures = {}
+
+    def _get(self, service, path, params):
+        delay = self.latency + (self._random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return ApiResponse(self.error_status, {"message": "injected error"})
+        return self.lookup(service, path, params)
+
+    def lookup(self, service, path, params):
+        key = fixture_key(service, path, params)
+        if key not in self._fixtures:
+            self._fixtures[key] = load_fixture(self.fixtures_dir, key)
+        return self._fixtures[key] or ApiResponse(404, {"message": "fixture not found"})
+
+
+def save_fixture(fixtures_dir, service, path, params, response):
+    key = fixture_key(service, path, params)
+    file_path = os.path.join(fixtures_dir, key)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    record = {
+        "request": {"service": service, "path": path,
+                    "params": {k: v for k, v in params.items() if k not in SECRET_PARAMS}},
+        "status_code": response.status_code,
+        "data": response.data,
+    }
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp_path, file_path)
+
+
+def load_fixture(fixtures_dir, key):
+    try:
+        with open(os.path.join(fixtures_dir, key), encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return ApiResponse(record["status_code"], record["data"])
+
+
+def create_provider(mode=None):
+    # WEATHER_PROVIDER=live|record|replay|synthetic
+    mode = mode or os.getenv("WEATHER_PROVIDER", "live")
+    if mode == "synthetic":
+        from .fixtures import SyntheticProvider
+        return SyntheticProvider()
+    fixtures_dir = os.getenv("FIXTURES_DIR", DEFAULT_FIXTURES_DIR)
+    if mode == "record":
+        return RecordingProvider(LiveProvider(), fixtures_dir)
+    if mode == "replay":
+        return ReplayProvider(
+            fixtures_dir,
+            latency=float(os.getenv("REPLAY_LATENCY", 0)),
+            jitter=float(os.getenv("REPLAY_JITTER", 0)),
+            error_rate=float(os.getenv("REPLAY_ERROR_RATE", 0)),
+        )
+    return LiveProvider()
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def current():
+    # 처음 사용할 때 생성 (synthetic 모드는 api 모듈을 import 하므로 지연 생성)
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_provider()
+    return _provider
+
+
+def set_provider(provider):
+    # 벤치마크/부하 테스트에서 실행 중에 교체할 때 사용
+    global _provider
+    _provider = provider
+    return provider
@@ -0,0 +1,208 @@
+import contextvars
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+# 모든 세션이 나눠 쓰는 분당 OpenWeatherMap 호출 예산 (0 이면 제한 없음)
+CALLS_PER_MINUTE = int(os.getenv("API_CALLS_PER_MINUTE", 50))
+# 한 세션(브라우저 탭)이 분당 쓸 수 있는 호출 수 (0 이면 제한 없음)
+SESSION_CALLS_PER_MINUTE = int(os.getenv("SESSION_CALLS_PER_MINUTE", 30))
+# 한 번에 몰아서 쓸 수 있는 최대 호출 수 (기본: 예산의 절반)
+BURST = int(os.getenv("API_BURST", 0)) or None
+MAX_SESSIONS = 1024
+
+# 현재 요청을 보낸 세션 (작업 스레드로 넘길 때는 contextvars.copy_context 사용)
+current_session = contextvars.ContextVar("quota_session", default=None)
+
+
+class QuotaExceededError(RuntimeError):
+    # 네트워크 오류(RequestException)와 구분: 잡아서 '없음'으로 처리하지 말고 기다리거나 오래된 값을 보여줄 것
+    def __init__(self, scope, retry_after):
+        super().__init__(
+            f"API 호출 한도를 초과했습니다. {retry_after:.0f}초 후 다시 시도해 주세요. "
+            f"(API {scope} quota exceeded, retry in {retry_after:.0f}s)"
+        )
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출은 먼저 온 하나만 실행하고 나머지는 그 결과를 함께 받음"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "value": None, "error": None}
+            else:
+                self.coalesced += 1
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["value"]
+        try:
+            call["value"] = fn()
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+        return call["value"]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 capacity 개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, now):
+        self._refill(now)
+        return self.tokens
+
+    def take(self, now, amount=1):
+        self._refill(now)
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def wait_time(self, now, amount=1):
+        self._refill(now)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+
+class QuotaGovernor:
+    """프로세스 전역 분당 호출 예산 + 세션별 예산
+
+    토큰 버킷으로 호출을 고르게 나누고, 최근 60초 호출 기록으로 분당 한도를 넘지 않게 막음.
+    """
+
+    def __init__(self, calls_per_minute=CALLS_PER_MINUTE, session_calls_per_minute=SESSION_CALLS_PER_MINUTE,
+                 burst=BURST, max_sessions=MAX_SESSIONS):
+        self.calls_per_minute = calls_per_minute
+        self.session_calls_per_minute = session_calls_per_minute
+        self.max_sessions = max_sessions
+        self._bucket = TokenBucket(calls_per_minute / 60, burst or max(1, calls_per_minute // 2)) if calls_per_minute else None
+        self._sessions = OrderedDict()
+        self._window = deque()
+        self._lock = threading.Lock()
+        self.granted = 0
+        self.denied = {"global": 0, "session": 0}
+
+    @property
+    def enabled(self):
+        return self._bucket is not None
+
+    def _session_bucket(self, session):
+        bucket = self._sessions.get(session)
+        if bucket is None:
+            rate = self.session_calls_per_minute
+            bucket = self._sessions[session] = TokenBucket(rate / 60, rate)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(session)
+        return bucket
+
+    def _trim(self, now):
+        while self._window and now - self._window[0] >= 60:
+            self._window.popleft()
+
+    def acquire(self, session=None):
+        """호출 1회분 예산을 가져감. 부족하면 QuotaExceededError"""
+        if not self.enabled:
+            return
+        session = session if session is not None else current_session.get()
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            session_bucket = None
+            if session is not None and self.session_calls_per_minute:
+                session_bucket = self._session_bucket(session)
+                if session_bucket.available(now) < 1:
+                    self.denied["session"] += 1
+                    raise QuotaExceededError("session", session_bucket.wait_time(now))
+            if len(self._window) >= self.calls_per_minute:
+                self.denied["global"] += 1
+                raise QuotaExceededError("global", 60 - (now - self._window[0]))
+            if not self._bucket.take(now):
+                self.denied["global"] += 1
+                raise QuotaExceededError("global", self._bucket.wait_time(now))
+            if session_bucket is not None:
+                session_bucket.take(now)
+            self._window.append(now)
+            self.granted += 1
+
+    def charge(self, amount):
+        # 재시도처럼 acquire 없이 나간 호출도 예산에서 차감 (토큰은 음수가 될 수 있음)
+        if not self.enabled or amount <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._bucket.available(now)
+            self._bucket.tokens -= amount
+            self._window.extend([now] * amount)
+
+    def headroom(self, session=None):
+        """지금 바로 쓸 수 있는 호출 수 (현재 세션이 있으면 세션 예산까지, 제한이 없으면 무한대)"""
+        if not self.enabled:
+            return float("inf")
+        session = session if session is not None else current_session.get()
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            available = min(int(self._bucket.available(now)), self.calls_per_minute - len(self._window))
+            if session is not None and self.session_calls_per_minute:
+                bucket = self._sessions.get(session)
+                available = min(available, int(bucket.available(now)) if bucket else self.session_calls_per_minute)
+            return max(0, available)
+
+    def usage(self):
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            return {
+                "limit_per_minute": self.calls_per_minute,
+                "used_last_minute": len(self._window),
+                "tokens": round(self._bucket.available(now), 2) if self.enabled else None,
+                "session_limit_per_minute": self.session_calls_per_minute,
+                "sessions": len(self._sessions),
+                "granted": self.granted,
+                "denied_global": self.denied["global"],
+                "denied_session": self.denied["session"],
+            }
+
+
+@contextmanager
+def session(session_id):
+    # 이 블록 안에서 나가는 호출을 session_id 의 예산으로 계산
+    token = current_session.set(session_id)
+    try:
+        yield
+    finally:
+        current_session.reset(token)
+
+
+governor = QuotaGovernor()
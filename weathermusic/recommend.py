@@ -0,0 +1,241 @@
+import bisect
+import csv
+import datetime
+import os
+import random
+from collections import namedtuple
+
+from .cities import CITIES
+from .transform import get_season
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+# 카탈로그를 코드 수정 없이 바꾸거나 늘릴 수 있도록 경로를 환경 변수로 받음
+TRACKS_PATH = os.getenv("TRACKS_CATALOG", os.path.join(DATA_DIR, "tracks.csv"))
+ATTRACTIONS_PATH = os.getenv("ATTRACTIONS_CATALOG", os.path.join(DATA_DIR, "attractions.csv"))
+
+Track = namedtuple("Track", ["title", "artist", "video_id", "conditions", "seasons", "times", "cities", "weight"])
+Attraction = namedtuple("Attraction", ["kor", "eng", "city", "url", "conditions", "seasons", "times", "weight"])
+# 추천 기준: 날씨 태그, 계절(get_season), 시간대, 도시 영문명
+Context = namedtuple("Context", ["condition", "season", "time", "city"])
+
+CONDITIONS = ("clear", "clouds", "rain", "snow", "mist", "thunder")
+SEASONS = ("봄", "여름", "가을", "겨울")
+TIMES = ("morning", "day", "evening", "night")
+
+# OpenWeatherMap weather[0].main -> 날씨 태그
+CONDITION_TAGS = {
+    "Clear": "clear", "Clouds": "clouds", "Rain": "rain", "Drizzle": "rain", "Squall": "rain",
+    "Thunderstorm": "thunder", "Tornado": "thunder", "Snow": "snow",
+    "Mist": "mist", "Fog": "mist", "Haze": "mist", "Smoke": "mist", "Dust": "mist", "Sand": "mist", "Ash": "mist",
+}
+CONDITION_LABELS = {
+    "clear": "맑음 (Clear)", "clouds": "흐림 (Cloudy)", "rain": "비 (Rain)",
+    "snow": "눈 (Snow)", "mist": "안개 (Mist)", "thunder": "뇌우 (Thunderstorm)",
+}
+TIME_LABELS = {"morning": "아침 (Morning)", "day": "낮 (Day)", "evening": "저녁 (Evening)", "night": "밤 (Night)"}
+
+# 딱 맞는 후보가 모자라면 시간대 -> 계절 -> 날씨 -> (관광지는) 같은 시·도 순으로 조건을 풀어 채우고,
+# 푼 단계마다 가중치를 낮춤
+MIN_TRACKS = 12
+MIN_ATTRACTIONS = 5
+RELAX_PENALTY = 0.2
+NEARBY_LEVEL = 4
+# 그 도시 노래에 곱하는 가중치
+CITY_BOOST = 3.0
+
+
+def _tags(value):
+    return frozenset(tag for tag in value.split("|") if tag)
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return list(csv.DictReader(line for line in f if not line.startswith("#")))
+
+
+def load_tracks(path=TRACKS_PATH):
+    return [
+        Track(row["title"], row["artist"], row["video_id"] or None, _tags(row["conditions"]), _tags(row["seasons"]),
+              _tags(row["times"]), _tags(row["cities"]), float(row["weight"] or 1))
+        for row in _read(path)
+    ]
+
+
+def load_attractions(path=ATTRACTIONS_PATH):
+    return [
+        Attraction(row["kor"], row["eng"], row["city"], row["url"] or None, _tags(row["conditions"]),
+                   _tags(row["seasons"]), _tags(row["times"]), float(row["weight"] or 1))
+        for row in _read(path)
+    ]
+
+
+def time_of_day(hour):
+    if 5 <= hour < 11:
+        return "morning"
+    if 11 <= hour < 17:
+        return "day"
+    if 17 <= hour < 21:
+        return "evening"
+    return "night"
+
+
+def weather_context(city, data=None, now=None):
+    """현재 날씨 응답(도시 시간대 기준)에서 추천 기준을 만듦. 응답이 없으면 날씨 없이 서버 시각 기준"""
+    if data and "weather" in data:
+        tz = datetime.timezone(datetime.timedelta(seconds=data.get("timezone", 0)))
+        local = datetime.datetime.fromtimestamp(data.get("dt") or now or datetime.datetime.now().timestamp(), tz)
+        condition = CONDITION_TAGS.get(data["weather"][0].get("main"))
+    else:
+        local = datetime.datetime.fromtimestamp(now) if now else datetime.datetime.now()
+        condition = None
+    return Context(condition, get_season(local.month), time_of_day(local.hour), city)
+
+
+def _relax_level(item, condition, season, time):
+    # 0: 모두 맞음, 1: 시간대만 다름, 2: 계절이 다름, 3: 날씨가 다름 (비어 있는 태그와 None 은 모두 맞음)
+    if condition and item.conditions and condition not in item.conditions:
+        return 3
+    if item.seasons and season not in item.seasons:
+        return 2
+    if item.times and time not in item.times:
+        return 1
+    return 0
+
+
+class Candidates:
+    """가중치 누적합을 미리 만들어 둔 후보 목록 (bisect 로 가중 무작위 추출)"""
+
+    __slots__ = ("items", "cumulative")
+
+    def __init__(self, weighted):
+        self.items = tuple(item for item, _ in weighted)
+        total = 0.0
+        cumulative = []
+        for _, weight in weighted:
+            total += weight
+            cumulative.append(total)
+        self.cumulative = tuple(cumulative)
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, k, rng=random):
+        """가중치에 비례해 중복 없이 k개 (겹치면 다시 뽑고, 그래도 모자라면 목록 순서대로 채움)"""
+        k = min(k, len(self.items))
+        if not k:
+            return []
+        total = self.cumulative[-1]
+        picked = {}
+        for _ in range(k * 4):
+            if len(picked) == k:
+                break
+            index = bisect.bisect_right(self.cumulative, rng.random() * total)
+            picked.setdefault(min(index, len(self.items) - 1), None)
+        for index in range(len(self.items)):
+            if len(picked) == k:
+                break
+            picked.setdefault(index, None)
+        return [self.items[index] for index in picked]
+
+
+def _build(items, levels, minimum, boost=None):
+    by_level = {}
+    for item, relax in zip(items, levels):
+        by_level.setdefault(relax, []).append(item)
+    weighted = []
+    for relax in sorted(by_level):
+        if len(weighted) >= minimum:
+            break
+        weighted += [(item, item.weight * RELAX_PENALTY ** relax * (boost(item) if boost else 1.0))
+                     for item in by_level[relax]]
+    return weighted
+
+
+class Recommender:
+    """(날씨, 계절, 시간대, 도시) 조합마다 후보 목록을 처음 조회할 때 한 번 만들어 두고, 이후에는 사전 조회 + 가중 추출만 함
+
+    시작할 때는 도시별 후보군만 나누므로 카탈로그가 수천 개로 늘어도 첫 화면이 늦어지지 않는다.
+    후보 목록은 후보군과 기준이 같으면 여러 도시가 공유한다.
+    """
+
+    def __init__(self, tracks, attractions, cities=CITIES):
+        self.tracks = tracks
+        self.attractions = attractions
+        # 후보군: (항목, 항목별 추가 단계, 가중치 보정, 최소 후보 수)
+        self._groups = []
+        # 도시 영문명 -> 후보군 번호 (곡은 None 이 전국 후보군)
+        self._track_groups = {}
+        self._attraction_groups = {}
+        # (후보군 번호, 날씨, 계절, 시간대) -> Candidates. 동시에 처음 조회하면 같은 목록을 두 번 만들 수 있지만 결과는 같음
+        self._built = {}
+
+        national = [t for t in tracks if not t.cities]
+        self._track_groups[None] = self._add_group(national, (0,) * len(national), None, MIN_TRACKS)
+        for city in sorted({city for t in tracks for city in t.cities}):
+            # 그 도시 노래는 해당 도시에서만, 더 자주
+            items = national + [t for t in tracks if city in t.cities]
+            self._track_groups[city] = self._add_group(items, (0,) * len(items),
+                                                       lambda t: CITY_BOOST if t.cities else 1.0, MIN_TRACKS)
+        # 관광지: 그 도시 관광지를 먼저, 모자라면 같은 시·도의 관광지로 채움
+        province_of = {c.eng: c.province for c in cities}
+        by_province = {}
+        by_city = {}
+        for place in attractions:
+            by_province.setdefault(province_of.get(place.city), []).append(place)
+            by_city.setdefault(place.city, []).append(place)
+        place_groups = {}
+        for c in cities:
+            if c.province in by_province:
+                own = tuple(by_city.get(c.eng, ()))
+                place_groups.setdefault((c.province, own), []).append(c.eng)
+        for (province, own), group_cities in place_groups.items():
+            owned = {id(p) for p in own}
+            nearby = [p for p in by_province[province] if id(p) not in owned]
+            index = self._add_group(list(own) + nearby, (0,) * len(own) + (NEARBY_LEVEL,) * len(nearby),
+                                    None, MIN_ATTRACTIONS)
+            for city in group_cities:
+                self._attraction_groups[city] = index
+
+    def _add_group(self, items, extra, boost, minimum):
+        self._groups.append((items, extra, boost, minimum))
+        return len(self._groups) - 1
+
+    def _candidates(self, index, condition, season, time):
+        key = (index, condition, season, time)
+        candidates = self._built.get(key)
+        if candidates is None:
+            items, extra, boost, minimum = self._groups[index]
+            levels = [_relax_level(item, condition, season, time) + add for item, add in zip(items, extra)]
+            candidates = self._built[key] = Candidates(_build(items, levels, minimum, boost))
+        return candidates
+
+    def track_candidates(self, context):
+        index = self._track_groups.get(context[3], self._track_groups[None])
+        return self._candidates(index, *context[:3])
+
+    def attraction_candidates(self, context):
+        index = self._attraction_groups.get(context[3])
+        if index is None:
+            return None
+        return self._candidates(index, *context[:3])
+
+    def recommend_tracks(self, context, k=6, seed=None):
+        # seed 가 같으면(세션+도시+기준) 재실행해도 같은 곡이라 iframe 을 다시 불러오지 않음
+        return self.track_candidates(context).sample(k, random.Random(seed) if seed is not None else random)
+
+    def recommend_attractions(self, context, k=MIN_ATTRACTIONS, seed=None):
+        candidates = self.attraction_candidates(context)
+        if candidates is None:
+            return []
+        return candidates.sample(k, random.Random(seed) if seed is not None else random)
+
+    def video_ids(self):
+        return [t.video_id for t in self.tracks if t.video_id]
+
+
+def context_label(context):
+    parts = [CONDITION_LABELS.get(context.condition), context.season, TIME_LABELS.get(context.time)]
+    return " · ".join(part for part in parts if part)
+
+
+recommender = Recommender(load_tracks(), load_attractions())
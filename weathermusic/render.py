@@ -0,0 +1,315 @@
+import functools
+import html
+import urllib.parse
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from . import metrics
+from .assets import background_css, flag_url, thumbnail_url
+from .data import (
+    city_accommodation_links, city_dict, featured_cities, supported_cities_text,
+)
+from .transform import icon_html
+
+PAGE_STYLE = """
+    <style>
+    body { background-color: #1E90FF; } /* 다바색 (Dodger Blue) */
+    .stButton>button {background-color: #4f8cff; color: white;}
+    .stTextInput>div>input {font-size:16px;}
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    .stDeployButton {visibility: hidden;}
+    </style>
+    """
+
+# 배경화면 설정만 유지 (요트 이미지 삭제). 석양 바다 이미지는 빌드된 WebP 변형 또는 CDN 에서 줄인 이미지
+BACKGROUND_STYLE = f"""
+    <style>
+    {background_css()}
+    body {{
+        background-size: cover;
+        background-position: center;
+        background-attachment: fixed;
+    }}
+    .stApp {{
+        background: transparent;
+    }}
+    </style>
+    """
+
+HEADER_HTML = f"""
+    <div style='display:flex;align-items:center;gap:18px;margin-bottom:12px;'>
+        <span style='font-size:2.5em;font-weight:bold;'>🎵 웨더뮤직</span>
+        <img src='{flag_url()}' width='64' height='64' style='width:64px;height:64px;border:4px solid #4f8cff;border-radius:50%;box-shadow:0 0 12px #4f8cff;margin-left:8px;' alt='태극기'/>
+    </div>
+    <div style='font-size:1.8em;color:#555;margin-bottom:16px;'>Weather Music</div>
+    """
+
+# 유튜브 플레이어 대신 썸네일만 보여주는 가벼운 iframe (누르면 그 자리에서 플레이어로 바뀜)
+FACADE_DOC = (
+    "<style>*{{margin:0;padding:0;overflow:hidden}}a{{position:relative;display:block;width:160px;height:90px}}"
+    "img{{width:160px;height:90px;object-fit:cover}}span{{position:absolute;left:50%;top:50%;"
+    "transform:translate(-50%,-50%);font:28px sans-serif;color:#fff;text-shadow:0 0 8px #000}}</style>"
+    "<a href=\"https://www.youtube.com/embed/{video_id}?autoplay=1\"><img src=\"{thumbnail}\" alt=\"{caption}\" loading=\"lazy\"><span>▶</span></a>"
+)
+
+YOUTUBE_SEARCH_URL = "https://www.youtube.com/results?search_query={query}"
+MAP_SEARCH_URL = "https://map.naver.com/p/search/{query}"
+
+
+@functools.lru_cache(maxsize=512)
+def video_block(track):
+    # 곡별 HTML 은 한 번만 만들어 둠 (유튜브 ID 가 없는 곡은 검색 링크)
+    caption = f"{track.title} - {track.artist}"
+    if not track.video_id:
+        query = urllib.parse.quote_plus(f"{track.artist} {track.title}")
+        return f'''
+        <div style='width:160px; height:90px; margin-bottom:16px; display:flex; align-items:center; justify-content:center; background:#4f8cff22; border-radius:6px;'>
+        <a href="{YOUTUBE_SEARCH_URL.format(query=query)}" target="_blank" style="font-size:0.9em;">▶ 유튜브에서 찾기</a>
+        </div>
+        '''
+    return f'''
+        <div style='width:160px; margin-bottom:16px;'>
+        <iframe width="160" height="90" loading="lazy" title="{html.escape(caption)}" srcdoc="{html.escape(FACADE_DOC.format(video_id=track.video_id, thumbnail=thumbnail_url(track.video_id), caption=html.escape(caption)))}" frameborder="0" allow="autoplay; encrypted-media; picture-in-picture" allowfullscreen></iframe>
+        <br>
+        <a href="https://www.youtube.com/watch?v={track.video_id}" target="_blank" style="font-size:0.9em;">유튜브에서 듣기</a>
+        </div>
+        '''
+
+# 화면 문구 언어 (지금은 한/영 병기 고정, 렌더 캐시 키에 포함)
+LOCALE = "ko+en"
+
+SEARCH_HELP = (
+    "아래 지원 도시만 입력하세요. 한글 입력 시 자동 변환됩니다.\n"
+    "(Please enter only supported cities. Korean input will be auto-converted.)\n" + supported_cities_text
+)
+
+
+def render_page_style():
+    st.markdown(PAGE_STYLE, unsafe_allow_html=True)
+    st.markdown(BACKGROUND_STYLE, unsafe_allow_html=True)
+
+def render_header():
+    st.markdown(HEADER_HTML, unsafe_allow_html=True)
+
+def render_music(tracks, label=None):
+    # 날씨/계절/시간대에 맞춘 추천곡을 나란히 배치 (작은 화면)
+    st.markdown("<h3>오늘 날씨에 어울리는 음악 (Music for Today's Weather)</h3>", unsafe_allow_html=True)
+    if label:
+        st.caption(label)
+    for col, track in zip(st.columns(max(len(tracks), 1)), tracks):
+        with col:
+            st.markdown(video_block(track), unsafe_allow_html=True)
+            st.caption(f"{track.title} - {track.artist}")
+
+def _apply_suggestion():
+    # 추천 도시를 누르면 입력칸을 그 도시로 바꿔서 다시 실행
+    choice = st.session_state.get("city_suggestion")
+    if choice:
+        st.session_state["city_input"] = choice
+        st.session_state["city_suggestion"] = None
+
+def render_search(search_cities, resolve_city):
+    col_title, col_city = st.columns([1.5, 1])
+    with col_title:
+        st.write("")
+    with col_city:
+        city_input = st.text_input(
+            "도시 찾기 (Search City: Korean or English, e.g. 서울/Seoul)",
+            key="city_input",
+            help=SEARCH_HELP,
+        )
+        # 확정되지 않는 입력(초성, 일부, 옛 로마자, 오타)은 후보 도시를 바로 보여줌
+        if city_input and resolve_city(city_input) is None:
+            suggestions = search_cities(city_input, 8)
+            if suggestions:
+                st.pills("혹시 이 도시인가요? (Did you mean?)", [c.kor for c in suggestions],
+                         key="city_suggestion", on_change=_apply_suggestion)
+        # "찾기" 버튼 추가
+        if st.button("찾기 (Search)", key="search_btn"):
+            if city_input:
+                matched = search_cities(city_input)
+                if matched:
+                    st.write("검색 결과 (Search Results):")
+                    for city in matched:
+                        st.write(f"- {city.kor} ({city.eng}) · {city.province}")
+                else:
+                    st.write("일치하는 도시가 없습니다. (No matching city found.)")
+            else:
+                st.write("도시 이름을 입력하세요. (Please enter a city name.)")
+    return city_input
+
+def current_weather_html(view):
+    # 현재 날씨 (한글+영어), 한 번의 markdown 으로 그릴 수 있게 문단을 이어 붙임
+    return "\n\n".join([
+        f"🌡️ **온도 (Temperature)**: {view['temp']}°C",
+        f"🌤️ **상태 (Condition)**: {view['weather_kor']} ({view['weather_eng']}) {icon_html(view['icon_path'])}",
+        f"💧 **습도 (Humidity)**: {view['humidity']}%",
+        f"🌬️ **풍속 (Wind Speed)**: {view['wind_speed']} m/s",
+        f"🌅 **일출 (Sunrise)**: {view['sunrise']}",
+        f"🌇 **일몰 (Sunset)**: {view['sunset']}",
+    ])
+
+def daily_forecast_html(days):
+    if days is None:
+        return None
+    return "\n\n".join(
+        f"<b>📅 {day['date']} ({day['day_of_week']}): {day['temp_min']}~{day['temp_max']}°C "
+        f"(평균 {day['temp_mean']}°C), ☔ {day['pop']}%, {day['desc_kor']} ({day['desc']}) {icon_html(day['icon_path'])}</b>"
+        for day in days
+    )
+
+def render_current_weather(html):
+    st.markdown("<h3>현재 날씨 (Current Weather)</h3>", unsafe_allow_html=True)
+    st.markdown(html, unsafe_allow_html=True)
+
+def render_daily_forecast(html):
+    # 주간 예보 표시 (한글+영어)
+    st.markdown("<h3>주간 예보 (Weekly Forecast)</h3>", unsafe_allow_html=True)
+    if html is None:
+        st.error("주간 예보 데이터를 처리할 수 없습니다. (Unable to process weekly forecast data.)")
+        return
+    st.markdown(html, unsafe_allow_html=True)
+
+def render_attractions(places):
+    # 추천 관광지 표시 (한글+영어), 홈페이지가 없으면 지도 검색 링크
+    st.markdown("<h3>추천 관광지 (Tourist Attractions)</h3>", unsafe_allow_html=True)
+    if places:
+        st.markdown("\n".join(
+            f"- [{place.kor} ({place.eng})]"
+            f"({place.url or MAP_SEARCH_URL.format(query=urllib.parse.quote(place.kor))})"
+            for place in places
+        ))
+    else:
+        st.markdown("도시를 선택하면 추천 관광지가 표시됩니다. (Select a city to view recommended tourist attractions.)")
+
+def render_accommodation(city):
+    # 숙박 플랫폼 추천 표시 (한글+영어)
+    st.markdown("<h3>숙박 플랫폼 추천 (Accommodation Platforms)</h3>", unsafe_allow_html=True)
+    if city and city in city_accommodation_links:
+        for platform, link in city_accommodation_links[city].items():
+            st.markdown(f"- [{platform}]({link})", unsafe_allow_html=True)
+    else:
+        st.markdown("도시를 선택하면 숙박 플랫폼 링크가 표시됩니다. (Select a city to view accommodation platform links.)")
+
+def build_temperature_figure(times, temps):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=times, y=temps, mode='lines+markers',
+        line=dict(color='#4f8cff', width=3),
+        marker=dict(size=8, color='#4f8cff'),
+        name='온도 (Temperature)'
+    ))
+    fig.update_layout(
+        title='24시간 온도 변화 (24h Temperature Change)',
+        xaxis_title='시간 (Time)',
+        yaxis_title='온도(°C) (Temperature)',
+        height=300,
+        font=dict(size=12),
+        margin=dict(l=10, r=10, t=30, b=10)
+    )
+    return fig
+
+def render_temperature_chart(fig):
+    # 만들어 둔 Figure 객체를 그대로 넘기면 Streamlit 이 다시 검증하지 않고 바로 JSON 으로 보냄
+    st.markdown("#### 📈 앞으로의 온도 변화 (Upcoming Temperature Changes)")
+    if fig is None:
+        st.write("예보 데이터를 가져올 수 없습니다. (Unable to fetch forecast data.)")
+        return
+    st.plotly_chart(fig, width="stretch")
+
+def build_history_figure(observed, forecast, tz_offset=0):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=(observed["time"] + tz_offset).astype("datetime64[s]"), y=observed["temp"], mode='lines+markers',
+        line=dict(color='#4f8cff', width=2), marker=dict(size=4), name='실제 (Observed)'
+    ))
+    fig.add_trace(go.Scatter(
+        x=(forecast["time"] + tz_offset).astype("datetime64[s]"), y=forecast["temp"], mode='lines',
+        line=dict(color='#ff8c42', width=2, dash='dash'), name='예보 (Forecast)'
+    ))
+    fig.update_layout(
+        xaxis_title='시간 (Time)',
+        yaxis_title='온도(°C) (Temperature)',
+        height=300,
+        font=dict(size=12),
+        margin=dict(l=10, r=10, t=30, b=10)
+    )
+    return fig
+
+def render_history(load_history, tz_offset=0):
+    # 로컬에 쌓인 기록으로 그리므로 추가 API 호출 없음
+    st.markdown("#### 📊 지난 기록과 예보 비교 (History vs Forecast)")
+    days = st.radio("기간 (Period)", [1, 3, 7, 30], index=1, horizontal=True, key="history_days",
+                    format_func=lambda d: f"{d}일 ({d}d)")
+    observed, forecast, compared = load_history(days)
+    if not len(observed["time"]) and not len(forecast["time"]):
+        st.write("아직 쌓인 기록이 없습니다. (No history recorded yet.)")
+        return
+    st.plotly_chart(build_history_figure(observed, forecast, tz_offset), width="stretch")
+    # 예보 시각마다 가장 가까운 관측값과 짝지은 오차 요약
+    if len(compared["error"]):
+        col_mae, col_bias, col_count = st.columns(3)
+        col_mae.metric("평균 오차 (MAE)", f"{float(np.abs(compared['error']).mean()):.1f}°C")
+        col_bias.metric("치우침 (Bias)", f"{float(compared['error'].mean()):+.1f}°C",
+                        help="예보 - 실제. 양수면 예보가 더 따뜻했음 (Forecast minus observed)")
+        col_count.metric("비교 시점 (Points)", len(compared["error"]))
+
+def render_compare(get_rows):
+    # 도시 비교 (한 번의 일괄 조회로 표 구성)
+    if not st.toggle("도시 비교 보기 (Compare Cities)", key="compare_toggle"):
+        return
+    compare_cities = st.multiselect(
+        "비교할 도시 (Cities to compare)",
+        options=list(city_dict.keys()),
+        default=list(featured_cities.keys()),
+        key="compare_cities",
+    )
+    if compare_cities:
+        rows, limited = get_rows(compare_cities)
+        st.dataframe(rows, hide_index=True, width="stretch")
+        if limited:
+            # 앞쪽 도시부터 채웠으므로 예산이 다시 차면 나머지를 조회 (버튼은 이 패널만 다시 실행)
+            st.caption(f"호출 한도 때문에 {limited}개 도시는 아직 불러오지 못했습니다. (Rate limited: {limited} cities pending.)")
+            st.button("다시 시도 (Retry)", key="compare_retry")
+
+def render_profiler_panel(stages, cache_stats, breakers, bundle=None, quota_usage=None, render_stats=None):
+    # 디버그 모드에서만 표시: 이번 실행의 단계별 시간과 프로세스 누적 API/캐시 지표
+    with st.expander("🛠 프로파일러 (Profiler)", expanded=False):
+        st.markdown("**이번 실행 단계별 시간 (This rerun, ms)**")
+        st.dataframe(
+            [{"stage": name, "ms": round(seconds * 1000, 2)} for name, seconds in sorted(stages.items(), key=lambda kv: -kv[1])],
+            hide_index=True, width="stretch",
+        )
+        st.markdown("**API 호출 (Upstream calls, process total)**")
+        rows = metrics.api_summary()
+        if rows:
+            st.dataframe(rows, hide_index=True, width="stretch")
+        else:
+            st.write("아직 API 호출이 없습니다. (No upstream calls yet.)")
+        st.markdown(
+            f"**캐시 (Cache)** 적중률 {cache_stats['hit_ratio'] * 100:.1f}% · "
+            f"hits {cache_stats['hits']} (shared {cache_stats['shared_hits']}) · stale {cache_stats['stale_hits']} · "
+            f"misses {cache_stats['misses']} · "
+            f"size {cache_stats['size']}/{cache_stats['max_size']} · "
+            f"coalesced {cache_stats['coalesced']} · degraded {cache_stats['degraded']}"
+        )
+        if render_stats:
+            st.markdown(
+                f"**렌더 캐시 (Render cache)** 적중률 {render_stats['hit_ratio'] * 100:.1f}% · "
+                f"hits {render_stats['hits']} (shared {render_stats['shared_hits']}) · misses {render_stats['misses']} · size {render_stats['size']}/{render_stats['max_size']}"
+            )
+        if quota_usage and quota_usage["limit_per_minute"]:
+            st.markdown(
+                f"**호출 예산 (Quota)** {quota_usage['used_last_minute']}/{quota_usage['limit_per_minute']} per min · "
+                f"tokens {quota_usage['tokens']} · denied global {quota_usage['denied_global']} · "
+                f"session {quota_usage['denied_session']}"
+            )
+        if breakers:
+            st.markdown("**회로 차단기 (Circuit breakers)** " + " · ".join(f"{host}: {state}" for host, state in breakers.items()))
+        if bundle is not None:
+            st.markdown("**API 응답 묶음 (Raw bundle)**")
+            st.json({"city": bundle.city, "elapsed": bundle.elapsed, "errors": bundle.errors,
+                     "weather": bundle.weather, "forecast": bundle.forecast, "pm25": bundle.pm25}, expanded=False)
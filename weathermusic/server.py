@@ -0,0 +1,139 @@
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+
+from . import quota, service
+from .cache import api_cache
+from .metrics import SERVICE_LATENCY
+
+try:
+    from aiohttp import web
+except ImportError:  # 선택 의존성: 없으면 표준 라이브러리 스레드 서버로 제공
+    web = None
+
+# 파이프라인(캐시 조회, 원본 API 호출)을 실행할 작업 스레드 수
+SERVICE_WORKERS = int(os.getenv("SERVICE_WORKERS", 32))
+# 응답 캐시 허용 시간(초), 원본 캐시(현재 날씨 10분)보다 짧게
+SERVICE_MAX_AGE = int(os.getenv("SERVICE_MAX_AGE", 60))
+
+logger = logging.getLogger(__name__)
+
+
+def _count(params, name, default, limit=20):
+    # 파싱 오류 원문(invalid literal for int() ...)은 내보내지 않음
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        value = -1
+    if not 0 <= value <= limit:
+        raise service.BadRequest(f"{name} 는 0~{limit} 사이의 정수여야 합니다. ({name} must be an integer between 0 and {limit})")
+    return value
+
+
+ROUTES = {
+    "/weather": lambda city, params: service.current_weather(city),
+    "/forecast/daily": lambda city, params: service.daily_forecast(city),
+    "/recommendations": lambda city, params: service.recommendations(
+        city, tracks=_count(params, "tracks", 6), attractions=_count(params, "attractions", 5), seed=params.get("seed"),
+    ),
+}
+
+
+def handle(path, params, client=None):
+    """요청 하나를 처리해 (상태 코드, JSON 본문, 추가 헤더) 반환 (aiohttp / 스레드 서버 공용)"""
+    if path == "/health":
+        return 200, {"status": "ok", "cache": api_cache.stats(), "quota": quota.governor.usage()}, {}
+    route = ROUTES.get(path)
+    if route is None:
+        return 404, {"error": "없는 경로입니다. (Not found)", "routes": sorted(ROUTES)}, {}
+    started = time.perf_counter()
+    headers = {}
+    try:
+        # 클라이언트(IP)별로 세션 예산을 따로 계산
+        with quota.session(f"api:{client}" if client else None):
+            body = route(service.resolve(params.get("city")), params)
+        status = 200
+        headers["Cache-Control"] = f"public, max-age={SERVICE_MAX_AGE}"
+    except service.UnknownCityError as e:
+        status, body = 404, {"error": str(e), "suggestions": e.suggestions}
+    except quota.QuotaExceededError as e:
+        status, body = 429, {"error": str(e)}
+        headers["Retry-After"] = str(math.ceil(e.retry_after))
+    except (service.UpstreamError, requests.RequestException) as e:
+        status, body = 502, {"error": str(e)}
+    except service.BadRequest as e:
+        status, body = 400, {"error": str(e)}
+    except Exception:
+        # 예상하지 못한 오류(내부 ValueError 포함)도 연결을 끊지 않고 JSON 500 으로 응답 (자세한 내용은 서버 로그에만)
+        logger.exception("%s 처리 중 오류", path)
+        status, body = 500, {"error": "서버 내부 오류입니다. (Internal server error)"}
+    SERVICE_LATENCY.observe(time.perf_counter() - started, route=path, status=status)
+    return status, body, headers
+
+
+def _dumps(body):
+    return json.dumps(body, ensure_ascii=False)
+
+
+def create_app(executor=None):
+    """aiohttp 앱: 이벤트 루프는 연결만 다루고 파이프라인은 작업 스레드에서 실행"""
+    executor = executor or ThreadPoolExecutor(max_workers=SERVICE_WORKERS, thread_name_prefix="weather-service")
+
+    async def dispatch(request):
+        status, body, headers = await asyncio.get_running_loop().run_in_executor(
+            executor, handle, request.path, dict(request.query), request.remote,
+        )
+        return web.json_response(body, status=status, headers=headers, dumps=_dumps)
+
+    app = web.Application()
+    app.router.add_get("/{tail:.*}", dispatch)
+    return app
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        # 인코딩하지 않은 한글 주소(?city=서울)도 받아 줌 (http.server 는 latin-1 로 읽음)
+        try:
+            path = self.path.encode("latin-1").decode("utf-8")
+        except UnicodeError:
+            path = self.path
+        parts = urlsplit(path)
+        status, body, headers = handle(parts.path, dict(parse_qsl(parts.query)), self.client_address[0])
+        data = _dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(host="127.0.0.1", port=8080):
+    return ThreadingHTTPServer((host, port), ServiceHandler)
+
+
+def serve(host="127.0.0.1", port=8080):
+    if web is not None:
+        web.run_app(create_app(), host=host, port=port, print=None)
+        return
+    server = create_server(host, port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
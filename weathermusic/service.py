@@ -0,0 +1,103 @@
+"""Streamlit 없이 쓰는 조회 → 변환 → 추천 파이프라인 (HTTP 서비스와 일괄 내보내기 CLI 가 공유)
+
+화면과 같은 api_cache / 호출 예산 / 단일 비행을 그대로 쓰므로, 같은 프로세스에서는 UI 와 캐시를 나눠 쓴다.
+"""
+from .api import get_air_quality, get_forecast, get_weather
+from .cities import city_index
+from .forecast import ForecastFrame
+from .quota import QuotaExceededError
+from .recommend import context_label, recommender, weather_context
+from .transform import current_weather_view, search_cities
+
+
+class BadRequest(ValueError):
+    # 요청 파라미터 오류: 메시지를 그대로 클라이언트에 보여도 되는 경우에만 사용 (HTTP 400)
+    pass
+
+
+class UnknownCityError(LookupError):
+    def __init__(self, query):
+        super().__init__(f"지원되지 않는 도시입니다: {query} (Unsupported city)")
+        self.query = query
+        self.suggestions = [city_info(c) for c in search_cities(query, 5)]
+
+
+class UpstreamError(RuntimeError):
+    def __init__(self, city, endpoint):
+        super().__init__(f"{city} {endpoint} 데이터를 불러올 수 없습니다. (Upstream data unavailable)")
+        self.city = city
+        self.endpoint = endpoint
+
+
+def city_info(city):
+    return {"kor": city.kor, "eng": city.eng, "province": city.province}
+
+
+def resolve(query):
+    """한글/영문/오타 1개까지 하나로 확정되는 도시, 아니면 UnknownCityError (후보 포함)"""
+    if not query:
+        raise BadRequest("city 파라미터가 필요합니다. (Missing city parameter)")
+    city = city_index.resolve(query)
+    if city is None:
+        raise UnknownCityError(query)
+    return city
+
+
+def _current(city):
+    data = get_weather(city.eng)
+    if not data or "weather" not in data:
+        raise UpstreamError(city.eng, "weather")
+    return data
+
+
+def current_weather(city, data=None):
+    data = data or _current(city)
+    view = current_weather_view(data)
+    view.pop("icon_path", None)
+    # 대기질은 부가 정보라 실패해도 현재 날씨는 돌려줌 (호출 예산 초과는 호출한 쪽이 기다리도록 그대로 올림)
+    try:
+        pm25 = get_air_quality(city.eng)
+    except QuotaExceededError:
+        raise
+    except Exception:
+        pm25 = None
+    return {"city": city_info(city), "observed_at": data.get("dt"), "weather": view, "pm25": pm25}
+
+
+def daily_forecast(city):
+    forecast = get_forecast(city.eng)
+    if not forecast or "list" not in forecast:
+        raise UpstreamError(city.eng, "forecast")
+    days = ForecastFrame(forecast).daily()
+    for day in days:
+        day.pop("icon_path", None)
+    return {"city": city_info(city), "days": days}
+
+
+def recommendations(city, data=None, tracks=6, attractions=5, seed=None):
+    """현재 날씨/계절/현지 시간대에 맞춘 추천. 같은 seed 면 같은 결과"""
+    context = weather_context(city.eng, data or _current(city))
+    return {
+        "city": city_info(city),
+        "context": dict(context._asdict(), label=context_label(context)),
+        "tracks": [
+            {"title": t.title, "artist": t.artist,
+             "url": f"https://www.youtube.com/watch?v={t.video_id}" if t.video_id else None}
+            for t in recommender.recommend_tracks(context, tracks, seed)
+        ],
+        "attractions": [
+            {"kor": p.kor, "eng": p.eng, "city": p.city, "url": p.url}
+            for p in recommender.recommend_attractions(context, attractions, seed)
+        ],
+    }
+
+
+def city_report(city, forecast=False, seed=None):
+    """일괄 내보내기용: 현재 날씨 + 추천 (+ 주간 예보) 한 묶음, 현재 날씨 응답은 한 번만 조회"""
+    data = _current(city)
+    report = current_weather(city, data)
+    report["recommendations"] = recommendations(city, data, seed=seed)
+    del report["recommendations"]["city"]
+    if forecast:
+        report["daily"] = daily_forecast(city)["days"]
+    return report
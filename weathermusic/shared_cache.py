@@ -0,0 +1,313 @@
+"""여러 프로세스(Streamlit 복제본, API 서버)가 함께 쓰는 캐시 저장소
+
+API 응답, 좌표, 렌더링 결과를 네임스페이스별로 (value, stored_at, expires_at) 형태로 보관하고, 같은 도시를
+여러 워커가 동시에 갱신하지 않도록 프로세스 간 잠금(임대 시간이 있는 lock)을 제공한다.
+
+    SHARED_CACHE_URL=sqlite:///dev/shm/weathermusic.sqlite   # 한 서버의 여러 프로세스 (공유 메모리 파일)
+    SHARED_CACHE_URL=sqlite://.cache/shared.sqlite           # 상대 경로
+    SHARED_CACHE_URL=redis://localhost:6379/0                 # 여러 서버 (pip install redis)
+    SHARED_CACHE_URL=memory                                   # 한 프로세스 (개발/시험용)
+"""
+import functools
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from .metrics import SHARED_CACHE
+
+try:
+    import redis
+except ImportError:  # 선택 의존성: 없으면 redis:// 주소를 쓸 수 없음
+    redis = None
+
+# 갱신 잠금 임대 시간(초): 잠근 워커가 죽어도 이 시간이 지나면 다른 워커가 가져감
+LOCK_TTL = float(os.getenv("SHARED_LOCK_TTL", 30))
+# 다른 워커의 갱신을 기다리는 최대 시간(초), 넘으면 직접 조회
+LOCK_WAIT = float(os.getenv("SHARED_LOCK_WAIT", 10))
+LOCK_POLL = 0.05
+# 이만큼 저장할 때마다 지난 항목과 만료된 잠금을 정리
+PURGE_EVERY = 256
+
+
+def _encode_default(value):
+    # Plotly Figure 는 JSON 으로 저장하고 읽을 때 검증 없이 다시 만듦 (pickle 보다 빠르고 안전)
+    from plotly.basedatatypes import BaseFigure
+
+    if isinstance(value, BaseFigure):
+        return {"__plotly_figure__": json.loads(value.to_json())}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode_hook(obj):
+    if "__plotly_figure__" in obj:
+        import plotly.graph_objects as go
+
+        return go.Figure(obj["__plotly_figure__"], _validate=False)
+    return obj
+
+
+def encode(value):
+    return json.dumps(value, ensure_ascii=False, default=_encode_default)
+
+
+def decode(text):
+    return json.loads(text, object_hook=_decode_hook)
+
+
+def _best_effort(default):
+    # 공유 저장소 장애는 캐시 미스(잠금은 획득한 것으로)로 취급해 각 워커가 직접 조회하게 함
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            except self.errors:
+                SHARED_CACHE.inc(namespace="store", result=f"{func.__name__}_error")
+                return default
+        return wrapper
+    return decorator
+
+
+class SharedStore:
+    """공유 저장소 인터페이스: get/set/delete/clear + acquire/release (프로세스 간 잠금)
+
+    purge_at 이 지나면 저장소에서 지워도 되는 항목 (None 이면 계속 보관).
+    """
+
+    errors = ()
+
+    def get(self, namespace, key):
+        raise NotImplementedError
+
+    def set(self, namespace, key, value, stored_at, expires_at, purge_at=None):
+        raise NotImplementedError
+
+    def delete(self, namespace, key):
+        raise NotImplementedError
+
+    def clear(self, namespace=None):
+        raise NotImplementedError
+
+    def acquire(self, name, owner, ttl):
+        raise NotImplementedError
+
+    def release(self, name, owner):
+        raise NotImplementedError
+
+    def fresh(self, namespace, key, now=None):
+        entry = self.get(namespace, key)
+        if entry is not None and entry[2] > (now or time.time()):
+            SHARED_CACHE.inc(namespace=namespace, result="hit")
+            return entry
+        SHARED_CACHE.inc(namespace=namespace, result="miss")
+        return None
+
+    @contextmanager
+    def lock(self, name, ttl=LOCK_TTL, wait=LOCK_WAIT):
+        """name 을 잠그고 획득 여부를 돌려줌. 다른 워커가 잡고 있으면 풀릴 때까지 최대 wait 초 기다림"""
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        acquired = self.acquire(name, owner, ttl)
+        if not acquired:
+            SHARED_CACHE.inc(namespace="lock", result="wait")
+            deadline = time.monotonic() + wait
+            while not acquired and time.monotonic() < deadline:
+                time.sleep(LOCK_POLL)
+                acquired = self.acquire(name, owner, ttl)
+            if not acquired:
+                SHARED_CACHE.inc(namespace="lock", result="timeout")
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                self.release(name, owner)
+
+
+class MemoryStore(SharedStore):
+    """한 프로세스 안에서만 공유 (개발/시험용, 인터페이스 기준 구현)"""
+
+    def __init__(self):
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace, key):
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+        if entry is None or (entry[3] is not None and entry[3] <= time.time()):
+            return None
+        return entry[:3]
+
+    def set(self, namespace, key, value, stored_at, expires_at, purge_at=None):
+        with self._lock:
+            self._entries[(namespace, key)] = (value, stored_at, expires_at, purge_at)
+
+    def delete(self, namespace, key):
+        with self._lock:
+            self._entries.pop((namespace, key), None)
+
+    def clear(self, namespace=None):
+        with self._lock:
+            for entry_key in [k for k in self._entries if namespace is None or k[0] == namespace]:
+                del self._entries[entry_key]
+
+    def acquire(self, name, owner, ttl):
+        now = time.monotonic()
+        with self._lock:
+            holder = self._locks.get(name)
+            if holder is not None and holder[1] > now:
+                return False
+            self._locks[name] = (owner, now + ttl)
+            return True
+
+    def release(self, name, owner):
+        with self._lock:
+            if self._locks.get(name, (None,))[0] == owner:
+                del self._locks[name]
+
+
+class SQLiteStore(SharedStore):
+    """한 서버의 여러 프로세스가 공유하는 SQLite(WAL) 파일 (/dev/shm 에 두면 메모리에서 동작)"""
+
+    errors = (sqlite3.Error,)
+
+    def __init__(self, path, timeout=5.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " stored_at REAL NOT NULL, expires_at REAL NOT NULL, purge_at REAL,"
+            " PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE TABLE IF NOT EXISTS shared_locks (name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)")
+
+    def _conn(self):
+        # 스레드마다 연결 하나 (autocommit, 문장 하나가 곧 트랜잭션)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @_best_effort(None)
+    def get(self, namespace, key):
+        row = self._conn().execute(
+            "SELECT value, stored_at, expires_at FROM shared_cache"
+            " WHERE namespace = ? AND key = ? AND (purge_at IS NULL OR purge_at > ?)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return (decode(row[0]), row[1], row[2]) if row else None
+
+    @_best_effort(None)
+    def set(self, namespace, key, value, stored_at, expires_at, purge_at=None):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO shared_cache VALUES (?, ?, ?, ?, ?, ?)",
+            (namespace, key, encode(value), stored_at, expires_at, purge_at),
+        )
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            now = time.time()
+            conn.execute("DELETE FROM shared_cache WHERE purge_at <= ?", (now,))
+            conn.execute("DELETE FROM shared_locks WHERE expires_at <= ?", (now,))
+
+    @_best_effort(None)
+    def delete(self, namespace, key):
+        self._conn().execute("DELETE FROM shared_cache WHERE namespace = ? AND key = ?", (namespace, key))
+
+    @_best_effort(None)
+    def clear(self, namespace=None):
+        if namespace is None:
+            self._conn().execute("DELETE FROM shared_cache")
+        else:
+            self._conn().execute("DELETE FROM shared_cache WHERE namespace = ?", (namespace,))
+
+    @_best_effort(True)
+    def acquire(self, name, owner, ttl):
+        # 비어 있거나 임대 시간이 지난 잠금만 가져감 (UPSERT 한 문장이라 원자적)
+        now = time.time()
+        cursor = self._conn().execute(
+            "INSERT INTO shared_locks VALUES (?, ?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at"
+            " WHERE shared_locks.expires_at <= ?",
+            (name, owner, now + ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    @_best_effort(None)
+    def release(self, name, owner):
+        self._conn().execute("DELETE FROM shared_locks WHERE name = ? AND owner = ?", (name, owner))
+
+
+class RedisStore(SharedStore):
+    """여러 서버가 공유하는 Redis 호환 저장소 (SET NX PX 잠금, 소유자 확인 후 해제)"""
+
+    RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+    def __init__(self, url, prefix="weathermusic:"):
+        if redis is None:
+            raise RuntimeError("redis 패키지가 필요합니다. (pip install redis)")
+        self.errors = (redis.RedisError,)
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, namespace, key):
+        return f"{self.prefix}{namespace}:{key}"
+
+    @_best_effort(None)
+    def get(self, namespace, key):
+        raw = self.client.get(self._key(namespace, key))
+        if raw is None:
+            return None
+        value, stored_at, expires_at = decode(raw)
+        return value, stored_at, expires_at
+
+    @_best_effort(None)
+    def set(self, namespace, key, value, stored_at, expires_at, purge_at=None):
+        px = max(1, int((purge_at - time.time()) * 1000)) if purge_at is not None else None
+        self.client.set(self._key(namespace, key), encode([value, stored_at, expires_at]), px=px)
+
+    @_best_effort(None)
+    def delete(self, namespace, key):
+        self.client.delete(self._key(namespace, key))
+
+    @_best_effort(None)
+    def clear(self, namespace=None):
+        pattern = f"{self.prefix}{namespace}:*" if namespace is not None else f"{self.prefix}*"
+        for key in self.client.scan_iter(match=pattern):
+            self.client.delete(key)
+
+    @_best_effort(True)
+    def acquire(self, name, owner, ttl):
+        return bool(self.client.set(f"{self.prefix}lock:{name}", owner, nx=True, px=int(ttl * 1000)))
+
+    @_best_effort(None)
+    def release(self, name, owner):
+        self.client.eval(self.RELEASE_SCRIPT, 1, f"{self.prefix}lock:{name}", owner)
+
+
+def open_store(url):
+    """SHARED_CACHE_URL 형식의 주소로 저장소를 엶 (비어 있으면 None: 프로세스 안 캐시만 사용)"""
+    if not url:
+        return None
+    if url == "memory":
+        return MemoryStore()
+    if url.startswith("sqlite://"):
+        return SQLiteStore(url[len("sqlite://"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisStore(url)
+    raise ValueError(f"지원하지 않는 SHARED_CACHE_URL 입니다: {url}")
+
+
+shared_store = open_store(os.getenv("SHARED_CACHE_URL"))
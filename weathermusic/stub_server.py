@@ -0,0 +1,64 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from .providers import DEFAULT_FIXTURES_DIR, ReplayProvider
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """/owm/<path>, /ipinfo/<path> 요청을 fixture 로 응답하는 로컬 OpenWeatherMap 대체 서버"""
+
+    provider = None
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        service, _, path = parts.path.lstrip("/").partition("/")
+        response = self.provider.get(service, path, dict(parse_qsl(parts.query)))
+        body = json.dumps(response.data, ensure_ascii=False).encode("utf-8")
+        self.send_response(response.status_code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_server(provider, host="127.0.0.1", port=8765):
+    handler = type("BoundStubHandler", (StubHandler,), {"provider": provider})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 OpenWeatherMap/ipinfo 스텁 서버 (Local API stand-in)")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 편차(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--synthetic", action="store_true", help="fixture 대신 합성 데이터로 응답")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        from .fixtures import SyntheticProvider
+        provider = SyntheticProvider()
+    else:
+        provider = ReplayProvider(args.fixtures, latency=args.latency, jitter=args.jitter,
+                                  error_rate=args.error_rate, error_status=args.error_status)
+    server = create_server(provider, args.host, args.port)
+    base = f"http://{args.host}:{args.port}"
+    print(f"OWM_BASE_URL={base}/owm IPINFO_BASE_URL={base}/ipinfo")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from .metrics import STAGE_LATENCY
+
+
+class StageTimer:
+    """렌더링 단계별 소요 시간 기록 (벤치마크/진단용, 프로세스 전역)
+
+    운영 중에는 STAGE_LATENCY 히스토그램과 capture() 로만 남기고, 원시 기록(snapshot)은 record=True 일 때만 쌓음.
+    """
+
+    def __init__(self, record=False):
+        self.record = record
+        self._lock = threading.Lock()
+        self._durations = defaultdict(list)
+        self._local = threading.local()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            STAGE_LATENCY.observe(elapsed, stage=name)
+            if self.record:
+                with self._lock:
+                    self._durations[name].append(elapsed)
+            captured = getattr(self._local, "captured", None)
+            if captured is not None:
+                captured[name] = captured.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def capture(self):
+        # 현재 스레드에서 기록된 단계만 모아서 반환 (프로파일러 패널의 이번 실행 값)
+        previous = getattr(self._local, "captured", None)
+        self._local.captured = {}
+        try:
+            yield self._local.captured
+        finally:
+            self._local.captured = previous
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            result = {name: list(values) for name, values in self._durations.items()}
+            if reset:
+                self._durations.clear()
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+
+
+timer = StageTimer()
+stage = timer.stage
@@ -0,0 +1,78 @@
+import datetime
+
+from .assets import icon_src
+from .cities import city_index
+from .data import city_dict, weather_icon_map
+
+
+# Streamlit 없이도 import/벤치마크할 수 있는 순수 변환 함수 모음
+
+def get_season(month=None):
+    month = month or datetime.datetime.now().month
+    if month in [3, 4, 5]:
+        return "봄"
+    elif month in [6, 7, 8]:
+        return "여름"
+    elif month in [9, 10, 11]:
+        return "가을"
+    else:
+        return "겨울"
+
+def resolve_city(name):
+    # 한글/영문/옛 로마자/초성/오타 1개까지 하나의 도시로 확정되면 영문명 (아니면 None)
+    city = city_index.resolve(name)
+    return city.eng if city else None
+
+def search_cities(query, limit=10):
+    return city_index.search(query, limit)
+
+def city_label(eng):
+    city = city_index.get(eng)
+    return f"{city.kor} ({city.eng})" if city else eng
+
+def icon_html(icon_path):
+    src = icon_src(icon_path) if icon_path else None
+    return f'<img src="{src}" width="32" height="32" alt="">' if src else ''
+
+def local_time(timestamp, tz_offset, fmt='%H:%M'):
+    # 서버 시간대 대신 API가 알려준 도시의 UTC 오프셋(초) 기준으로 표시
+    tz = datetime.timezone(datetime.timedelta(seconds=tz_offset))
+    return datetime.datetime.fromtimestamp(timestamp, tz).strftime(fmt)
+
+def current_weather_view(data):
+    tz_offset = data.get('timezone', 0)
+    weather_kor = data['weather'][0]['description']
+    return {
+        "temp": data['main']['temp'],
+        "weather_kor": weather_kor,
+        "weather_eng": data['weather'][0]['main'],
+        "icon_path": weather_icon_map.get(data['weather'][0]['main']),
+        "humidity": data['main']['humidity'],
+        "wind_speed": data['wind']['speed'],
+        "sunrise": local_time(data['sys']['sunrise'], tz_offset),
+        "sunset": local_time(data['sys']['sunset'], tz_offset),
+    }
+
+RATE_LIMITED = "⏳ 호출 한도 초과, 잠시 후 다시 시도 (Rate limited, retry shortly)"
+
+def compare_rows(kor_cities, many, limited=()):
+    # limited: 호출 예산이 모자라 이번에 조회하지 못한 도시 (빈 행 대신 안내 문구)
+    rows = []
+    for kor in kor_cities:
+        eng = city_dict[kor]
+        item = many.get(eng)
+        if not item or "main" not in item:
+            row = {"도시 (City)": f"{kor} ({eng})"}
+            if eng in limited:
+                row["상태 (Condition)"] = RATE_LIMITED
+            rows.append(row)
+            continue
+        rows.append({
+            "도시 (City)": f"{kor} ({eng})",
+            "온도 (°C)": item["main"]["temp"],
+            "체감 (°C)": item["main"].get("feels_like"),
+            "습도 (%)": item["main"]["humidity"],
+            "풍속 (m/s)": item["wind"]["speed"],
+            "상태 (Condition)": item["weather"][0]["description"],
+        })
+    return rows